@@ -0,0 +1,205 @@
+"""
+Admission control for ``/chatkit``.
+
+Each user gets a token bucket (RATE_LIMIT_PER_MINUTE sustained,
+RATE_LIMIT_BURST burst) and at most MAX_INFLIGHT_PER_USER requests running or
+queued at once. Across all users, at most MAX_INFLIGHT_RUNS requests run
+concurrently; up to ADMISSION_QUEUE_SIZE more wait in line for at most
+ADMISSION_QUEUE_TIMEOUT seconds. Anything beyond that is rejected straight
+away with a 429 rather than piling up behind the model and the DB writer.
+
+Only streaming requests, the ones that start an agent run, are admitted
+here; thread lists and item pages are served without taking a token or a
+slot. A slot is held until the response stream finishes, since that is
+where the agent run actually happens.
+"""
+
+import asyncio
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+from app.metrics import metric, register_collector
+
+RATE_LIMIT_PER_MINUTE = float(os.getenv("RATE_LIMIT_PER_MINUTE", "30"))
+RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", "10"))
+MAX_INFLIGHT_PER_USER = int(os.getenv("MAX_INFLIGHT_PER_USER", "2"))
+MAX_INFLIGHT_RUNS = int(os.getenv("MAX_INFLIGHT_RUNS", "32"))
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", "64"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "5"))
+
+# Full buckets are indistinguishable from missing ones, so they are dropped
+# once the table grows past this many users
+MAX_TRACKED_USERS = 10_000
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, retry_after: float):
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(f"Request rejected: {reason}")
+
+
+@dataclass(slots=True)
+class TokenBucket:
+    tokens: float
+    updated: float
+
+    def refill(self, now: float, rate: float, capacity: float) -> None:
+        self.tokens = min(capacity, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+
+
+class Ticket:
+    """An admitted request. ``release`` is idempotent."""
+
+    __slots__ = ("_controller", "_user_id", "_released")
+
+    def __init__(self, controller: "AdmissionController", user_id: str):
+        self._controller = controller
+        self._user_id = user_id
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._controller._release(self._user_id)
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        rate_per_minute: float = RATE_LIMIT_PER_MINUTE,
+        burst: int = RATE_LIMIT_BURST,
+        max_per_user: int = MAX_INFLIGHT_PER_USER,
+        max_inflight: int = MAX_INFLIGHT_RUNS,
+        queue_size: int = ADMISSION_QUEUE_SIZE,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT,
+    ):
+        self.rate = rate_per_minute / 60
+        self.burst = burst
+        self.max_per_user = max_per_user
+        self.max_inflight = max_inflight
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+
+        self._buckets: dict[str, TokenBucket] = {}
+        self._per_user: Counter[str] = Counter()
+        self._slots = asyncio.Semaphore(max_inflight)
+        self.inflight = 0
+        self.queued = 0
+
+        self.admitted = 0
+        self.rejected: Counter[str] = Counter()
+        self.queue_wait_sum = 0.0
+
+    # --- Checks ---
+    def _take_token(self, user_id: str) -> None:
+        if self.rate <= 0:
+            return
+        now = time.monotonic()
+        bucket = self._buckets.get(user_id)
+        if bucket is None:
+            if len(self._buckets) >= MAX_TRACKED_USERS:
+                self._prune(now)
+            bucket = self._buckets[user_id] = TokenBucket(self.burst, now)
+        else:
+            bucket.refill(now, self.rate, self.burst)
+        if bucket.tokens < 1:
+            self._reject("rate_limited", (1 - bucket.tokens) / self.rate)
+        bucket.tokens -= 1
+
+    def _refund_token(self, user_id: str) -> None:
+        # A request that never got to run shouldn't count against the user
+        bucket = self._buckets.get(user_id)
+        if self.rate > 0 and bucket is not None:
+            bucket.tokens = min(self.burst, bucket.tokens + 1)
+
+    def _prune(self, now: float) -> None:
+        for user_id, bucket in list(self._buckets.items()):
+            bucket.refill(now, self.rate, self.burst)
+            if bucket.tokens >= self.burst:
+                del self._buckets[user_id]
+
+    def _reject(self, reason: str, retry_after: float) -> None:
+        self.rejected[reason] += 1
+        raise AdmissionRejected(reason, retry_after)
+
+    # --- Acquire / release ---
+    async def acquire(self, user_id: str) -> Ticket:
+        if self._per_user[user_id] >= self.max_per_user:
+            self._reject("user_concurrency", 1.0)
+        self._take_token(user_id)
+
+        self._per_user[user_id] += 1
+        try:
+            await self._wait_for_slot()
+        except BaseException:
+            # Queue full, timed out or the client left while queued
+            self._refund_token(user_id)
+            self._release_user(user_id)
+            raise
+
+        self.inflight += 1
+        self.admitted += 1
+        return Ticket(self, user_id)
+
+    async def _wait_for_slot(self) -> None:
+        # Fast path: a free slot and nobody waiting ahead of us
+        if self.queued == 0 and not self._slots.locked():
+            await self._slots.acquire()
+            return
+        if self.queued >= self.queue_size:
+            self._reject("queue_full", self.queue_timeout)
+        self.queued += 1
+        start = time.monotonic()
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await self._slots.acquire()
+        except TimeoutError:
+            self._reject("queue_timeout", self.queue_timeout)
+        finally:
+            self.queued -= 1
+            self.queue_wait_sum += time.monotonic() - start
+
+    def _release_user(self, user_id: str) -> None:
+        self._per_user[user_id] -= 1
+        if self._per_user[user_id] <= 0:
+            del self._per_user[user_id]
+
+    def _release(self, user_id: str) -> None:
+        self.inflight -= 1
+        self._release_user(user_id)
+        self._slots.release()
+
+    # --- Export ---
+    def collect(self) -> list[str]:
+        lines = [
+            *metric(
+                "admission_inflight", "gauge", "Requests currently running.", self.inflight
+            ),
+            *metric(
+                "admission_queued", "gauge", "Requests waiting for a slot.", self.queued
+            ),
+            *metric(
+                "admission_admitted_total", "counter", "Requests admitted.", self.admitted
+            ),
+            *metric(
+                "admission_queue_wait_seconds_total",
+                "counter",
+                "Total time admitted or timed-out requests spent queued.",
+                self.queue_wait_sum,
+            ),
+            "# HELP admission_rejected_total Requests rejected with 429, by reason.",
+            "# TYPE admission_rejected_total counter",
+        ]
+        for reason in ("rate_limited", "user_concurrency", "queue_full", "queue_timeout"):
+            lines.append(
+                f'admission_rejected_total{{reason="{reason}"}} {self.rejected[reason]}'
+            )
+        return lines
+
+
+admission = AdmissionController()
+register_collector(admission.collect)
@@ -0,0 +1,260 @@
+"""
+Model provider used by the scheduler agent, with record/replay support.
+
+MODEL_MODE selects how model calls are served:
+
+- ``live`` (default): the normal OpenAI provider.
+- ``record``: calls go to OpenAI and every streamed response is also written
+  to MODEL_CASSETTE_DIR as ``call-NNNN.jsonl``, headed by the keys of the
+  request that produced it.
+- ``replay``: no network; each request is served the recording of the same
+  request, else of one shaped the same (same sequence of messages and tool
+  calls, different text), else one picked by its hash. Nothing depends on
+  the order calls arrive in, so concurrent conversations replay
+  independently. Pacing follows MODEL_REPLAY_SPEED (1.0 = recorded timing,
+  0 = as fast as possible) or, if set, a fixed MODEL_REPLAY_TOKEN_DELAY
+  seconds per delta event.
+
+Tools still run for real on replay, so this isolates the server, store and
+widget overhead from model latency.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from agents import (
+    Model,
+    ModelProvider,
+    ModelResponse,
+    ModelTracing,
+    MultiProvider,
+    RunConfig,
+    Usage,
+)
+from openai.types.responses import ResponseCompletedEvent, ResponseStreamEvent
+from pydantic import TypeAdapter
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = os.getenv("SCHEDULER_MODEL", "gpt-4o-mini")
+MODEL_MODE = os.getenv("MODEL_MODE", "live")
+MODEL_CASSETTE_DIR = Path(
+    os.getenv("MODEL_CASSETTE_DIR", Path(__file__).parent.parent.parent / "cassettes")
+)
+MODEL_REPLAY_SPEED = float(os.getenv("MODEL_REPLAY_SPEED", "1.0"))
+MODEL_REPLAY_TOKEN_DELAY = (
+    float(os.environ["MODEL_REPLAY_TOKEN_DELAY"])
+    if os.getenv("MODEL_REPLAY_TOKEN_DELAY")
+    else None
+)
+
+stream_event_adapter = TypeAdapter(ResponseStreamEvent)
+
+
+def _response_from_events(events: list) -> ModelResponse:
+    """Builds the non-streaming result from a stream's completed event."""
+    for event in reversed(events):
+        if isinstance(event, ResponseCompletedEvent):
+            response = event.response
+            usage = response.usage
+            return ModelResponse(
+                output=response.output,
+                usage=Usage(
+                    requests=1,
+                    input_tokens=usage.input_tokens if usage else 0,
+                    output_tokens=usage.output_tokens if usage else 0,
+                    total_tokens=usage.total_tokens if usage else 0,
+                ),
+                response_id=response.id,
+            )
+    raise RuntimeError("Model stream ended without a response.completed event")
+
+
+def _digest(value: Any) -> str:
+    data = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+
+def request_keys(system_instructions: str | None, input: Any, tools: list) -> tuple[str, str]:
+    """
+    ``(key, shape)`` of a model request. ``key`` covers everything the model
+    sees; ``shape`` only the sequence of item types, roles and tool names,
+    so it survives text that differs between runs (dates in tool output,
+    generated IDs).
+    """
+    items = [{"role": "user", "content": input}] if isinstance(input, str) else list(input)
+    tool_names = sorted(getattr(tool, "name", str(tool)) for tool in tools)
+    key = _digest([system_instructions, items, tool_names])
+    shape = _digest(
+        [
+            [item.get("type", "message"), item.get("role"), item.get("name")]
+            if isinstance(item, dict)
+            else type(item).__name__
+            for item in items
+        ]
+        + [tool_names]
+    )
+    return key, shape
+
+
+class Cassette:
+    """
+    A directory of recorded model calls, one JSONL file per call. The first
+    line holds the request's keys; cassettes recorded before that have none
+    and are only used when nothing matches.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._loaded: dict[Path, list[tuple[float, object]]] = {}
+        self._index: dict[tuple[str, str], list[Path]] | None = None
+
+    def call_files(self) -> list[Path]:
+        return sorted(self.path.glob("call-*.jsonl"))
+
+    def create(self, key: str, shape: str):
+        """
+        Opens a new call file. The name is claimed with O_EXCL, so concurrent
+        recordings, in this process or another, never share a file.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        number = len(self.call_files())
+        while True:
+            path = self.path / f"call-{number:04}.jsonl"
+            try:
+                f = open(path, "x", encoding="utf-8")
+            except FileExistsError:
+                number += 1
+                continue
+            f.write(json.dumps({"key": key, "shape": shape}) + "\n")
+            return f
+
+    def find(self, key: str, shape: str) -> Path:
+        if self._index is None:
+            self._index = self._build_index()
+        files = (
+            self._index.get(("key", key))
+            or self._index.get(("shape", shape))
+            or self._index[("any", "")]
+        )
+        if not files:
+            raise RuntimeError(f"No recorded model calls in {self.path}")
+        # Several candidates: spread requests over them, the same way each time
+        return files[int(key, 16) % len(files)]
+
+    def _build_index(self) -> dict[tuple[str, str], list[Path]]:
+        index: dict[tuple[str, str], list[Path]] = {("any", ""): []}
+        for file in self.call_files():
+            with open(file, encoding="utf-8") as f:
+                header = json.loads(f.readline() or "{}")
+            for name in ("key", "shape"):
+                if name in header:
+                    index.setdefault((name, header[name]), []).append(file)
+            index[("any", "")].append(file)
+        return index
+
+    def load(self, file: Path) -> list[tuple[float, object]]:
+        # Validated once and cached so replay cost doesn't skew benchmarks
+        if file not in self._loaded:
+            with open(file, encoding="utf-8") as f:
+                self._loaded[file] = [
+                    (rec["t"], stream_event_adapter.validate_python(rec["event"]))
+                    for rec in map(json.loads, f)
+                    if "event" in rec
+                ]
+        return self._loaded[file]
+
+
+class RecordingModel(Model):
+    def __init__(self, model: Model, cassette: Cassette):
+        self.model = model
+        self.cassette = cassette
+
+    async def get_response(self, *args, **kwargs) -> ModelResponse:
+        events = [event async for event in self.stream_response(*args, **kwargs)]
+        return _response_from_events(events)
+
+    async def stream_response(
+        self, system_instructions, input, model_settings, tools, *args, **kwargs
+    ) -> AsyncIterator:
+        key, shape = request_keys(system_instructions, input, tools)
+        start = time.perf_counter()
+        with self.cassette.create(key, shape) as f:
+            async for event in self.model.stream_response(
+                system_instructions, input, model_settings, tools, *args, **kwargs
+            ):
+                record = {
+                    "t": round(time.perf_counter() - start, 6),
+                    "event": event.model_dump(mode="json"),
+                }
+                f.write(json.dumps(record) + "\n")
+                yield event
+        logger.info(f"Recorded model call to {Path(f.name).name}")
+
+
+class ReplayModel(Model):
+    def __init__(self, cassette: Cassette, speed: float, token_delay: float | None):
+        self.cassette = cassette
+        self.speed = speed
+        self.token_delay = token_delay
+
+    async def get_response(self, *args, **kwargs) -> ModelResponse:
+        events = [event async for event in self.stream_response(*args, **kwargs)]
+        return _response_from_events(events)
+
+    async def stream_response(
+        self, system_instructions, input, model_settings, tools, *args, **kwargs
+    ) -> AsyncIterator:
+        key, shape = request_keys(system_instructions, input, tools)
+        recorded = self.cassette.load(self.cassette.find(key, shape))
+
+        previous = 0.0
+        for offset, event in recorded:
+            if self.token_delay is not None:
+                if event.type.endswith(".delta"):
+                    await asyncio.sleep(self.token_delay)
+            elif self.speed:
+                await asyncio.sleep((offset - previous) * self.speed)
+            previous = offset
+            yield event
+
+
+class SchedulerModelProvider(ModelProvider):
+    """Wraps the default provider according to ``mode``."""
+
+    def __init__(
+        self,
+        mode: str = MODEL_MODE,
+        cassette_dir: Path = MODEL_CASSETTE_DIR,
+        base: ModelProvider | None = None,
+        speed: float = MODEL_REPLAY_SPEED,
+        token_delay: float | None = MODEL_REPLAY_TOKEN_DELAY,
+    ):
+        if mode not in ("live", "record", "replay"):
+            raise ValueError(f"Unknown MODEL_MODE {mode!r}")
+        self.mode = mode
+        self.cassette = Cassette(cassette_dir)
+        self.base = base or MultiProvider()
+        self.speed = speed
+        self.token_delay = token_delay
+
+    def get_model(self, model_name: str | None) -> Model:
+        if self.mode == "replay":
+            return ReplayModel(self.cassette, self.speed, self.token_delay)
+        model = self.base.get_model(model_name)
+        if self.mode == "record":
+            return RecordingModel(model, self.cassette)
+        return model
+
+
+model_provider = SchedulerModelProvider()
+
+
+def build_run_config() -> RunConfig:
+    return RunConfig(model_provider=model_provider)
@@ -1,5 +1,6 @@
 from agents import Agent, StopAtTools
 from chatkit.agents import AgentContext
+from .models import MODEL_NAME
 from .tools import search_contacts, find_availability, draft_invite, check_schedule
 
 SCHEDULER_INSTRUCTIONS = """
@@ -20,7 +21,7 @@ WORKFLOW PROTOCOL (FOLLOW STRICTLY):
 
 3. DRAFTING & REVIEW (HITL):
    - Look for a `<USER_ACTION>` stating "User selected time slot ID".
-   - Once a slot is picked, call `draft_invite(...)`.
+   - Once a slot is picked, call `draft_invite(...)` with the slot's `start_time` and `duration_minutes` exactly as given, and the attendee contact IDs.
    - You MUST generate a professional Subject and Agenda based on the context of the conversation.
    - Once `draft_invite` is called, STOP. The user will either "Send" or "Suggest Changes".
 
@@ -39,7 +40,7 @@ def build_scheduler_agent() -> Agent[AgentContext]:
     tools = [search_contacts, find_availability, draft_invite, check_schedule]
 
     return Agent[AgentContext](
-        model="gpt-4o-mini",
+        model=MODEL_NAME,
         name="Executive Scheduler",
         instructions=SCHEDULER_INSTRUCTIONS,
         tools=tools,
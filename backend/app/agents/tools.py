@@ -1,4 +1,5 @@
-from datetime import datetime
+from contextlib import aclosing
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict
 from agents import RunContextWrapper, function_tool
 from chatkit.agents import AgentContext
@@ -7,13 +8,26 @@ from chatkit.types import (
     AssistantMessageItem,
     AssistantMessageContent,
 )
-from app.store.app_store import search_contacts_in_db
+from app.availability import duration_label, find_common_slots, horizon, slot_label
+from app.offload import run_cpu
+from app.store.app_store import (
+    get_attendee_calendars,
+    get_contacts_by_ids,
+    get_working_hours,
+    search_contacts_page,
+)
+from app.types import TimeSlot, format_attendees
 from app.widgets.builders import (
+    CONTACT_PAGE_SIZE,
     build_contact_picker,
     build_time_picker,
     build_invite_editor,
 )
 
+# Meetings listed in the check_schedule output; the rest are only counted so
+# a full calendar never turns into a multi-megabyte tool result.
+SCHEDULE_SUMMARY_LIMIT = 50
+
 
 async def _send_assistant_message(ctx: RunContextWrapper[AgentContext], text: str):
     """Helper to stream a text message from within a tool."""
@@ -38,7 +52,9 @@ async def search_contacts(
     Parameter: query (e.g., 'Bob' or 'bob@example.com')
     """
     user_id = ctx.context.request_context.user_id
-    contacts = await search_contacts_in_db(user_id, query)
+    contacts, has_more = await search_contacts_page(
+        user_id, query, offset=0, limit=CONTACT_PAGE_SIZE
+    )
 
     if not contacts:
         msg = f"I'm sorry, I couldn't find any contacts matching '{query}'."
@@ -46,45 +62,57 @@ async def search_contacts(
         return {"status": "error", "message": "No contacts found."}
 
     # 1. Stream the text explanation
+    found = f"more than {len(contacts)}" if has_more else str(len(contacts))
     await _send_assistant_message(
         ctx,
-        f"I found {len(contacts)} contacts. Please select the ones you'd like to invite.",
+        f"I found {found} contacts. Please select the ones you'd like to invite.",
     )
 
-    # 2. Stream the widget
-    widget = build_contact_picker(contacts)
+    # 2. Stream the widget (first page only; the user pages with "Show more")
+    widget = await run_cpu(
+        build_contact_picker, contacts, query=query, has_more=has_more
+    )
     await ctx.context.stream_widget(widget)
 
     # 3. Return summary to Agent memory
-    return f"SUCCESS: Displayed Contact Picker widget with the following matches: {contacts}. Waiting for user to confirm selection via UI action."
+    matches = ", ".join(f"{c.name} <{c.email}> (ID: {c.id})" for c in contacts)
+    more = " More matches are available via the widget's Show more button." if has_more else ""
+    return f"SUCCESS: Displayed Contact Picker widget with the following matches: {matches}.{more} Waiting for user to confirm selection via UI action."
 
 
 @function_tool(
-    description_override="Check availability and find open time slots for a group of attendees. It displays a time picker widget with the best options."
+    description_override="Check availability and find open time slots for a group of attendees. It displays a time picker widget with the best options. duration_minutes is the meeting length; days is how far ahead to look."
 )
 async def find_availability(
-    ctx: RunContextWrapper[AgentContext], attendee_ids: List[str]
+    ctx: RunContextWrapper[AgentContext],
+    attendee_ids: List[str],
+    duration_minutes: int = 60,
+    days: int = 5,
 ) -> Dict[str, str]:
-    # Mocked slots
+    user_id = ctx.context.request_context.user_id
+    now = datetime.now(timezone.utc)
+    start, end = horizon(now, days)
+    calendars = await get_attendee_calendars(
+        user_id, attendee_ids, start.isoformat(), end.isoformat()
+    )
+    starts = await run_cpu(find_common_slots, calendars, duration_minutes, now, days)
+
+    if not starts:
+        msg = f"I couldn't find a {duration_label(duration_minutes)} slot that works for everyone in the next {days} days."
+        await _send_assistant_message(ctx, msg)
+        return {"status": "error", "message": "No common free slot in working hours."}
+
+    # Labels use the organizer's time zone (first calendar)
+    organizer_tz = calendars[0][0].timezone
     slots = [
-        {
-            "id": "slot_1",
-            "time_label": "Today, 2:00 PM",
-            "duration": "1 hour",
-            "conflict": False,
-        },
-        {
-            "id": "slot_2",
-            "time_label": "Today, 4:30 PM",
-            "duration": "30 mins",
-            "conflict": True,
-        },
-        {
-            "id": "slot_3",
-            "time_label": "Tomorrow, 10:00 AM",
-            "duration": "1 hour",
-            "conflict": False,
-        },
+        TimeSlot(
+            id=f"slot_{slot_start:%Y%m%dT%H%M}Z",
+            time_label=slot_label(slot_start, organizer_tz, now),
+            duration=duration_label(duration_minutes),
+            start=slot_start.isoformat(),
+            minutes=duration_minutes,
+        )
+        for slot_start in starts
     ]
 
     await _send_assistant_message(
@@ -92,10 +120,11 @@ async def find_availability(
         "I've analyzed the schedules for all participants. Here are the best available slots:",
     )
 
-    widget = build_time_picker(slots)
+    widget = await run_cpu(build_time_picker, slots)
     await ctx.context.stream_widget(widget)
 
-    return f"Analyzed availability for attendees {attendee_ids} and displayed time picker widget to user."
+    labels = ", ".join(f"{s.time_label} (ID: {s.id})" for s in slots)
+    return f"Analyzed availability for attendees {attendee_ids} within everyone's working hours and displayed time picker widget to user with: {labels}."
 
 
 @function_tool()
@@ -103,8 +132,9 @@ async def draft_invite(
     ctx: RunContextWrapper[AgentContext],
     subject: str,
     agenda: str,
-    slot_time_str: str,
-    attendee_names: str,
+    start_time: str,
+    attendee_ids: List[str],
+    duration_minutes: int = 60,
     location: str = "Zoom",
 ) -> Dict[str, str]:
     """Create a draft meeting invitation widget and display it to the user for review. Use this BEFORE sending any invite.
@@ -112,44 +142,87 @@ async def draft_invite(
     Args:
         subject (str): The subject of the meeting.
         agenda (str): The agenda of the meeting.
-        slot_time_str (str): The time slot for the meeting.
-        attendee_names (str): A comma-separated list of attendee names.
+        start_time (str): The start of the picked slot, exactly as given in the slot selection (ISO 8601).
+        attendee_ids (List[str]): The contact IDs of the attendees.
+        duration_minutes (int, optional): The meeting length from the slot selection. Defaults to 60.
         location (str, optional): The location of the meeting. Defaults to "Zoom".
     """
+    user_id = ctx.context.request_context.user_id
+    try:
+        start = datetime.fromisoformat(start_time)
+    except ValueError:
+        return {
+            "status": "error",
+            "message": f"'{start_time}' is not an ISO 8601 time. Pass the start_time from the slot selection.",
+        }
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    # Stored times are compared as strings, so all of them are UTC
+    start = start.astimezone(timezone.utc)
+    end = start + timedelta(minutes=duration_minutes)
+
+    contacts = await get_contacts_by_ids(attendee_ids, owner_id=user_id)
+    if not contacts:
+        return {"status": "error", "message": f"No contacts found for IDs {attendee_ids}."}
+    attendees = format_attendees((c.name, c.email) for c in contacts)
+
+    # Label the time in the organizer's zone, as the time picker did
+    profile = await get_working_hours(user_id)
+    time_label = slot_label(start, profile.timezone, datetime.now(timezone.utc))
+
     await _send_assistant_message(
         ctx,
         "I've drafted the invitation. Please review the agenda and subject below. You can edit them directly if needed.",
     )
 
-    widget = build_invite_editor(
+    widget = await run_cpu(
+        build_invite_editor,
         subject=subject,
         agenda=agenda,
         location=location,
-        attendees=attendee_names,
-        time_str=slot_time_str,
+        attendees=attendees,
+        time_str=f"{time_label} ({duration_label(duration_minutes)})",
+        start_time=start.isoformat(),
+        end_time=end.isoformat(),
     )
     await ctx.context.stream_widget(widget)
 
-    return f"Drafted meeting invite with subject '{subject}' for attendees {attendee_names} and displayed invite editor widget to user."
+    return f"Drafted meeting invite with subject '{subject}' for attendees {attendees} at {time_label} and displayed invite editor widget to user."
 
 
 @function_tool()
 async def check_schedule(ctx: RunContextWrapper[AgentContext]) -> str:
     """
-    Retrieves the user's current schedule and list of booked meetings.
+    Retrieves the user's upcoming booked meetings, soonest first.
     """
     user_id = ctx.context.request_context.user_id
     from app.store.app_store import (
-        get_events_by_user,
+        count_events_by_user,
+        iter_events_by_user,
     )  # local import to avoid circularity
 
-    events = await get_events_by_user(user_id)
+    # Upcoming meetings, soonest first: past ones would crowd them out of
+    # the listed few once a calendar has history (e.g. after an import)
+    now = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    events = []
+    async with aclosing(
+        iter_events_by_user(user_id, window_size=SCHEDULE_SUMMARY_LIMIT, since=now)
+    ) as windows:
+        async for window in windows:
+            events = window
+            break
 
     if not events:
-        return "Your calendar is currently empty. No meetings are scheduled."
+        return "You have no upcoming meetings scheduled."
 
-    summary = "Here are your scheduled meetings:\n"
-    for e in events:
-        summary += f"- {e['subject']} at {e['start_time']} with {e['attendees']} (Location: {e['location']})\n"
+    lines = ["Here are your upcoming meetings:"]
+    lines.extend(
+        f"- {e.subject} at {e.start_time} with {e.attendees} (Location: {e.location})"
+        for e in events
+    )
+    if len(events) == SCHEDULE_SUMMARY_LIMIT:
+        more = await count_events_by_user(user_id, since=now) - len(events)
+        if more:
+            lines.append(f"...and {more} more meetings not listed.")
 
-    return summary
\ No newline at end of file
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,194 @@
+"""
+Availability as bitmaps.
+
+Time is cut into SLOT_MINUTES slots counted from UTC midnight of the first
+day of the search horizon. A calendar becomes a Python int with bit ``i``
+set when slot ``i`` is free, so intersecting any number of attendees is one
+``&`` per attendee over the whole horizon, and "N consecutive free slots"
+is a handful of shift-and-ANDs.
+
+Working hours are precomputed per (profile, UTC day) and cached. They
+depend on the user's time zone, including DST, so a day's mask is computed
+once and reused across requests and attendees with the same profile. Busy
+time is OR-ed in per request from the ``event_participants`` index.
+"""
+
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Iterable, List, Sequence, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from app.types import WorkingHours
+
+logger = logging.getLogger(__name__)
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+SLOT = timedelta(minutes=SLOT_MINUTES)
+
+# (profile, [(start, end), ...]) for one attendee; times are ISO strings
+Calendar = Tuple[WorkingHours, Sequence[Tuple[str, str]]]
+
+
+def horizon(now: datetime, days: int) -> Tuple[datetime, datetime]:
+    """UTC midnight of today through ``days`` full days later."""
+    origin = datetime.combine(now.astimezone(timezone.utc).date(), time(), timezone.utc)
+    return origin, origin + timedelta(days=days + 1)
+
+
+@lru_cache(maxsize=1024)
+def _zone(name: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
+@lru_cache(maxsize=65536)
+def working_day_mask(
+    tz: str, day_start: int, day_end: int, weekdays: str, day: date
+) -> int:
+    """Slots of UTC ``day`` that fall in working hours, as bits 0..SLOTS_PER_DAY-1."""
+    zone = _zone(tz)
+    utc_start = datetime.combine(day, time(), timezone.utc)
+    mask = 0
+    # A UTC day overlaps up to three local days
+    for offset in (-1, 0, 1):
+        local_day = day + timedelta(days=offset)
+        if str(local_day.weekday()) not in weekdays:
+            continue
+        midnight = datetime.combine(local_day, time(), zone)
+        start = (midnight + timedelta(minutes=day_start)).astimezone(timezone.utc)
+        end = (midnight + timedelta(minutes=day_end)).astimezone(timezone.utc)
+        mask |= _span(_slot(start, utc_start), _slot(end, utc_start, ceil=True), SLOTS_PER_DAY)
+    return mask
+
+
+def working_mask(profile: WorkingHours, first_day: date, days: int) -> int:
+    mask = 0
+    for n in range(days):
+        day_mask = working_day_mask(
+            profile.timezone,
+            profile.day_start,
+            profile.day_end,
+            profile.weekdays,
+            first_day + timedelta(days=n),
+        )
+        mask |= day_mask << (n * SLOTS_PER_DAY)
+    return mask
+
+
+def busy_mask(
+    intervals: Iterable[Tuple[str, str]], origin: datetime, slots: int
+) -> int:
+    """
+    Bits for every slot touched by an interval. Intervals without absolute
+    times (free-form labels booked before times were stored) can't block
+    anything; they are counted in a warning rather than failing the search.
+    """
+    mask = 0
+    unparseable = 0
+    for start, end in intervals:
+        start_at, end_at = _parse(start), _parse(end)
+        if start_at is None or end_at is None:
+            unparseable += 1
+            continue
+        mask |= _span(_slot(start_at, origin), _slot(end_at, origin, ceil=True), slots)
+    if unparseable:
+        logger.warning(f"Ignored {unparseable} busy intervals without ISO 8601 times")
+    return mask
+
+
+def run_starts(free: int, length: int) -> int:
+    """Bits ``i`` such that slots ``i .. i+length-1`` are all free."""
+    runs, covered = free, 1
+    while covered < length:
+        step = min(covered, length - covered)
+        runs &= runs >> step
+        covered += step
+    return runs
+
+
+def find_common_slots(
+    calendars: Sequence[Calendar],
+    duration_minutes: int,
+    now: datetime,
+    days: int,
+    limit: int = 3,
+    per_day: int = 2,
+) -> List[datetime]:
+    """
+    Earliest start times (UTC) when every attendee is inside working hours
+    and not busy, at most ``per_day`` per day and ``limit`` in total.
+    """
+    origin, end = horizon(now, days)
+    total_days = (end - origin).days
+    slots = total_days * SLOTS_PER_DAY
+    length = max(1, -(-duration_minutes // SLOT_MINUTES))
+
+    # Nothing before the next slot boundary from now
+    free = _span(_slot(now, origin, ceil=True), slots, slots)
+    for profile, intervals in calendars:
+        free &= working_mask(profile, origin.date(), total_days)
+        free &= ~busy_mask(intervals, origin, slots)
+        if not free:
+            return []
+
+    starts = run_starts(free, length)
+    found: List[datetime] = []
+    day_counts: dict[int, int] = {}
+    while starts and len(found) < limit:
+        index = (starts & -starts).bit_length() - 1
+        day = index // SLOTS_PER_DAY
+        if day_counts.get(day, 0) >= per_day:
+            next_index = (day + 1) * SLOTS_PER_DAY
+        else:
+            day_counts[day] = day_counts.get(day, 0) + 1
+            found.append(origin + index * SLOT)
+            # Offer non-overlapping options
+            next_index = index + length
+        starts &= ~((1 << next_index) - 1)
+    return found
+
+
+def slot_label(start: datetime, tz: str, now: datetime) -> str:
+    """E.g. "Today, 2:00 PM EST" or "Wed Jan 7, 10:00 AM CET" in ``tz``."""
+    zone = _zone(tz)
+    local = start.astimezone(zone)
+    days_ahead = (local.date() - now.astimezone(zone).date()).days
+    if days_ahead == 0:
+        day = "Today"
+    elif days_ahead == 1:
+        day = "Tomorrow"
+    else:
+        day = f"{local:%a %b} {local.day}"
+    return f"{day}, {local:%I:%M %p}".replace(", 0", ", ") + f" {local:%Z}"
+
+
+def duration_label(minutes: int) -> str:
+    if minutes % 60 == 0:
+        hours = minutes // 60
+        return f"{hours} hour" if hours == 1 else f"{hours} hours"
+    return f"{minutes} mins"
+
+
+def _slot(at: datetime, origin: datetime, ceil: bool = False) -> int:
+    index, rest = divmod(at - origin, SLOT)
+    return index + 1 if ceil and rest else index
+
+
+def _span(start: int, end: int, limit: int) -> int:
+    start, end = max(start, 0), min(end, limit)
+    if end <= start:
+        return 0
+    return ((1 << (end - start)) - 1) << start
+
+
+def _parse(value: str) -> datetime | None:
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    # Naive timestamps are stored as UTC
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
@@ -0,0 +1,334 @@
+"""
+Thread event fan-out for subscribers other than the requesting connection.
+
+Every event a ``/chatkit`` stream sends for a thread is also published on
+the thread's channel, so other tabs and other workers can follow the
+conversation at ``GET /threads/{id}/events`` without polling the store.
+
+EVENT_BUS selects the broker:
+
+- ``memory`` (default): subscribers in this process only.
+- ``redis``: Redis pub/sub at REDIS_URL, so every worker sees every event.
+  Publishing goes through a bounded outbox drained by a background task,
+  so a slow broker never stalls the model stream.
+
+Each subscriber has a buffer of EVENT_BUFFER_SIZE events. Publishing never
+waits on a subscriber: one whose buffer is full is cut off after the
+events it already holds, and the client reloads the thread and
+resubscribes. Losing events silently would leave it with a half-applied
+stream. Events lost on the way through Redis (a full outbox, a failed
+publish, a dropped subscription) cut off the thread's subscribers the same
+way, on every worker.
+"""
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from app.metrics import metric, register_collector, unregister_collector
+
+logger = logging.getLogger(__name__)
+
+EVENT_BUS = os.getenv("EVENT_BUS", "memory")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+EVENT_BUFFER_SIZE = int(os.getenv("EVENT_BUFFER_SIZE", "256"))
+EVENT_OUTBOX_SIZE = int(os.getenv("EVENT_OUTBOX_SIZE", "10000"))
+# Seconds between SSE comments on an idle subscription, to keep proxies open
+EVENT_KEEPALIVE = float(os.getenv("EVENT_KEEPALIVE", "15"))
+
+CHANNEL_PREFIX = "chatkit:thread:"
+# Published on a thread's channel once events for it could not be; never a
+# serialized event, which is JSON
+RESYNC = b"\x00resync"
+# Events written to Redis per pipeline round trip
+PUBLISH_BATCH = 256
+
+
+class Subscription:
+    """
+    One subscriber's buffer. ``get`` returns serialized events in order,
+    then None once the subscription has ended; ``reason`` says why.
+    """
+
+    __slots__ = ("thread_id", "reason", "_queue")
+
+    def __init__(self, thread_id: str, buffer_size: int):
+        self.thread_id = thread_id
+        self.reason: str | None = None
+        self._queue: asyncio.Queue[bytes | None] = asyncio.Queue(buffer_size)
+
+    def offer(self, payload: bytes) -> bool:
+        if self.reason is not None:
+            return False
+        try:
+            self._queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # The reader drains what it holds, then sees the end
+            self.reason = "overflow"
+            return False
+        return True
+
+    def end(self, reason: str) -> None:
+        if self.reason is None:
+            self.reason = reason
+            if self._queue.empty():
+                self._queue.put_nowait(None)
+
+    async def get(self) -> bytes | None:
+        if self.reason is not None and self._queue.empty():
+            return None
+        return await self._queue.get()
+
+
+class EventBus:
+    """In-process fan-out. Subclasses carry events between processes."""
+
+    def __init__(self, buffer_size: int = EVENT_BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self._subscribers: dict[str, set[Subscription]] = {}
+
+        self.published = 0
+        self.delivered = 0
+        self.overflows = 0
+
+    def wants(self, thread_id: str) -> bool:
+        """Whether publishing on ``thread_id`` can reach anyone."""
+        return thread_id in self._subscribers
+
+    def publish(self, thread_id: str, payload: bytes) -> None:
+        self.published += 1
+        self._fan_out(thread_id, payload)
+
+    def _fan_out(self, thread_id: str, payload: bytes) -> None:
+        for subscription in self._subscribers.get(thread_id, ()):
+            # Cut-off subscriptions stay registered until their reader leaves
+            if subscription.reason is not None:
+                continue
+            if subscription.offer(payload):
+                self.delivered += 1
+            else:
+                self.overflows += 1
+
+    def _cut_off(self, thread_id: str) -> None:
+        """Ends ``thread_id``'s subscriptions as if their buffers were full."""
+        for subscription in self._subscribers.get(thread_id, ()):
+            if subscription.reason is None:
+                subscription.end("overflow")
+                self.overflows += 1
+
+    @asynccontextmanager
+    async def subscribe(self, thread_id: str) -> AsyncIterator[Subscription]:
+        subscription = Subscription(thread_id, self.buffer_size)
+        subscribers = self._subscribers.get(thread_id)
+        if subscribers is None:
+            subscribers = self._subscribers[thread_id] = set()
+            await self._watch(thread_id)
+        subscribers.add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscription.end("closed")
+            subscribers.discard(subscription)
+            # close() may have dropped the set already
+            if not subscribers and self._subscribers.get(thread_id) is subscribers:
+                del self._subscribers[thread_id]
+                await self._unwatch(thread_id)
+
+    async def start(self) -> None:
+        """Connects to the broker, if any."""
+
+    async def _watch(self, thread_id: str) -> None:
+        """First local subscriber for ``thread_id``."""
+
+    async def _unwatch(self, thread_id: str) -> None:
+        """Last local subscriber for ``thread_id`` has left."""
+
+    async def close(self) -> None:
+        for subscribers in list(self._subscribers.values()):
+            for subscription in subscribers:
+                subscription.end("closed")
+        self._subscribers.clear()
+        unregister_collector(self.collect)
+
+    def collect(self) -> list[str]:
+        return [
+            *metric(
+                "event_bus_subscribers",
+                "gauge",
+                "Open thread event subscriptions in this process.",
+                sum(len(s) for s in self._subscribers.values()),
+            ),
+            *metric(
+                "event_bus_published_total",
+                "counter",
+                "Thread events published by this process.",
+                self.published,
+            ),
+            *metric(
+                "event_bus_delivered_total",
+                "counter",
+                "Thread events buffered for local subscribers.",
+                self.delivered,
+            ),
+            *metric(
+                "event_bus_overflows_total",
+                "counter",
+                "Subscriptions cut off because events were lost.",
+                self.overflows,
+            ),
+        ]
+
+
+class RedisEventBus(EventBus):
+    """
+    Redis pub/sub, one channel per thread. A process subscribes to a
+    channel only while it has a local subscriber for that thread and fans
+    the messages out itself, so its own events arrive the same way as
+    everyone else's.
+    """
+
+    def __init__(
+        self,
+        url: str = REDIS_URL,
+        buffer_size: int = EVENT_BUFFER_SIZE,
+        outbox_size: int = EVENT_OUTBOX_SIZE,
+    ):
+        super().__init__(buffer_size)
+        self.url = url
+        self._client = None
+        self._pubsub = None
+        self._outbox: asyncio.Queue[tuple[str, bytes]] = asyncio.Queue(outbox_size)
+        # Threads that lost events; RESYNC goes out on their channels next
+        self._resync: set[str] = set()
+        self._writer: asyncio.Task | None = None
+        self._reader: asyncio.Task | None = None
+        self._connect_lock = asyncio.Lock()
+
+        self.outbox_drops = 0
+
+    async def _connect(self):
+        if self._client is None:
+            async with self._connect_lock:
+                if self._client is None:
+                    try:
+                        import redis.asyncio as redis
+                    except ImportError as e:
+                        raise RuntimeError(
+                            "Redis event bus requires redis: pip install 'backend[redis]'"
+                        ) from e
+                    client = redis.from_url(self.url)
+                    self._pubsub = client.pubsub(ignore_subscribe_messages=True)
+                    self._client = client
+        return self._client
+
+    def wants(self, thread_id: str) -> bool:
+        # Subscribers may be on any worker
+        return True
+
+    def publish(self, thread_id: str, payload: bytes) -> None:
+        self.published += 1
+        try:
+            self._outbox.put_nowait((thread_id, payload))
+        except asyncio.QueueFull:
+            self.outbox_drops += 1
+            self._lost(thread_id)
+
+    def _lost(self, thread_id: str) -> None:
+        self._resync.add(thread_id)
+        # Local subscribers needn't wait for the broker to recover
+        self._cut_off(thread_id)
+
+    async def start(self) -> None:
+        client = await self._connect()
+        # Fail at startup rather than on the first published event
+        await client.ping()
+        self._writer = asyncio.create_task(self._write(client))
+
+    async def _write(self, client) -> None:
+        while True:
+            if self._resync and self._outbox.empty():
+                batch = []  # Only RESYNCs left to send, e.g. after a failure
+            else:
+                batch = [await self._outbox.get()]
+            while len(batch) < PUBLISH_BATCH and not self._outbox.empty():
+                batch.append(self._outbox.get_nowait())
+            resync, self._resync = self._resync, set()
+            try:
+                async with client.pipeline(transaction=False) as pipe:
+                    for thread_id, payload in batch:
+                        pipe.publish(CHANNEL_PREFIX + thread_id, payload)
+                    for thread_id in resync:
+                        pipe.publish(CHANNEL_PREFIX + thread_id, RESYNC)
+                    await pipe.execute()
+            except Exception:
+                self.outbox_drops += len(batch)
+                logger.exception("Dropped %d thread events: Redis publish failed", len(batch))
+                for thread_id in {*resync, *(thread_id for thread_id, _ in batch)}:
+                    self._lost(thread_id)
+                await asyncio.sleep(1.0)
+
+    async def _watch(self, thread_id: str) -> None:
+        await self._connect()
+        await self._pubsub.subscribe(CHANNEL_PREFIX + thread_id)
+        if self._reader is None:
+            self._reader = asyncio.create_task(self._read())
+
+    async def _unwatch(self, thread_id: str) -> None:
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe(CHANNEL_PREFIX + thread_id)
+
+    async def _read(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+            except Exception:
+                logger.exception("Redis event subscription failed; retrying")
+                # Whatever was published meanwhile is gone
+                for thread_id in list(self._subscribers):
+                    self._cut_off(thread_id)
+                await asyncio.sleep(1.0)
+                continue
+            if message is None:
+                if not self._pubsub.subscribed:
+                    await asyncio.sleep(0.1)
+                continue
+            if message["type"] == "message":
+                thread_id = message["channel"].decode().removeprefix(CHANNEL_PREFIX)
+                if message["data"] == RESYNC:
+                    self._cut_off(thread_id)
+                else:
+                    self._fan_out(thread_id, message["data"])
+
+    async def close(self) -> None:
+        await super().close()
+        for task in (self._writer, self._reader):
+            if task is not None:
+                task.cancel()
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+        if self._client is not None:
+            await self._client.aclose()
+
+    def collect(self) -> list[str]:
+        return [
+            *super().collect(),
+            *metric(
+                "event_bus_outbox_dropped_total",
+                "counter",
+                "Events not published to Redis: outbox full or publish failed.",
+                self.outbox_drops,
+            ),
+        ]
+
+
+def create_event_bus(kind: str = EVENT_BUS) -> EventBus:
+    if kind == "memory":
+        bus = EventBus()
+    elif kind == "redis":
+        bus = RedisEventBus()
+    else:
+        raise ValueError(f"Unknown EVENT_BUS {kind!r}")
+    register_collector(bus.collect)
+    return bus
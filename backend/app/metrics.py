@@ -0,0 +1,54 @@
+"""
+Minimal Prometheus text-format exposition for ``GET /metrics``.
+
+Components register a collector that returns ready-formatted metric lines;
+``render_metrics`` concatenates them. This avoids pulling in a client
+library for the handful of gauges and counters the server exports.
+"""
+
+from typing import Callable, Iterable, Sequence
+
+Collector = Callable[[], Iterable[str]]
+
+_collectors: list[Collector] = []
+
+
+def register_collector(collector: Collector) -> None:
+    if collector not in _collectors:
+        _collectors.append(collector)
+
+
+def unregister_collector(collector: Collector) -> None:
+    if collector in _collectors:
+        _collectors.remove(collector)
+
+
+def render_metrics() -> str:
+    lines = []
+    for collector in _collectors:
+        lines.extend(collector())
+    return "\n".join(lines) + "\n"
+
+
+def metric(name: str, kind: str, help_text: str, value: float) -> list[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value}"]
+
+
+def histogram(
+    name: str,
+    help_text: str,
+    buckets: Sequence[float],
+    counts: Sequence[int],
+    total: float,
+) -> list[str]:
+    """``counts[i]`` is the number of observations <= ``buckets[i]`` (non-cumulative)."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    cumulative = 0
+    for bound, n in zip(buckets, counts):
+        cumulative += n
+        lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+    cumulative += counts[len(buckets)] if len(counts) > len(buckets) else 0
+    lines.append(f'{name}_bucket{{le="+Inf"}} {cumulative}')
+    lines.append(f"{name}_sum {total}")
+    lines.append(f"{name}_count {cumulative}")
+    return lines
@@ -0,0 +1,162 @@
+"""
+Event-loop health monitoring.
+
+LOOP_MONITOR selects the mode:
+
+- ``off`` (default): nothing runs.
+- ``on``: a lag probe measures how late the loop wakes up from a short sleep,
+  and a watchdog thread grabs the loop thread's stack whenever the loop has
+  been blocked for longer than LOOP_STALL_THRESHOLD seconds.
+- ``debug``: as ``on``, plus asyncio debug mode, which logs every callback
+  slower than the threshold.
+
+Lag is exported through ``/metrics``; recent stall samples with stacks are
+served from ``/debug/loop``.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from collections import deque
+
+from app.metrics import histogram, metric, register_collector, unregister_collector
+
+logger = logging.getLogger(__name__)
+
+LOOP_MONITOR = os.getenv("LOOP_MONITOR", "off")
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.1"))
+LOOP_STALL_THRESHOLD = float(os.getenv("LOOP_STALL_THRESHOLD", "0.1"))
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class LoopMonitor:
+    def __init__(
+        self,
+        interval: float = LOOP_LAG_INTERVAL,
+        stall_threshold: float = LOOP_STALL_THRESHOLD,
+        debug: bool = False,
+        max_samples: int = 50,
+    ):
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.debug = debug
+
+        self.lag_counts = [0] * (len(LAG_BUCKETS) + 1)
+        self.lag_sum = 0.0
+        self.lag_max = 0.0
+        self.last_lag = 0.0
+        self.stalls = 0
+        self.samples: deque[dict] = deque(maxlen=max_samples)
+
+        self._heartbeat = time.monotonic()
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+        self._loop_thread_id: int | None = None
+
+    # --- Lifecycle ---
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self.debug:
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.stall_threshold
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = loop.create_task(self._probe())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        register_collector(self.collect)
+
+    async def stop(self) -> None:
+        unregister_collector(self.collect)
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # --- Measurement ---
+    async def _probe(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.observe_lag(max(time.perf_counter() - start - self.interval, 0.0))
+            self._heartbeat = time.monotonic()
+
+    def observe_lag(self, lag: float) -> None:
+        self.lag_counts[bisect_left(LAG_BUCKETS, lag)] += 1
+        self.lag_sum += lag
+        self.last_lag = lag
+        self.lag_max = max(self.lag_max, lag)
+
+    def _watch(self) -> None:
+        sampled_beat = None
+        while not self._stopped.wait(self.stall_threshold / 2):
+            beat = self._heartbeat
+            blocked = time.monotonic() - beat - self.interval
+            if blocked < self.stall_threshold or beat == sampled_beat:
+                continue
+            # One sample per stall: the stack of whatever is hogging the loop
+            sampled_beat = beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else ""
+            self.stalls += 1
+            self.samples.append(
+                {"at": time.time(), "blocked_at_least": round(blocked, 4), "stack": stack}
+            )
+            logger.warning(
+                f"Event loop blocked for {blocked * 1000:.0f} ms at:\n{stack}"
+            )
+
+    # --- Export ---
+    def collect(self) -> list[str]:
+        return [
+            *histogram(
+                "event_loop_lag_seconds",
+                "Delay between when the loop should have woken up and when it did.",
+                LAG_BUCKETS,
+                self.lag_counts,
+                self.lag_sum,
+            ),
+            *metric(
+                "event_loop_lag_max_seconds", "gauge", "Largest lag observed.", self.lag_max
+            ),
+            *metric(
+                "event_loop_lag_last_seconds", "gauge", "Most recent lag.", self.last_lag
+            ),
+            *metric(
+                "event_loop_stalls_total",
+                "counter",
+                "Times the loop was blocked longer than the stall threshold.",
+                self.stalls,
+            ),
+        ]
+
+    def snapshot(self) -> dict:
+        return {
+            "lag_max_seconds": self.lag_max,
+            "lag_last_seconds": self.last_lag,
+            "stalls": self.stalls,
+            "stall_threshold_seconds": self.stall_threshold,
+            "samples": list(self.samples),
+        }
+
+
+def create_loop_monitor(mode: str = LOOP_MONITOR) -> LoopMonitor | None:
+    if mode == "off":
+        return None
+    if mode not in ("on", "debug"):
+        raise ValueError(f"Unknown LOOP_MONITOR {mode!r}")
+    return LoopMonitor(debug=mode == "debug")
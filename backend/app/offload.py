@@ -0,0 +1,53 @@
+"""
+Optional offloading of CPU-heavy work (widget rendering, pydantic
+validation/serialization of thread items) off the event loop.
+
+CPU_OFFLOAD is ``off`` (default, run inline), ``thread`` or ``process``.
+Process mode sidesteps the GIL but pickles arguments and results, so the
+callable must be a module-level function.
+"""
+
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, TypeVar
+
+CPU_OFFLOAD = os.getenv("CPU_OFFLOAD", "off")
+CPU_OFFLOAD_WORKERS = int(os.getenv("CPU_OFFLOAD_WORKERS", "0")) or None
+
+T = TypeVar("T")
+
+_executor: Executor | None = None
+
+
+def get_executor() -> Executor | None:
+    global _executor
+    if CPU_OFFLOAD == "off":
+        return None
+    if _executor is None:
+        if CPU_OFFLOAD == "thread":
+            _executor = ThreadPoolExecutor(
+                CPU_OFFLOAD_WORKERS, thread_name_prefix="cpu-offload"
+            )
+        elif CPU_OFFLOAD == "process":
+            _executor = ProcessPoolExecutor(CPU_OFFLOAD_WORKERS)
+        else:
+            raise ValueError(f"Unknown CPU_OFFLOAD {CPU_OFFLOAD!r}")
+    return _executor
+
+
+async def run_cpu(fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Runs ``fn`` inline or on the offload pool, depending on CPU_OFFLOAD."""
+    executor = get_executor()
+    if executor is None:
+        return fn(*args, **kwargs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(fn, *args, **kwargs))
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
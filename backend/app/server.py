@@ -1,9 +1,10 @@
 import logging
-from typing import AsyncIterator, Any
+from typing import AsyncIterator, Any, Callable, Sequence
 from datetime import datetime
 
 from agents import Runner
 from chatkit.server import ChatKitServer
+from chatkit.widgets import WidgetRoot
 from chatkit.agents import AgentContext, simple_to_agent_input, stream_agent_response
 from chatkit.types import (
     ThreadMetadata,
@@ -15,21 +16,87 @@ from chatkit.types import (
     Action,
     WidgetItem,
     HiddenContextItem,
-    ThreadItemReplacedEvent,
+    ThreadItemUpdatedEvent,
+    StreamOptionsEvent,
 )
 
 from app.types import RequestContext
-from app.store.chat_store import SqliteChatStore
-from app.store.app_store import create_event, get_contacts_by_ids
+from app.events import EventBus
+from app.offload import run_cpu
+from app.store.chat_store import ChatStore
+from app.store.app_store import create_event, get_contacts_by_ids, search_contacts_page
+from app.store.backends import EventConflictError
+from app.agents.models import build_run_config
 from app.agents.scheduler import scheduler_agent
-from app.widgets.builders import build_meeting_confirmed, build_selection_locked # Import the new builder
+from app.widgets.builders import (
+    CONTACT_PAGE_SIZE,
+    build_contact_picker,
+    build_meeting_confirmed,
+    build_selection_locked,
+    picker_carried,
+)
+from app.widgets.patch import diff_widgets
 
 logger = logging.getLogger(__name__)
 
 
+def _selected_contact_ids(
+    payload: dict[str, Any], carried: Sequence[str] = ()
+) -> list[str]:
+    """
+    Contact IDs ticked in a contact picker form, plus those carried over from
+    other pages of the same picker: in the paging actions' payloads, or, on
+    confirm, read from the stored picker (see ``picker_carried``).
+    """
+    selected_map = payload.get("selected", {})
+    if not isinstance(selected_map, dict):
+        # Fallback in case of flat payload (depends on specific SDK version/config)
+        selected_ids = [
+            key.replace("selected.", "") 
+            for key, val in payload.items() 
+            if key.startswith("selected.") and val is True
+        ]
+    else:
+        # Standard nested behavior
+        selected_ids = [
+            contact_id for contact_id, is_selected in selected_map.items() 
+            if is_selected is True
+        ]
+    # Pickers stored before the selection moved to the pager sent it here
+    carried = [*carried, *(payload.get("carried") or [])]
+    return list(dict.fromkeys([*carried, *selected_ids]))
+
+
+def _page_offset(payload: dict[str, Any]) -> int:
+    """The picker page requested; anything unusable means the first page."""
+    try:
+        return max(int(payload.get("offset", 0)), 0)
+    except (TypeError, ValueError):
+        return 0
+
+
 class MeetingSchedulerServer(ChatKitServer[RequestContext]):
-    def __init__(self):
-        super().__init__(store=SqliteChatStore())
+    def __init__(self, events: EventBus | None = None):
+        super().__init__(store=ChatStore())
+        self.events = events or EventBus()
+
+    async def _process_events(
+        self,
+        thread: ThreadMetadata,
+        context: RequestContext,
+        stream: Callable[[], AsyncIterator[ThreadStreamEvent]],
+    ) -> AsyncIterator[ThreadStreamEvent]:
+        """
+        Publishes the thread's events for other subscribers. Every event
+        from respond() and action() passes through here exactly once (action()
+        re-enters respond()), after the store write it implies and with
+        hidden context items already filtered out.
+        """
+        async for event in super()._process_events(thread, context, stream):
+            # Stream options only concern the requesting connection
+            if not isinstance(event, StreamOptionsEvent) and self.events.wants(thread.id):
+                self.events.publish(thread.id, self._serialize(event))
+            yield event
 
     async def respond(
         self,
@@ -58,13 +125,35 @@ class MeetingSchedulerServer(ChatKitServer[RequestContext]):
 
         # 4. Run Agent
         result = Runner.run_streamed(
-            scheduler_agent, input_items, context=agent_context
+            scheduler_agent,
+            input_items,
+            context=agent_context,
+            run_config=build_run_config(),
         )
 
         # 5. Stream Events
         async for event in stream_agent_response(agent_context, result):
             yield event
 
+    async def _patch_widget(
+        self,
+        thread: ThreadMetadata,
+        sender: WidgetItem,
+        widget: WidgetRoot,
+        context: RequestContext,
+    ) -> list[ThreadItemUpdatedEvent]:
+        """
+        Moves ``sender`` to ``widget`` by persisting only the components that
+        changed, instead of replacing the whole item. Returns the events to
+        stream once the write has committed.
+        """
+        patches = await run_cpu(diff_widgets, sender.widget, widget)
+        await self.store.patch_widget_item(thread.id, sender.id, patches, context)
+        return [
+            ThreadItemUpdatedEvent(item_id=sender.id, update=patch.to_update(widget))
+            for patch in patches
+        ]
+
     async def action(
         self,
         thread: ThreadMetadata,
@@ -78,21 +167,9 @@ class MeetingSchedulerServer(ChatKitServer[RequestContext]):
         logger.info(f"Action received: {action.type} with payload: {action.payload}")
 
         if action.type == "contacts.confirm":
-            selected_map = action.payload.get("selected", {})
-            if not isinstance(selected_map, dict):
-                # Fallback in case of flat payload (depends on specific SDK version/config)
-                selected_ids = [
-                    key.replace("selected.", "") 
-                    for key, val in action.payload.items() 
-                    if key.startswith("selected.") and val is True
-                ]
-            else:
-                # Standard nested behavior
-                selected_ids = [
-                    contact_id for contact_id, is_selected in selected_map.items() 
-                    if is_selected is True
-                ]
-            
+            carried = picker_carried(sender.widget) if sender else []
+            selected_ids = _selected_contact_ids(action.payload, carried)
+
             if not selected_ids:
                 yield ThreadItemDoneEvent(
                     item=AssistantMessageItem(
@@ -105,54 +182,86 @@ class MeetingSchedulerServer(ChatKitServer[RequestContext]):
                 return
 
             # 1. Resolve names
-            contacts = await get_contacts_by_ids(selected_ids)
+            contacts = await get_contacts_by_ids(selected_ids, owner_id=context.user_id)
             names = ", ".join([c.name for c in contacts])
 
-            # 2. LOCK THE WIDGET (Prevent re-clicking)
-            if sender:
-                locked_widget = build_selection_locked(
-                    title="Attendees Confirmed",
-                    detail=f"{len(contacts)} selected: {names}"
+            # 2. LOCK THE WIDGET (Prevent re-clicking) and 3. Inject Hidden
+            # Context for the LLM, together: a locked picker without the
+            # selection the agent needs would strand the conversation
+            updates = []
+            async with self.store.transaction(context):
+                if sender:
+                    locked_widget = build_selection_locked(
+                        title="Attendees Confirmed",
+                        detail=f"{len(contacts)} selected: {names}"
+                    )
+                    # Patch the sender in place, sending only what changed
+                    updates = await self._patch_widget(thread, sender, locked_widget, context)
+
+                hidden_item = HiddenContextItem(
+                    id=self.store.generate_item_id("hidden_context_item", thread, context),
+                    thread_id=thread.id,
+                    created_at=datetime.now(),
+                    content=f"<USER_ACTION>User confirmed selection of contacts: {names} (IDs: {selected_ids})</USER_ACTION>"
                 )
-                # Reuse sender ID to replace in-place
-                new_item = sender.model_copy(update={"widget": locked_widget})
-                yield ThreadItemReplacedEvent(item=new_item)
-
-            # 3. Inject Hidden Context for the LLM
-            hidden_item = HiddenContextItem(
-                id=self.store.generate_item_id("hidden_context_item", thread, context),
-                thread_id=thread.id,
-                created_at=datetime.now(),
-                content=f"<USER_ACTION>User confirmed selection of contacts: {names} (IDs: {selected_ids})</USER_ACTION>"
-            )
-            await self.store.add_thread_item(thread.id, hidden_item, context)
+                await self.store.add_thread_item(thread.id, hidden_item, context)
+            for event in updates:
+                yield event
 
             # 4. Trigger Agent Response (Agent will now see the hidden context and call find_availability)
             async for event in self.respond(thread, None, context):
                 yield event
 
+        # --- CONTACT PICKER PAGING ---
+        elif action.type == "contacts.page":
+            query = action.payload.get("query", "")
+            offset = _page_offset(action.payload)
+            # Keep ticks from the page being left as well as earlier pages
+            carried = _selected_contact_ids(action.payload)
+
+            contacts, has_more = await search_contacts_page(
+                context.user_id, query, offset=offset, limit=CONTACT_PAGE_SIZE
+            )
+
+            # Swap the picker in place for the requested page
+            if sender:
+                page_widget = await run_cpu(
+                    build_contact_picker,
+                    contacts,
+                    query=query,
+                    offset=offset,
+                    has_more=has_more,
+                    carried=carried,
+                )
+                for event in await self._patch_widget(thread, sender, page_widget, context):
+                    yield event
+
         # --- TIME SLOT SELECTION---
         elif action.type == "schedule.pick_slot":
             slot_id = action.payload.get("slot_id")
             time_label = action.payload.get("time_label", "Selected Slot")
+            start = action.payload.get("start", "")
+            minutes = action.payload.get("duration_minutes", 60)
 
-            # 1. LOCK THE WIDGET
-            if sender:
-                locked_widget = build_selection_locked(
-                    title="Time Selected",
-                    detail=time_label
+            # 1. LOCK THE WIDGET and 2. Inject Hidden Context, together
+            updates = []
+            async with self.store.transaction(context):
+                if sender:
+                    locked_widget = build_selection_locked(
+                        title="Time Selected",
+                        detail=time_label
+                    )
+                    updates = await self._patch_widget(thread, sender, locked_widget, context)
+
+                hidden_item = HiddenContextItem(
+                    id=self.store.generate_item_id("hidden_context_item", thread, context),
+                    thread_id=thread.id,
+                    created_at=datetime.now(),
+                    content=f"<USER_ACTION>User selected time slot ID: {slot_id} ({time_label}), start_time: {start}, duration_minutes: {minutes}</USER_ACTION>"
                 )
-                new_item = sender.model_copy(update={"widget": locked_widget})
-                yield ThreadItemReplacedEvent(item=new_item)
-
-            # 2. Inject Hidden Context
-            hidden_item = HiddenContextItem(
-                id=self.store.generate_item_id("hidden_context_item", thread, context),
-                thread_id=thread.id,
-                created_at=datetime.now(),
-                content=f"<USER_ACTION>User selected time slot ID: {slot_id} ({time_label})</USER_ACTION>"
-            )
-            await self.store.add_thread_item(thread.id, hidden_item, context)
+                await self.store.add_thread_item(thread.id, hidden_item, context)
+            for event in updates:
+                yield event
 
             # 3. Trigger Agent Response (Agent will now call draft_invite)
             async for event in self.respond(thread, None, context):
@@ -167,8 +276,8 @@ class MeetingSchedulerServer(ChatKitServer[RequestContext]):
                     title="Action",
                     detail="Requested Changes"
                 )
-                new_item = sender.model_copy(update={"widget": locked_widget})
-                yield ThreadItemReplacedEvent(item=new_item)
+                for event in await self._patch_widget(thread, sender, locked_widget, context):
+                    yield event
 
             yield ThreadItemDoneEvent(
                 item=AssistantMessageItem(
@@ -186,26 +295,66 @@ class MeetingSchedulerServer(ChatKitServer[RequestContext]):
         # --- FINAL SEND ---
         elif action.type == "invite.send":
             p = action.payload or {}
+            if not (p.get("start_time") and p.get("end_time")):
+                # Drafts from before bookings carried their times
+                yield ThreadItemDoneEvent(
+                    item=AssistantMessageItem(
+                        id=self.store.generate_item_id("message", thread, context),
+                        thread_id=thread.id,
+                        created_at=datetime.now(),
+                        content=[
+                            AssistantMessageContent(
+                                text="This draft has no exact time attached. Please pick a time slot again so I can redraft it."
+                            )
+                        ],
+                    )
+                )
+                return
 
-            # 1. Write to DB
-            await create_event(
-                organizer_id=context.user_id,
-                subject=p.get("subject", "No Subject"),
-                agenda=p.get("agenda", ""),
-                location=p.get("location", "Zoom"),
-                attendees=p.get("attendees", "Unknown Attendees"),
-                time_str=p.get("time_str", "Unknown Time"),
-            )
+            # 1. Write to DB and 2. Replace the Editable Widget with a Static
+            # Confirmation Widget, in one transaction: if the widget can't be
+            # updated, no event is booked behind an editor that still looks
+            # unsent. The draft's idempotency key (or, for older drafts, the
+            # widget item id) makes a retried submit a no-op.
+            updates = []
+            try:
+                async with self.store.transaction(context):
+                    await create_event(
+                        organizer_id=context.user_id,
+                        subject=p.get("subject", "No Subject"),
+                        agenda=p.get("agenda", ""),
+                        location=p.get("location", "Zoom"),
+                        attendees=p.get("attendees", ""),
+                        start_time=p["start_time"],
+                        end_time=p["end_time"],
+                        idempotency_key=p.get("idempotency_key") or (sender.id if sender else None),
+                    )
 
-            # 2. Replace the Editable Widget with a Static Confirmation Widget
-            if sender:
-                confirmed_widget = build_meeting_confirmed(
-                    subject=p.get("subject", "Meeting Scheduled"), 
-                    time_str=p.get("time_str", "Selected Time")
+                    if sender:
+                        confirmed_widget = build_meeting_confirmed(
+                            subject=p.get("subject", "Meeting Scheduled"), 
+                            time_str=p.get("time_str", "Selected Time")
+                        )
+                        updates = await self._patch_widget(thread, sender, confirmed_widget, context)
+            except EventConflictError as e:
+                # Leave the editor interactive so the user can pick another time
+                busy = "; ".join(f"{c.subject} at {c.start_time}" for c in e.conflicts)
+                yield ThreadItemDoneEvent(
+                    item=AssistantMessageItem(
+                        id=self.store.generate_item_id("message", thread, context),
+                        thread_id=thread.id,
+                        created_at=datetime.now(),
+                        content=[
+                            AssistantMessageContent(
+                                text=f"That time conflicts with existing meetings ({busy}). Would you like to choose a different slot?"
+                            )
+                        ],
+                    )
                 )
+                return
 
-                new_item = sender.model_copy(update={"widget": confirmed_widget})
-                yield ThreadItemReplacedEvent(item=new_item)
+            for event in updates:
+                yield event
 
             # 3. Confirmation Message
             yield ThreadItemDoneEvent(
@@ -1,178 +1,108 @@
 import logging
-from typing import List
+from typing import AsyncIterator, Dict, List, Sequence, Tuple
 import uuid
 
-from app.database import get_db_connection
-from app.types import Contact
+from app.database import get_backend
+from app.types import ContactRecord, EventRecord, WorkingHours
 
 logger = logging.getLogger(__name__)
 
 
 async def init_db():
-    # FIXED: usage of async context manager
-    async with get_db_connection() as db:
-        # Business Tables
-        await db.execute(
-            """
-            CREATE TABLE IF NOT EXISTS users (
-                id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                email TEXT NOT NULL
-            )
-        """
-        )
-        await db.execute(
-            """
-            CREATE TABLE IF NOT EXISTS contacts (
-                id TEXT PRIMARY KEY,
-                owner_id TEXT NOT NULL,
-                name TEXT NOT NULL,
-                email TEXT NOT NULL,
-                role TEXT NOT NULL,
-                avatar_url TEXT,
-                FOREIGN KEY(owner_id) REFERENCES users(id)
-            )
-        """
-        )
-        await db.execute(
-            """
-            CREATE TABLE IF NOT EXISTS events (
-                id TEXT PRIMARY KEY,
-                organizer_id TEXT NOT NULL,
-                subject TEXT NOT NULL,
-                start_time TEXT NOT NULL,
-                end_time TEXT NOT NULL,
-                attendees TEXT NOT NULL,
-                location TEXT,
-                agenda TEXT,
-                status TEXT DEFAULT 'confirmed',
-                FOREIGN KEY(organizer_id) REFERENCES users(id)
-            )
-        """
-        )
-
-        # ChatKit Tables
-        await db.execute(
-            """
-            CREATE TABLE IF NOT EXISTS threads (
-                id TEXT PRIMARY KEY,
-                user_id TEXT NOT NULL,
-                created_at TEXT NOT NULL,
-                data JSON NOT NULL
-            )
-        """
-        )
-        await db.execute(
-            """
-            CREATE TABLE IF NOT EXISTS items (
-                id TEXT PRIMARY KEY,
-                thread_id TEXT NOT NULL,
-                user_id TEXT NOT NULL,
-                created_at TEXT NOT NULL,
-                data JSON NOT NULL,
-                FOREIGN KEY(thread_id) REFERENCES threads(id) ON DELETE CASCADE
-            )
-        """
-        )
-        await db.commit()
+    await get_backend().init_schema()
 
 
 async def seed_db():
-    async with get_db_connection() as db:
-        # Check if users exist
-        async with db.execute("SELECT count(*) FROM users") as cursor:
-            row = await cursor.fetchone()
-            count = row[0]
-
-        if count == 0:
-            logger.info("Seeding database...")
-            # Users
-            await db.execute(
-                "INSERT INTO users (id, name, email) VALUES (?, ?, ?)",
+    backend = get_backend()
+    # Check if users exist (EXISTS, not COUNT: stays cheap on big datasets)
+    if not await backend.has_users():
+        logger.info("Seeding database...")
+        # Users
+        await backend.insert_users(
+            [
                 ("alice", "Alice Executive", "alice@example.com"),
-            )
-            await db.execute(
-                "INSERT INTO users (id, name, email) VALUES (?, ?, ?)",
                 ("bob", "Bob Manager", "bob@example.com"),
-            )
-
-            # Contacts for Alice
-            alice_contacts = [
-                (
-                    "c1",
-                    "alice",
-                    "Bob Manager",
-                    "bob@example.com",
-                    "Product Manager",
-                    "https://i.pravatar.cc/150?u=bob",
-                ),
-                (
-                    "c2",
-                    "alice",
-                    "Charlie Designer",
-                    "charlie@example.com",
-                    "Lead Designer",
-                    "https://i.pravatar.cc/150?u=charlie",
-                ),
-                (
-                    "c3",
-                    "alice",
-                    "Dana Engineer",
-                    "dana@example.com",
-                    "CTO",
-                    "https://i.pravatar.cc/150?u=dana",
-                ),
             ]
+        )
 
-            # Contacts for Bob (NEW)
-            bob_contacts = [
-                (
-                    "c4",
-                    "bob",
-                    "Alice Executive",
-                    "alice@example.com",
-                    "Boss",
-                    "https://i.pravatar.cc/150?u=alice",
-                ),
-                (
-                    "c5",
-                    "bob",
-                    "Eve External",
-                    "eve@vendor.com",
-                    "Vendor",
-                    "https://i.pravatar.cc/150?u=eve",
-                ),
-            ]
+        # Contacts for Alice
+        alice_contacts = [
+            (
+                "c1",
+                "alice",
+                "Bob Manager",
+                "bob@example.com",
+                "Product Manager",
+                "https://i.pravatar.cc/150?u=bob",
+            ),
+            (
+                "c2",
+                "alice",
+                "Charlie Designer",
+                "charlie@example.com",
+                "Lead Designer",
+                "https://i.pravatar.cc/150?u=charlie",
+            ),
+            (
+                "c3",
+                "alice",
+                "Dana Engineer",
+                "dana@example.com",
+                "CTO",
+                "https://i.pravatar.cc/150?u=dana",
+            ),
+        ]
 
-            await db.executemany(
-                "INSERT INTO contacts (id, owner_id, name, email, role, avatar_url) VALUES (?, ?, ?, ?, ?, ?)",
-                alice_contacts + bob_contacts,
-            )
-            await db.commit()
+        # Contacts for Bob (NEW)
+        bob_contacts = [
+            (
+                "c4",
+                "bob",
+                "Alice Executive",
+                "alice@example.com",
+                "Boss",
+                "https://i.pravatar.cc/150?u=alice",
+            ),
+            (
+                "c5",
+                "bob",
+                "Eve External",
+                "eve@vendor.com",
+                "Vendor",
+                "https://i.pravatar.cc/150?u=eve",
+            ),
+        ]
+
+        await backend.insert_contacts(alice_contacts + bob_contacts)
+
+        await backend.upsert_working_hours(
+            [
+                WorkingHours("alice", "America/New_York"),
+                WorkingHours("bob", "Europe/London", day_start=8 * 60, day_end=16 * 60),
+            ]
+        )
 
 
 # --- Helper functions for contacts ---
-async def search_contacts_in_db(owner_id: str, query: str) -> List[Contact]:
-    async with get_db_connection() as db:
-        # Use LOWER() for case-insensitive matching in SQLite
-        sql = """
-            SELECT * FROM contacts 
-            WHERE owner_id = ? 
-            AND (LOWER(name) LIKE LOWER(?) OR LOWER(email) LIKE LOWER(?))
-        """
-        search_term = f"%{query}%"
-        async with db.execute(sql, (owner_id, search_term, search_term)) as cursor:
-            rows = await cursor.fetchall()
-            return [Contact(**dict(row)) for row in rows]
-
-
-async def get_contacts_by_ids(ids: List[str]) -> List[Contact]:
-    async with get_db_connection() as db:
-        placeholders = ", ".join(["?"] * len(ids))
-        sql = f"SELECT * FROM contacts WHERE id IN ({placeholders})"
-        async with db.execute(sql, ids) as cursor:
-            rows = await cursor.fetchall()
-            return [Contact(**dict(row)) for row in rows]
+async def search_contacts_in_db(owner_id: str, query: str) -> List[ContactRecord]:
+    return await get_backend().search_contacts(owner_id, query)
+
+
+async def search_contacts_page(
+    owner_id: str, query: str, offset: int, limit: int
+) -> Tuple[List[ContactRecord], bool]:
+    """
+    Returns one page of matches and whether more follow it.
+    """
+    # Fetch one extra row to learn if there is a next page without a COUNT
+    rows = await get_backend().search_contacts(owner_id, query, limit + 1, offset)
+    return rows[:limit], len(rows) > limit
+
+
+async def get_contacts_by_ids(
+    ids: List[str], owner_id: str | None = None
+) -> List[ContactRecord]:
+    return await get_backend().get_contacts_by_ids(ids, owner_id)
 
 
 async def create_event(
@@ -181,35 +111,92 @@ async def create_event(
     agenda: str,
     location: str,
     attendees: str,
-    time_str: str,
+    start_time: str,
+    end_time: str,
+    idempotency_key: str | None = None,
 ) -> str:
-    async with get_db_connection() as db:
-        event_id = str(uuid.uuid4())
-        # In a real app, you'd parse time_str to actual datetime objects.
-        # For this demo, we store strings to match the simplified widget data.
-        await db.execute(
-            """
-            INSERT INTO events (id, organizer_id, subject, agenda, location, attendees, start_time, end_time)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                event_id,
-                organizer_id,
-                subject,
-                agenda,
-                location,
-                attendees,
-                time_str,
-                time_str,
-            ),
+    """
+    Creates an event unless the organizer or an attendee is already busy
+    (raises ``EventConflictError``). ``attendees`` is formatted as by
+    ``format_attendees``; times are ISO 8601 with an offset. Retrying with
+    the same ``idempotency_key`` returns the original event id instead of a
+    duplicate.
+    """
+    return await get_backend().create_event(
+        EventRecord(
+            id=str(uuid.uuid4()),
+            organizer_id=organizer_id,
+            subject=subject,
+            agenda=agenda,
+            location=location,
+            attendees=attendees,
+            start_time=start_time,
+            end_time=end_time,
+            idempotency_key=idempotency_key,
         )
-        await db.commit()
-        return event_id
-
-async def get_events_by_user(user_id: str) -> List[dict]:
-    async with get_db_connection() as db:
-        # Fetch upcoming events for the logged-in user (as organizer)
-        sql = "SELECT * FROM events WHERE organizer_id = ? ORDER BY start_time ASC"
-        async with db.execute(sql, (user_id,)) as cursor:
-            rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
\ No newline at end of file
+    )
+
+
+async def create_events(events: Sequence[EventRecord]) -> int:
+    # Bulk path for imports: one transaction, no overlap checks. Returns how
+    # many were new.
+    return await get_backend().insert_events(events)
+
+async def get_events_by_user(user_id: str) -> List[EventRecord]:
+    # Fetch upcoming events for the logged-in user (as organizer)
+    return await get_backend().get_events_by_organizer(user_id)
+
+
+async def iter_events_by_user(
+    user_id: str, window_size: int = 200, since: str = ""
+) -> AsyncIterator[List[EventRecord]]:
+    # Streams the same events as get_events_by_user without loading them all,
+    # optionally only those starting at or after ``since``
+    async for window in get_backend().iter_events_by_organizer(user_id, window_size, since):
+        yield window
+
+
+async def count_events_by_user(user_id: str, since: str = "") -> int:
+    return await get_backend().count_events_by_organizer(user_id, since)
+
+
+# --- Availability ---
+async def get_working_hours(user_id: str) -> WorkingHours:
+    """The user's profile, or the 09:00-17:00 UTC default."""
+    profiles = await get_backend().get_working_hours([user_id])
+    return profiles[0] if profiles else WorkingHours(user_id=user_id)
+
+
+async def get_attendee_calendars(
+    organizer_id: str, contact_ids: List[str], start: str, end: str
+) -> List[Tuple[WorkingHours, List[Tuple[str, str]]]]:
+    """
+    Working hours and busy intervals in ``[start, end)`` for the organizer
+    (always first) and each of their contacts. Everyone is busy for the
+    events indexed under their participant key (see ``participant_keys``):
+    their user id if their email belongs to a user, else their email. Users
+    also get their own profile. Missing profiles default to 09:00-17:00 UTC
+    on weekdays.
+    """
+    backend = get_backend()
+    contacts = await backend.get_contacts_by_ids(contact_ids, owner_id=organizer_id)
+    user_ids = await backend.get_user_ids_by_email([c.email for c in contacts])
+
+    # Participant key per attendee, in order, the organizer first
+    attendees = [organizer_id]
+    for contact in contacts:
+        key = user_ids.get(contact.email) or contact.email.lower()
+        if key not in attendees:
+            attendees.append(key)
+
+    profiles = {p.user_id: p for p in await backend.get_working_hours(attendees)}
+    busy: Dict[str, List[Tuple[str, str]]] = {key: [] for key in attendees}
+    for key, busy_start, busy_end in await backend.get_busy_intervals(
+        attendees, start, end
+    ):
+        busy[key].append((busy_start, busy_end))
+
+    return [
+        (profiles.get(key) or WorkingHours(user_id=key), busy[key])
+        for key in attendees
+    ]
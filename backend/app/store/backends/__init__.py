@@ -0,0 +1,13 @@
+from app.store.backends.base import EventConflictError, StoreBackend
+from app.store.backends.sqlite import SqliteBackend
+from app.store.backends.postgres import PostgresBackend
+from app.store.backends.sharded import ShardedBackend, shard_index
+
+__all__ = [
+    "EventConflictError",
+    "StoreBackend",
+    "SqliteBackend",
+    "PostgresBackend",
+    "ShardedBackend",
+    "shard_index",
+]
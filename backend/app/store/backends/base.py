@@ -0,0 +1,413 @@
+import asyncio
+import json
+import re
+from abc import ABC, abstractmethod
+from contextlib import AsyncExitStack, asynccontextmanager, nullcontext
+from contextvars import ContextVar
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Callable,
+    List,
+    Mapping,
+    Sequence,
+)
+
+from app.types import ContactRecord, EventRecord, ThreadSummary, WorkingHours
+
+# Bump whenever init_schema changes. Databases already at this version skip
+# schema setup entirely on startup.
+SCHEMA_VERSION = 4
+
+# A location inside a stored JSON document, e.g. ("widget", "children", 0)
+JsonPath = tuple[str | int, ...]
+
+# Explicit column lists in record field order, so rows map onto the records
+# positionally regardless of how the table was created.
+CONTACT_COLUMNS = ", ".join(ContactRecord.__slots__)
+EVENT_COLUMNS = ", ".join(EventRecord.__slots__)
+WORKING_HOURS_COLUMNS = ", ".join(WorkingHours.__slots__)
+THREAD_SUMMARY_COLUMNS = ", ".join(ThreadSummary.__slots__)
+
+# Item types whose text is indexed for thread search
+SEARCHABLE_ITEM_TYPES = ("user_message", "assistant_message")
+
+
+class EventConflictError(Exception):
+    """Raised when a new event overlaps existing events of its participants."""
+
+    def __init__(self, conflicts: List[EventRecord]):
+        self.conflicts = conflicts
+        subjects = ", ".join(e.subject for e in conflicts)
+        super().__init__(f"Event overlaps existing events: {subjects}")
+
+
+def participant_keys(event: EventRecord, user_ids: Mapping[str, str]) -> List[str]:
+    """
+    Keys an event is indexed under for overlap checks: the organizer's user
+    id plus, per attendee, the user id their email belongs to (``user_ids``,
+    as from ``get_user_ids_by_email``), else the lowercased email. Attendees
+    recorded without an email fall back to their lowercased name.
+    """
+    keys = [event.organizer_id]
+    for name, email in event.attendee_list():
+        key = user_ids.get(email) if email else None
+        key = key or (email or name).lower()
+        if key not in keys:
+            keys.append(key)
+    return keys
+
+
+def participant_rows(event: EventRecord, keys: Sequence[str]) -> List[tuple]:
+    """``event_participants`` rows for an event indexed under ``keys``."""
+    return [
+        (event.id, event.organizer_id, key, event.start_time, event.end_time)
+        for key in keys
+    ]
+
+
+def search_terms(query: str) -> List[str]:
+    """Lowercased words of a search box query; punctuation is dropped."""
+    return re.findall(r"\w+", query.lower())
+
+
+def thread_activity(item_rows: Sequence[tuple]) -> List[tuple]:
+    """
+    ``(item_count, updated_at, thread_id)`` per thread for bulk-loaded item
+    rows ``(id, thread_id, user_id, created_at, data)``.
+    """
+    activity: dict[str, list] = {}
+    for _, thread_id, _, created_at, _ in item_rows:
+        counts = activity.setdefault(thread_id, [0, created_at])
+        counts[0] += 1
+        counts[1] = max(counts[1], created_at)
+    return [(count, updated_at, thread_id) for thread_id, (count, updated_at) in activity.items()]
+
+
+class PinnedConnection:
+    """
+    The connection a unit of work serves every store call from.
+
+    Opened on first use, so requests that never touch the database don't
+    take one. Tasks started inside the unit of work (the agent run, fan-out
+    gathers) share it: they take turns, one store call or transaction at a
+    time, and the task currently holding it may re-enter, which is how store
+    calls inside a ``transaction`` block run on the transaction's connection.
+
+    Tasks started while the connection is held, i.e. from inside a
+    ``transaction`` block, must not use the store: their parent would wait
+    for them while holding the connection they wait for. They get a
+    RuntimeError instead of a deadlock; run such calls one after another.
+    """
+
+    def __init__(self, connect: Callable[[], AsyncContextManager[Any]]):
+        self._connect = connect
+        self._stack = AsyncExitStack()
+        self._lock = asyncio.Lock()
+        self._owner: asyncio.Task | None = None
+        self._conn = None
+        self._closed = False
+        # Set in the holder's context; tasks it starts meanwhile inherit it
+        self._holder: ContextVar[asyncio.Task | None] = ContextVar(
+            f"pinned_connection_holder_{id(self)}", default=None
+        )
+
+    @asynccontextmanager
+    async def use(self):
+        task = asyncio.current_task()
+        if self._owner is task:
+            yield self._conn
+            return
+        if self._owner is not None and self._holder.get() is self._owner:
+            raise RuntimeError(
+                "Store call from a task started while its parent holds the unit "
+                "of work's connection (e.g. asyncio.gather inside a transaction); "
+                "it would wait for that connection forever"
+            )
+        async with self._lock:
+            if self._closed:
+                # A task that outlived the unit of work
+                async with self._connect() as conn:
+                    yield conn
+                return
+            if self._conn is None:
+                self._conn = await self._stack.enter_async_context(self._connect())
+            self._owner = task
+            token = self._holder.set(task)
+            try:
+                yield self._conn
+            finally:
+                self._holder.reset(token)
+                self._owner = None
+
+    async def close(self) -> None:
+        # Let a call in flight on another task finish first
+        async with self._lock:
+            self._closed = True
+            await self._stack.aclose()
+
+
+class StoreBackend(ABC):
+    """
+    Persistence interface shared by the chat store and the app store helpers.
+
+    Thread and item payloads are passed in as JSON strings (``model_dump_json``)
+    and returned as decoded dicts, so each backend is free to store them in
+    whatever column type suits it (TEXT for SQLite, JSONB for PostgreSQL).
+    """
+
+    # --- Lifecycle ---
+    @abstractmethod
+    async def init_schema(self) -> None:
+        """Create tables and indexes if they don't exist."""
+
+    async def close(self) -> None:
+        """Release any pooled connections."""
+
+    def unit_of_work(self, user_id: str) -> AsyncContextManager[None]:
+        """
+        Serves every call made inside the block, including from tasks it
+        starts, from one connection (see ``PinnedConnection``). ``user_id``
+        picks the shard on sharded backends. Re-entering is a no-op. Backends
+        without connections of their own inherit this no-op.
+        """
+        return nullcontext()
+
+    def transaction(self, user_id: str) -> AsyncContextManager[None]:
+        """
+        Groups the writes made inside the block into one transaction that is
+        rolled back if the block raises. Opens a unit of work if none is
+        active; nested blocks become savepoints. The block holds the
+        connection throughout, so store calls inside it must not run
+        concurrently.
+        """
+        return nullcontext()
+
+    # --- Users & Contacts ---
+    @abstractmethod
+    async def count_users(self) -> int: ...
+
+    async def has_users(self) -> bool:
+        return await self.count_users() > 0
+
+    @abstractmethod
+    async def insert_users(self, rows: Sequence[tuple]) -> None:
+        """Rows are ``(id, name, email)``."""
+
+    @abstractmethod
+    async def insert_contacts(self, rows: Sequence[tuple]) -> None:
+        """Rows are ``(id, owner_id, name, email, role, avatar_url)``."""
+
+    @abstractmethod
+    async def get_user_ids_by_email(self, emails: Sequence[str]) -> dict[str, str]:
+        """Maps each email that belongs to a user to that user's id."""
+
+    @abstractmethod
+    async def upsert_working_hours(self, profiles: Sequence[WorkingHours]) -> None: ...
+
+    @abstractmethod
+    async def get_working_hours(self, user_ids: Sequence[str]) -> List[WorkingHours]:
+        """Profiles of the given users; users without one are left out."""
+
+    @abstractmethod
+    async def search_contacts(
+        self, owner_id: str, query: str, limit: int | None = None, offset: int = 0
+    ) -> List[ContactRecord]:
+        """Ordered by name so ``limit``/``offset`` pages are stable."""
+
+    @abstractmethod
+    async def get_contacts_by_ids(
+        self, ids: List[str], owner_id: str | None = None
+    ) -> List[ContactRecord]:
+        """``owner_id`` narrows the lookup to one user's address book."""
+
+    # --- Events ---
+    async def resolve_participants(
+        self, events: Sequence[EventRecord]
+    ) -> List[List[str]]:
+        """``participant_keys`` of each event, with one email lookup for all."""
+        emails = {email for event in events for _, email in event.attendee_list() if email}
+        user_ids = await self.get_user_ids_by_email(sorted(emails)) if emails else {}
+        return [participant_keys(event, user_ids) for event in events]
+
+    @abstractmethod
+    async def insert_event(
+        self, event: EventRecord, participants: Sequence[str] | None = None
+    ) -> None:
+        """
+        ``participants`` are the keys to index the event under; resolved with
+        ``resolve_participants`` when None. The same goes for the methods
+        below.
+        """
+
+    @abstractmethod
+    async def create_event(
+        self, event: EventRecord, participants: Sequence[str] | None = None
+    ) -> str:
+        """
+        Inserts ``event`` in one transaction after checking for overlaps.
+
+        If the organizer already has an event with the same idempotency key,
+        that event's id is returned and nothing is written. Raises
+        ``EventConflictError`` if any participant is busy in
+        ``[start_time, end_time)`` (or at the same instant, for events
+        without a duration).
+        """
+
+    @abstractmethod
+    async def get_conflicts(
+        self, event: EventRecord, participants: Sequence[str]
+    ) -> List[EventRecord]:
+        """
+        Events of ``participants`` overlapping ``event``, as ``create_event``
+        checks them. Inside a ``transaction`` it also holds off concurrent
+        creates for the same participants until the transaction ends.
+        """
+
+    @abstractmethod
+    async def insert_events(
+        self,
+        events: Sequence[EventRecord],
+        participants: Sequence[Sequence[str]] | None = None,
+    ) -> int:
+        """
+        Bulk insert for imports: one transaction, no overlap checks. Events
+        whose id or idempotency key already exists are skipped. Returns the
+        number of events inserted.
+        """
+
+    @abstractmethod
+    async def get_events_by_organizer(
+        self, organizer_id: str
+    ) -> List[EventRecord]: ...
+
+    @abstractmethod
+    def iter_events_by_organizer(
+        self, organizer_id: str, window_size: int, since: str = ""
+    ) -> AsyncIterator[List[EventRecord]]:
+        """
+        Same rows as ``get_events_by_organizer``, yielded in windows, from
+        the first starting at or after ``since``. Each window is a query of
+        its own, so no connection is held between them.
+        """
+
+    @abstractmethod
+    async def count_events_by_organizer(self, organizer_id: str, since: str = "") -> int:
+        """How many events ``iter_events_by_organizer`` would yield."""
+
+    @abstractmethod
+    async def get_busy_intervals(
+        self, participants: Sequence[str], start: str, end: str
+    ) -> List[tuple]:
+        """
+        ``(participant, start_time, end_time)`` for every event of the given
+        participant keys (see ``participant_keys``) overlapping ``[start, end)``.
+        """
+
+    # --- Threads ---
+    @abstractmethod
+    async def load_thread(self, thread_id: str, user_id: str) -> dict | None: ...
+
+    @abstractmethod
+    async def save_thread(
+        self,
+        thread_id: str,
+        user_id: str,
+        created_at: str,
+        data: str,
+        title: str | None = None,
+    ) -> None: ...
+
+    @abstractmethod
+    async def insert_threads(self, rows: Sequence[tuple]) -> None:
+        """
+        Bulk load. Rows are ``(id, user_id, created_at, data)``; the title is
+        read out of ``data``.
+        """
+
+    @abstractmethod
+    async def list_threads(
+        self,
+        user_id: str,
+        limit: int,
+        after: str | None = None,
+        order: str = "desc",
+    ) -> List[ThreadSummary]:
+        """
+        Most recently active first (``order="desc"``), from the denormalized
+        columns only. ``after`` is the id of the last thread of the previous
+        page.
+        """
+
+    @abstractmethod
+    async def search_threads(
+        self, user_id: str, query: str, limit: int
+    ) -> List[ThreadSummary]:
+        """
+        Threads whose title or message text contains every word of
+        ``query`` (as a prefix), most recently active first.
+        """
+
+    @abstractmethod
+    async def delete_thread(self, thread_id: str, user_id: str) -> None: ...
+
+    # --- Items ---
+    @abstractmethod
+    async def load_thread_items(
+        self, thread_id: str, user_id: str, limit: int
+    ) -> List[dict]:
+        """Newest first."""
+
+    @abstractmethod
+    async def add_thread_item(
+        self, item_id: str, thread_id: str, user_id: str, created_at: str, data: str
+    ) -> None:
+        """Also bumps the thread's ``item_count`` and ``updated_at``."""
+
+    @abstractmethod
+    async def insert_items(self, rows: Sequence[tuple]) -> None:
+        """
+        Bulk load. Rows are ``(id, thread_id, user_id, created_at, data)``.
+        Thread counts are updated as by ``add_thread_item``.
+        """
+
+    @abstractmethod
+    async def save_item(
+        self, item_id: str, thread_id: str, user_id: str, created_at: str, data: str
+    ) -> None: ...
+
+    @abstractmethod
+    async def load_item(
+        self, thread_id: str, item_id: str, user_id: str
+    ) -> dict | None: ...
+
+    async def patch_item(
+        self,
+        thread_id: str,
+        item_id: str,
+        user_id: str,
+        patches: Sequence[tuple[JsonPath, str]],
+    ) -> None:
+        """
+        Replaces the values at the given paths (JSON text) inside a stored
+        item without rewriting the rest of it. Backends that can edit JSON
+        in place override this; the fallback round-trips the whole item.
+        """
+        async with self.transaction(user_id):
+            data = await self.load_item(thread_id, item_id, user_id)
+            if data is None:
+                return
+            for path, value in patches:
+                target = data
+                for step in path[:-1]:
+                    target = target[step]
+                target[path[-1]] = json.loads(value)
+            await self.save_item(
+                item_id, thread_id, user_id, data["created_at"], json.dumps(data)
+            )
+
+    @abstractmethod
+    async def delete_thread_item(
+        self, thread_id: str, item_id: str, user_id: str
+    ) -> None: ...
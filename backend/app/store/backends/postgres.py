@@ -0,0 +1,682 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, List, Sequence
+
+from app.store.backends.base import (
+    CONTACT_COLUMNS,
+    EVENT_COLUMNS,
+    EventConflictError,
+    SCHEMA_VERSION,
+    JsonPath,
+    PinnedConnection,
+    SEARCHABLE_ITEM_TYPES,
+    StoreBackend,
+    THREAD_SUMMARY_COLUMNS,
+    WORKING_HOURS_COLUMNS,
+    participant_rows,
+    search_terms,
+    thread_activity,
+)
+from app.types import ContactRecord, EventRecord, ThreadSummary, WorkingHours
+
+# Statements are kept as module constants so their text is stable: asyncpg
+# prepares each distinct query once per pooled connection and reuses it from
+# its statement cache on every later call.
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        email TEXT NOT NULL
+    )
+    """,
+    # No FK to users on contacts/events: the SQLite schema declares one but
+    # never enforces it (foreign_keys pragma is off), and events are created
+    # for any X-User-ID, including "anonymous".
+    """
+    CREATE TABLE IF NOT EXISTS contacts (
+        id TEXT PRIMARY KEY,
+        owner_id TEXT NOT NULL,
+        name TEXT NOT NULL,
+        email TEXT NOT NULL,
+        role TEXT NOT NULL,
+        avatar_url TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS contacts_owner_idx ON contacts (owner_id)",
+    """
+    CREATE TABLE IF NOT EXISTS events (
+        id TEXT PRIMARY KEY,
+        organizer_id TEXT NOT NULL,
+        subject TEXT NOT NULL,
+        start_time TEXT NOT NULL,
+        end_time TEXT NOT NULL,
+        attendees TEXT NOT NULL,
+        location TEXT,
+        agenda TEXT,
+        status TEXT DEFAULT 'confirmed'
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS events_organizer_idx ON events (organizer_id, start_time)",
+    # Databases created before idempotency keys existed
+    "ALTER TABLE events ADD COLUMN IF NOT EXISTS idempotency_key TEXT",
+    """
+    CREATE UNIQUE INDEX IF NOT EXISTS events_idempotency_idx
+    ON events (organizer_id, idempotency_key)
+    """,
+    # One row per (event, participant) so overlap checks are index range scans
+    """
+    CREATE TABLE IF NOT EXISTS event_participants (
+        event_id TEXT NOT NULL,
+        organizer_id TEXT NOT NULL,
+        participant TEXT NOT NULL,
+        start_time TEXT NOT NULL,
+        end_time TEXT NOT NULL,
+        PRIMARY KEY (event_id, participant)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS event_participants_time_idx
+    ON event_participants (participant, start_time, end_time)
+    """,
+    # Attendee names of old events aren't backfilled, only organizers
+    """
+    INSERT INTO event_participants
+    SELECT id, organizer_id, organizer_id, start_time, end_time FROM events
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS threads (
+        id TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        data JSONB NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS threads_user_idx ON threads (user_id, created_at DESC)",
+    """
+    CREATE TABLE IF NOT EXISTS items (
+        id TEXT PRIMARY KEY,
+        thread_id TEXT NOT NULL REFERENCES threads(id) ON DELETE CASCADE,
+        user_id TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        data JSONB NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS items_thread_idx ON items (thread_id, created_at DESC)",
+    # Listing columns, copies kept current by save_thread and the item
+    # writes so the history sidebar never decodes ``data``
+    "ALTER TABLE threads ADD COLUMN IF NOT EXISTS title TEXT",
+    "ALTER TABLE threads ADD COLUMN IF NOT EXISTS updated_at TEXT",
+    "ALTER TABLE threads ADD COLUMN IF NOT EXISTS item_count INTEGER NOT NULL DEFAULT 0",
+    """
+    UPDATE threads SET
+        title = data ->> 'title',
+        updated_at = coalesce(
+            (SELECT max(created_at) FROM items WHERE thread_id = threads.id), created_at
+        ),
+        item_count = (SELECT count(*) FROM items WHERE thread_id = threads.id)
+    WHERE updated_at IS NULL
+    """,
+    "CREATE INDEX IF NOT EXISTS threads_user_updated_idx ON threads (user_id, updated_at, id)",
+    # Thread search: generated tsvectors over titles and message text
+    """
+    ALTER TABLE threads ADD COLUMN IF NOT EXISTS title_search tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple', coalesce(title, ''))) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS threads_title_search_idx ON threads USING gin (title_search)",
+    f"""
+    ALTER TABLE items ADD COLUMN IF NOT EXISTS search tsvector
+    GENERATED ALWAYS AS (
+        CASE WHEN data ->> 'type' IN ({", ".join(f"'{t}'" for t in SEARCHABLE_ITEM_TYPES)})
+        THEN to_tsvector('simple', jsonb_path_query_array(data, '$.content[*].text'))
+        END
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS items_search_idx ON items USING gin (search)",
+    "CREATE INDEX IF NOT EXISTS users_email_idx ON users (email)",
+    """
+    CREATE TABLE IF NOT EXISTS working_hours (
+        user_id TEXT PRIMARY KEY,
+        timezone TEXT NOT NULL DEFAULT 'UTC',
+        day_start INTEGER NOT NULL DEFAULT 540,
+        day_end INTEGER NOT NULL DEFAULT 1020,
+        weekdays TEXT NOT NULL DEFAULT '01234'
+    )
+    """,
+    "CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)",
+]
+SCHEMA_VERSION_EXISTS = "SELECT to_regclass('schema_version') IS NOT NULL"
+CURRENT_SCHEMA_VERSION = "SELECT coalesce(max(version), 0) FROM schema_version"
+SET_SCHEMA_VERSION = """
+    WITH cleared AS (DELETE FROM schema_version)
+    INSERT INTO schema_version VALUES ($1)
+"""
+
+SEARCH_CONTACTS = f"""
+    SELECT {CONTACT_COLUMNS} FROM contacts
+    WHERE owner_id = $1 AND (name ILIKE $2 OR email ILIKE $2)
+    ORDER BY name, id
+    LIMIT $3 OFFSET $4
+"""
+CONTACTS_BY_IDS = f"SELECT {CONTACT_COLUMNS} FROM contacts WHERE id = ANY($1::text[])"
+CONTACTS_BY_IDS_FOR_OWNER = (
+    f"SELECT {CONTACT_COLUMNS} FROM contacts WHERE id = ANY($1::text[]) AND owner_id = $2"
+)
+INSERT_EVENT = f"INSERT INTO events ({EVENT_COLUMNS}) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)"
+# Bulk imports skip rows whose id or idempotency key already exists
+IMPORT_EVENT = INSERT_EVENT + " ON CONFLICT DO NOTHING"
+COUNT_EVENTS_BY_IDS = "SELECT count(*) FROM events WHERE id = ANY($1::text[])"
+COUNT_EVENTS_BY_ORGANIZER = (
+    "SELECT count(*) FROM events WHERE organizer_id = $1 AND start_time >= $2"
+)
+INSERT_PARTICIPANT = (
+    "INSERT INTO event_participants VALUES ($1, $2, $3, $4, $5) ON CONFLICT DO NOTHING"
+)
+IMPORT_PARTICIPANT = """
+    INSERT INTO event_participants
+    SELECT $1, $2, $3, $4, $5 WHERE EXISTS (SELECT 1 FROM events WHERE id = $1)
+    ON CONFLICT DO NOTHING
+"""
+EVENT_BY_IDEMPOTENCY_KEY = (
+    "SELECT id FROM events WHERE organizer_id = $1 AND idempotency_key = $2"
+)
+EVENT_CONFLICTS = f"""
+    SELECT {EVENT_COLUMNS} FROM events WHERE id IN (
+        SELECT event_id FROM event_participants
+        WHERE participant = ANY($1::text[])
+        AND ((start_time < $2 AND end_time > $3) OR start_time = $3)
+    )
+    ORDER BY start_time ASC
+"""
+USER_IDS_BY_EMAIL = "SELECT email, id FROM users WHERE email = ANY($1::text[])"
+UPSERT_WORKING_HOURS = f"""
+    INSERT INTO working_hours ({WORKING_HOURS_COLUMNS}) VALUES ($1, $2, $3, $4, $5)
+    ON CONFLICT (user_id) DO UPDATE SET
+        timezone = excluded.timezone,
+        day_start = excluded.day_start,
+        day_end = excluded.day_end,
+        weekdays = excluded.weekdays
+"""
+WORKING_HOURS_BY_USERS = (
+    f"SELECT {WORKING_HOURS_COLUMNS} FROM working_hours WHERE user_id = ANY($1::text[])"
+)
+BUSY_INTERVALS = """
+    SELECT participant, start_time, end_time FROM event_participants
+    WHERE participant = ANY($1::text[]) AND start_time < $2 AND end_time > $3
+"""
+EVENTS_BY_ORGANIZER = (
+    f"SELECT {EVENT_COLUMNS} FROM events WHERE organizer_id = $1 ORDER BY start_time, id"
+)
+# One window after ($2, $3), the (start_time, id) of the previous one's last row
+EVENTS_BY_ORGANIZER_AFTER = f"""
+    SELECT {EVENT_COLUMNS} FROM events
+    WHERE organizer_id = $1 AND (start_time, id) > ($2, $3)
+    ORDER BY start_time, id LIMIT $4
+"""
+LOAD_THREAD = "SELECT data FROM threads WHERE id = $1 AND user_id = $2"
+SAVE_THREAD = """
+    INSERT INTO threads (id, user_id, created_at, data, title, updated_at)
+    VALUES ($1, $2, $3, $4::jsonb, $5, $3)
+    ON CONFLICT (id) DO UPDATE SET data = excluded.data, title = excluded.title
+"""
+INSERT_THREAD = """
+    INSERT INTO threads (id, user_id, created_at, data, title, updated_at)
+    VALUES ($1, $2, $3, $4::jsonb, $4::jsonb ->> 'title', $3)
+"""
+# Keyed by order. $3 is the id of the last thread of the previous page.
+LIST_THREADS = {
+    order: f"""
+        SELECT {THREAD_SUMMARY_COLUMNS} FROM threads
+        WHERE user_id = $1 AND ($3::text IS NULL OR (updated_at, id) {compare} (
+            SELECT updated_at, id FROM threads WHERE id = $3 AND user_id = $1
+        ))
+        ORDER BY updated_at {direction}, id {direction}
+        LIMIT $2
+    """
+    for order, direction, compare in (("desc", "DESC", "<"), ("asc", "ASC", ">"))
+}
+SEARCH_THREADS = f"""
+    SELECT {THREAD_SUMMARY_COLUMNS} FROM threads
+    WHERE user_id = $1 AND (
+        title_search @@ to_tsquery('simple', $2)
+        OR id IN (
+            SELECT thread_id FROM items
+            WHERE user_id = $1 AND search @@ to_tsquery('simple', $2)
+        )
+    )
+    ORDER BY updated_at DESC, id DESC
+    LIMIT $3
+"""
+DELETE_THREAD = "DELETE FROM threads WHERE id = $1 AND user_id = $2"
+LOAD_THREAD_ITEMS = (
+    "SELECT data FROM items WHERE thread_id = $1 ORDER BY created_at DESC LIMIT $2"
+)
+ADD_THREAD_ITEM = """
+    INSERT INTO items (id, thread_id, user_id, created_at, data)
+    VALUES ($1, $2, $3, $4, $5::jsonb)
+"""
+# (count, created_at, thread_id): keeps the listing columns current
+BUMP_THREAD = """
+    UPDATE threads SET item_count = item_count + $1, updated_at = greatest(updated_at, $2)
+    WHERE id = $3
+"""
+INSERT_ITEM = """
+    INSERT INTO items (id, thread_id, user_id, created_at, data)
+    VALUES ($1, $2, $3, $4, $5::jsonb)
+"""
+SAVE_ITEM = """
+    INSERT INTO items (id, thread_id, user_id, created_at, data)
+    VALUES ($1, $2, $3, $4, $5::jsonb)
+    ON CONFLICT (id) DO UPDATE SET data = excluded.data
+    RETURNING xmax = 0 AS inserted
+"""
+LOAD_ITEM = "SELECT data FROM items WHERE id = $1 AND thread_id = $2"
+PATCH_ITEM = """
+    UPDATE items SET data = jsonb_set(data, $3::text[], $4::jsonb)
+    WHERE id = $1 AND thread_id = $2
+"""
+DELETE_ITEM = "DELETE FROM items WHERE id = $1 AND thread_id = $2 RETURNING thread_id"
+DROP_THREAD_ITEM = "UPDATE threads SET item_count = item_count - 1 WHERE id = $1"
+
+
+class PostgresBackend(StoreBackend):
+    """
+    asyncpg-backed store for multi-node deployments.
+
+    Threads and items are stored as JSONB. Connections come from a lazily
+    created pool shared by every request on this process; a unit of work
+    holds one of them until it ends, so ``max_size`` bounds concurrent
+    requests.
+    """
+
+    def __init__(self, dsn: str, min_size: int = 1, max_size: int = 10):
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self._pool = None
+        self._pool_lock = asyncio.Lock()
+        self._pinned: ContextVar[PinnedConnection | None] = ContextVar(
+            f"postgres_unit_of_work_{id(self)}", default=None
+        )
+
+    @staticmethod
+    async def _init_connection(conn) -> None:
+        # Encode: we already hold JSON text from model_dump_json().
+        # Decode: hand dicts back, same as the SQLite backend.
+        await conn.set_type_codec(
+            "jsonb", encoder=str, decoder=json.loads, schema="pg_catalog"
+        )
+
+    async def pool(self):
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    try:
+                        import asyncpg
+                    except ImportError as e:
+                        raise RuntimeError(
+                            "PostgreSQL backend requires asyncpg: pip install 'backend[postgres]'"
+                        ) from e
+                    self._pool = await asyncpg.create_pool(
+                        self.dsn,
+                        min_size=self.min_size,
+                        max_size=self.max_size,
+                        init=self._init_connection,
+                    )
+        return self._pool
+
+    @asynccontextmanager
+    async def connection(self):
+        pin = self._pinned.get()
+        if pin is None:
+            async with self._connect() as conn:
+                yield conn
+            return
+        async with pin.use() as conn:
+            yield conn
+
+    @asynccontextmanager
+    async def _connect(self):
+        pool = await self.pool()
+        async with pool.acquire() as conn:
+            yield conn
+
+    @asynccontextmanager
+    async def unit_of_work(self, user_id: str):
+        if self._pinned.get() is not None:
+            yield
+            return
+        pin = PinnedConnection(self._connect)
+        token = self._pinned.set(pin)
+        try:
+            yield
+        finally:
+            self._pinned.reset(token)
+            await pin.close()
+
+    @asynccontextmanager
+    async def transaction(self, user_id: str):
+        # asyncpg turns nested transaction() blocks into savepoints itself
+        async with self.unit_of_work(user_id), self.connection() as conn:
+            async with conn.transaction():
+                yield
+
+    # --- Lifecycle ---
+    async def init_schema(self) -> None:
+        pool = await self.pool()
+        async with pool.acquire() as conn:
+            # Warm databases skip the DDL below
+            if await self._schema_version(conn) >= SCHEMA_VERSION:
+                return
+            async with conn.transaction():
+                # Serialize workers racing on a cold database, then re-check
+                await conn.execute("SELECT pg_advisory_xact_lock(hashtext('schema_version'))")
+                if await self._schema_version(conn) >= SCHEMA_VERSION:
+                    return
+                for statement in SCHEMA:
+                    await conn.execute(statement)
+                await conn.execute(SET_SCHEMA_VERSION, SCHEMA_VERSION)
+
+    @staticmethod
+    async def _schema_version(conn) -> int:
+        if not await conn.fetchval(SCHEMA_VERSION_EXISTS):
+            return 0
+        return await conn.fetchval(CURRENT_SCHEMA_VERSION)
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    # --- Users & Contacts ---
+    async def count_users(self) -> int:
+        async with self.connection() as conn:
+            return await conn.fetchval("SELECT count(*) FROM users")
+
+    async def has_users(self) -> bool:
+        async with self.connection() as conn:
+            return await conn.fetchval("SELECT EXISTS (SELECT 1 FROM users)")
+
+    async def insert_users(self, rows: Sequence[tuple]) -> None:
+        async with self.connection() as conn:
+            await conn.executemany(
+                "INSERT INTO users (id, name, email) VALUES ($1, $2, $3)", rows
+            )
+
+    async def insert_contacts(self, rows: Sequence[tuple]) -> None:
+        async with self.connection() as conn:
+            await conn.executemany(
+                "INSERT INTO contacts (id, owner_id, name, email, role, avatar_url) VALUES ($1, $2, $3, $4, $5, $6)",
+                rows,
+            )
+
+    async def search_contacts(
+        self, owner_id: str, query: str, limit: int | None = None, offset: int = 0
+    ) -> List[ContactRecord]:
+        async with self.connection() as conn:
+            # LIMIT NULL means no limit in PostgreSQL
+            rows = await conn.fetch(SEARCH_CONTACTS, owner_id, f"%{query}%", limit, offset)
+            return [ContactRecord(*row) for row in rows]
+
+    async def get_contacts_by_ids(
+        self, ids: List[str], owner_id: str | None = None
+    ) -> List[ContactRecord]:
+        async with self.connection() as conn:
+            if owner_id is None:
+                rows = await conn.fetch(CONTACTS_BY_IDS, list(ids))
+            else:
+                rows = await conn.fetch(CONTACTS_BY_IDS_FOR_OWNER, list(ids), owner_id)
+            return [ContactRecord(*row) for row in rows]
+
+    async def get_user_ids_by_email(self, emails: Sequence[str]) -> dict[str, str]:
+        async with self.connection() as conn:
+            rows = await conn.fetch(USER_IDS_BY_EMAIL, list(emails))
+            return {email: user_id for email, user_id in rows}
+
+    async def upsert_working_hours(self, profiles: Sequence[WorkingHours]) -> None:
+        async with self.connection() as conn:
+            await conn.executemany(
+                UPSERT_WORKING_HOURS, [profile.as_row() for profile in profiles]
+            )
+
+    async def get_working_hours(self, user_ids: Sequence[str]) -> List[WorkingHours]:
+        async with self.connection() as conn:
+            rows = await conn.fetch(WORKING_HOURS_BY_USERS, list(user_ids))
+            return [WorkingHours(*row) for row in rows]
+
+    # --- Events ---
+    async def insert_event(
+        self, event: EventRecord, participants: Sequence[str] | None = None
+    ) -> None:
+        if participants is None:
+            (participants,) = await self.resolve_participants([event])
+        async with self.connection() as conn:
+            async with conn.transaction():
+                await conn.execute(INSERT_EVENT, *event.as_row())
+                await conn.executemany(
+                    INSERT_PARTICIPANT, participant_rows(event, participants)
+                )
+
+    async def create_event(
+        self, event: EventRecord, participants: Sequence[str] | None = None
+    ) -> str:
+        if participants is None:
+            (participants,) = await self.resolve_participants([event])
+        async with self.connection() as conn:
+            async with conn.transaction():
+                if event.idempotency_key:
+                    existing = await conn.fetchval(
+                        EVENT_BY_IDEMPOTENCY_KEY,
+                        event.organizer_id,
+                        event.idempotency_key,
+                    )
+                    if existing:
+                        return existing
+
+                conflicts = await self.get_conflicts(event, participants)
+                if conflicts:
+                    raise EventConflictError(conflicts)
+
+                await conn.execute(INSERT_EVENT, *event.as_row())
+                await conn.executemany(
+                    INSERT_PARTICIPANT, participant_rows(event, participants)
+                )
+        return event.id
+
+    async def get_conflicts(
+        self, event: EventRecord, participants: Sequence[str]
+    ) -> List[EventRecord]:
+        async with self.connection() as conn:
+            async with conn.transaction():
+                # Serialise creates that share a participant; sorted to avoid
+                # lock-order deadlocks between overlapping groups. The locks
+                # last until the outermost transaction ends.
+                for key in sorted(participants):
+                    await conn.execute("SELECT pg_advisory_xact_lock(hashtext($1))", key)
+                rows = await conn.fetch(
+                    EVENT_CONFLICTS, list(participants), event.end_time, event.start_time
+                )
+                return [EventRecord(*row) for row in rows]
+
+    async def insert_events(
+        self,
+        events: Sequence[EventRecord],
+        participants: Sequence[Sequence[str]] | None = None,
+    ) -> int:
+        if participants is None:
+            participants = await self.resolve_participants(events)
+        ids = [event.id for event in events]
+        async with self.connection() as conn:
+            async with conn.transaction():
+                # executemany reports no row counts; count the batch's ids
+                before = await conn.fetchval(COUNT_EVENTS_BY_IDS, ids)
+                await conn.executemany(
+                    IMPORT_EVENT, [event.as_row() for event in events]
+                )
+                inserted = await conn.fetchval(COUNT_EVENTS_BY_IDS, ids) - before
+                await conn.executemany(
+                    IMPORT_PARTICIPANT,
+                    [
+                        row
+                        for event, keys in zip(events, participants)
+                        for row in participant_rows(event, keys)
+                    ],
+                )
+        return inserted
+
+    async def get_events_by_organizer(
+        self, organizer_id: str
+    ) -> List[EventRecord]:
+        async with self.connection() as conn:
+            rows = await conn.fetch(EVENTS_BY_ORGANIZER, organizer_id)
+            return [EventRecord(*row) for row in rows]
+
+    async def iter_events_by_organizer(
+        self, organizer_id: str, window_size: int, since: str = ""
+    ) -> AsyncIterator[List[EventRecord]]:
+        # Keyset pages rather than a server-side cursor, which would hold
+        # the connection (and a transaction) open between windows
+        after = (since, "")
+        while True:
+            async with self.connection() as conn:
+                rows = await conn.fetch(
+                    EVENTS_BY_ORGANIZER_AFTER, organizer_id, *after, window_size
+                )
+            if not rows:
+                return
+            window = [EventRecord(*row) for row in rows]
+            after = (window[-1].start_time, window[-1].id)
+            yield window
+            if len(rows) < window_size:
+                return
+
+    async def count_events_by_organizer(self, organizer_id: str, since: str = "") -> int:
+        async with self.connection() as conn:
+            return await conn.fetchval(COUNT_EVENTS_BY_ORGANIZER, organizer_id, since)
+
+    async def get_busy_intervals(
+        self, participants: Sequence[str], start: str, end: str
+    ) -> List[tuple]:
+        async with self.connection() as conn:
+            rows = await conn.fetch(BUSY_INTERVALS, list(participants), end, start)
+            return [tuple(row) for row in rows]
+
+    # --- Threads ---
+    async def load_thread(self, thread_id: str, user_id: str) -> dict | None:
+        async with self.connection() as conn:
+            return await conn.fetchval(LOAD_THREAD, thread_id, user_id)
+
+    async def save_thread(
+        self,
+        thread_id: str,
+        user_id: str,
+        created_at: str,
+        data: str,
+        title: str | None = None,
+    ) -> None:
+        async with self.connection() as conn:
+            await conn.execute(SAVE_THREAD, thread_id, user_id, created_at, data, title)
+
+    async def insert_threads(self, rows: Sequence[tuple]) -> None:
+        async with self.connection() as conn:
+            await conn.executemany(INSERT_THREAD, rows)
+
+    async def list_threads(
+        self,
+        user_id: str,
+        limit: int,
+        after: str | None = None,
+        order: str = "desc",
+    ) -> List[ThreadSummary]:
+        sql = LIST_THREADS["asc" if order == "asc" else "desc"]
+        async with self.connection() as conn:
+            rows = await conn.fetch(sql, user_id, limit, after)
+            return [ThreadSummary(*row) for row in rows]
+
+    async def search_threads(
+        self, user_id: str, query: str, limit: int
+    ) -> List[ThreadSummary]:
+        terms = search_terms(query)
+        if not terms:
+            return []
+        # Every term as a prefix
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        async with self.connection() as conn:
+            rows = await conn.fetch(SEARCH_THREADS, user_id, tsquery, limit)
+            return [ThreadSummary(*row) for row in rows]
+
+    async def delete_thread(self, thread_id: str, user_id: str) -> None:
+        async with self.connection() as conn:
+            await conn.execute(DELETE_THREAD, thread_id, user_id)
+
+    # --- Items ---
+    async def load_thread_items(
+        self, thread_id: str, user_id: str, limit: int
+    ) -> List[dict]:
+        async with self.connection() as conn:
+            rows = await conn.fetch(LOAD_THREAD_ITEMS, thread_id, limit)
+            return [row["data"] for row in rows]
+
+    async def add_thread_item(
+        self, item_id: str, thread_id: str, user_id: str, created_at: str, data: str
+    ) -> None:
+        async with self.connection() as conn:
+            async with conn.transaction():
+                await conn.execute(
+                    ADD_THREAD_ITEM, item_id, thread_id, user_id, created_at, data
+                )
+                await conn.execute(BUMP_THREAD, 1, created_at, thread_id)
+
+    async def insert_items(self, rows: Sequence[tuple]) -> None:
+        async with self.connection() as conn:
+            async with conn.transaction():
+                await conn.executemany(INSERT_ITEM, rows)
+                await conn.executemany(BUMP_THREAD, thread_activity(rows))
+
+    async def save_item(
+        self, item_id: str, thread_id: str, user_id: str, created_at: str, data: str
+    ) -> None:
+        async with self.connection() as conn:
+            async with conn.transaction():
+                inserted = await conn.fetchval(
+                    SAVE_ITEM, item_id, thread_id, user_id, created_at, data
+                )
+                # Only a new item changes the thread's count
+                if inserted:
+                    await conn.execute(BUMP_THREAD, 1, created_at, thread_id)
+
+    async def patch_item(
+        self,
+        thread_id: str,
+        item_id: str,
+        user_id: str,
+        patches: Sequence[tuple[JsonPath, str]],
+    ) -> None:
+        if not patches:
+            return
+        async with self.connection() as conn:
+            # One prepared statement per path; executemany applies them atomically
+            await conn.executemany(
+                PATCH_ITEM,
+                [
+                    (item_id, thread_id, [str(step) for step in path], value)
+                    for path, value in patches
+                ],
+            )
+
+    async def load_item(
+        self, thread_id: str, item_id: str, user_id: str
+    ) -> dict | None:
+        async with self.connection() as conn:
+            return await conn.fetchval(LOAD_ITEM, item_id, thread_id)
+
+    async def delete_thread_item(
+        self, thread_id: str, item_id: str, user_id: str
+    ) -> None:
+        async with self.connection() as conn:
+            async with conn.transaction():
+                if await conn.fetchval(DELETE_ITEM, item_id, thread_id):
+                    await conn.execute(DROP_THREAD_ITEM, thread_id)
@@ -0,0 +1,320 @@
+import asyncio
+import hashlib
+from itertools import chain
+from typing import AsyncIterator, List, Sequence
+
+from app.store.backends.base import EventConflictError, JsonPath, StoreBackend
+from app.types import ContactRecord, EventRecord, ThreadSummary, WorkingHours
+
+
+def shard_index(user_id: str, shard_count: int) -> int:
+    """
+    Stable shard for a user. Uses blake2b rather than ``hash()`` so the mapping
+    survives restarts (``PYTHONHASHSEED``) and is the same on every worker.
+    """
+    digest = hashlib.blake2b(user_id.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shard_count
+
+
+class ShardedBackend(StoreBackend):
+    """
+    Routes every call to one of N backends by a hash of the owning user id.
+
+    All rows belonging to a user (their thread/items, contacts, organized
+    events and the ``users`` row itself) live on the same shard, so each
+    request touches exactly one database file. Calls without a user to route
+    on fan out to every shard.
+    """
+
+    def __init__(self, shards: Sequence[StoreBackend]):
+        if not shards:
+            raise ValueError("ShardedBackend needs at least one shard")
+        self.shards = list(shards)
+
+    def shard_for(self, user_id: str) -> StoreBackend:
+        return self.shards[shard_index(user_id, len(self.shards))]
+
+    def _group(self, rows: Sequence[tuple], key: int) -> dict[int, list[tuple]]:
+        groups: dict[int, list[tuple]] = {}
+        for row in rows:
+            groups.setdefault(shard_index(row[key], len(self.shards)), []).append(row)
+        return groups
+
+    # --- Lifecycle ---
+    async def init_schema(self) -> None:
+        await asyncio.gather(*(shard.init_schema() for shard in self.shards))
+
+    async def close(self) -> None:
+        await asyncio.gather(*(shard.close() for shard in self.shards))
+
+    def unit_of_work(self, user_id: str):
+        # Everything a request writes lives on its user's shard
+        return self.shard_for(user_id).unit_of_work(user_id)
+
+    def transaction(self, user_id: str):
+        return self.shard_for(user_id).transaction(user_id)
+
+    # --- Users & Contacts ---
+    async def count_users(self) -> int:
+        counts = await asyncio.gather(*(shard.count_users() for shard in self.shards))
+        return sum(counts)
+
+    async def has_users(self) -> bool:
+        return any(await asyncio.gather(*(shard.has_users() for shard in self.shards)))
+
+    async def insert_users(self, rows: Sequence[tuple]) -> None:
+        await asyncio.gather(
+            *(
+                self.shards[index].insert_users(group)
+                for index, group in self._group(rows, key=0).items()
+            )
+        )
+
+    async def insert_contacts(self, rows: Sequence[tuple]) -> None:
+        await asyncio.gather(
+            *(
+                self.shards[index].insert_contacts(group)
+                for index, group in self._group(rows, key=1).items()
+            )
+        )
+
+    async def search_contacts(
+        self, owner_id: str, query: str, limit: int | None = None, offset: int = 0
+    ) -> List[ContactRecord]:
+        return await self.shard_for(owner_id).search_contacts(
+            owner_id, query, limit, offset
+        )
+
+    async def get_contacts_by_ids(
+        self, ids: List[str], owner_id: str | None = None
+    ) -> List[ContactRecord]:
+        if owner_id is not None:
+            return await self.shard_for(owner_id).get_contacts_by_ids(ids, owner_id)
+        results = await asyncio.gather(
+            *(shard.get_contacts_by_ids(ids) for shard in self.shards)
+        )
+        return list(chain.from_iterable(results))
+
+    async def get_user_ids_by_email(self, emails: Sequence[str]) -> dict[str, str]:
+        # Users are sharded by id, not email, so ask every shard. One after
+        # another: create_event resolves attendees inside a transaction, and
+        # the organizer's shard can't serve tasks other than its owner then
+        user_ids: dict[str, str] = {}
+        for shard in self.shards:
+            user_ids.update(await shard.get_user_ids_by_email(emails))
+        return user_ids
+
+    async def upsert_working_hours(self, profiles: Sequence[WorkingHours]) -> None:
+        groups: dict[int, list[WorkingHours]] = {}
+        for profile in profiles:
+            index = shard_index(profile.user_id, len(self.shards))
+            groups.setdefault(index, []).append(profile)
+        await asyncio.gather(
+            *(
+                self.shards[index].upsert_working_hours(group)
+                for index, group in groups.items()
+            )
+        )
+
+    async def get_working_hours(self, user_ids: Sequence[str]) -> List[WorkingHours]:
+        groups: dict[int, list[str]] = {}
+        for user_id in user_ids:
+            groups.setdefault(shard_index(user_id, len(self.shards)), []).append(user_id)
+        results = await asyncio.gather(
+            *(
+                self.shards[index].get_working_hours(group)
+                for index, group in groups.items()
+            )
+        )
+        return list(chain.from_iterable(results))
+
+    # --- Events ---
+    async def insert_event(
+        self, event: EventRecord, participants: Sequence[str] | None = None
+    ) -> None:
+        if participants is None:
+            # Attendees' emails may belong to users on any shard
+            (participants,) = await self.resolve_participants([event])
+        await self.shard_for(event.organizer_id).insert_event(event, participants)
+
+    async def create_event(
+        self, event: EventRecord, participants: Sequence[str] | None = None
+    ) -> str:
+        if participants is None:
+            (participants,) = await self.resolve_participants([event])
+        home = self.shard_for(event.organizer_id)
+        # A participant's meetings live with whoever organized them, so any
+        # shard may hold a conflict. The other shards are checked while the
+        # organizer's shard is write-locked, but not locked themselves: that
+        # would deadlock against a caller's open transaction on its own
+        # shard. Two organizers on different shards booking the same invitee
+        # at the same moment can therefore both succeed.
+        async with home.transaction(event.organizer_id):
+            event_id = await home.create_event(event, participants)
+            if event_id != event.id:
+                # A retried submit; the booked event was checked back then
+                return event_id
+            # No unit of work is open on the other shards, so they can be
+            # queried concurrently
+            results = await asyncio.gather(
+                *(
+                    shard.get_conflicts(event, participants)
+                    for shard in self.shards
+                    if shard is not home
+                )
+            )
+            conflicts = sorted(chain.from_iterable(results), key=lambda e: e.start_time)
+            if conflicts:
+                # Rolls back the insert on the organizer's shard
+                raise EventConflictError(conflicts)
+        return event.id
+
+    async def get_conflicts(
+        self, event: EventRecord, participants: Sequence[str]
+    ) -> List[EventRecord]:
+        # One shard after another: a shard with an open unit of work can't
+        # serve tasks other than its owner
+        conflicts = []
+        for shard in self.shards:
+            conflicts.extend(await shard.get_conflicts(event, participants))
+        return sorted(conflicts, key=lambda e: e.start_time)
+
+    async def insert_events(
+        self,
+        events: Sequence[EventRecord],
+        participants: Sequence[Sequence[str]] | None = None,
+    ) -> int:
+        if participants is None:
+            participants = await self.resolve_participants(events)
+        groups: dict[int, tuple[list, list]] = {}
+        for event, keys in zip(events, participants):
+            index = shard_index(event.organizer_id, len(self.shards))
+            group = groups.setdefault(index, ([], []))
+            group[0].append(event)
+            group[1].append(keys)
+        counts = await asyncio.gather(
+            *(
+                self.shards[index].insert_events(group, keys)
+                for index, (group, keys) in groups.items()
+            )
+        )
+        return sum(counts)
+
+    async def get_events_by_organizer(
+        self, organizer_id: str
+    ) -> List[EventRecord]:
+        return await self.shard_for(organizer_id).get_events_by_organizer(
+            organizer_id
+        )
+
+    async def iter_events_by_organizer(
+        self, organizer_id: str, window_size: int, since: str = ""
+    ) -> AsyncIterator[List[EventRecord]]:
+        shard = self.shard_for(organizer_id)
+        async for window in shard.iter_events_by_organizer(organizer_id, window_size, since):
+            yield window
+
+    async def count_events_by_organizer(self, organizer_id: str, since: str = "") -> int:
+        return await self.shard_for(organizer_id).count_events_by_organizer(organizer_id, since)
+
+    async def get_busy_intervals(
+        self, participants: Sequence[str], start: str, end: str
+    ) -> List[tuple]:
+        # Invitations are stored with the organizer, which may be any shard
+        results = await asyncio.gather(
+            *(
+                shard.get_busy_intervals(participants, start, end)
+                for shard in self.shards
+            )
+        )
+        return list(chain.from_iterable(results))
+
+    # --- Threads ---
+    async def load_thread(self, thread_id: str, user_id: str) -> dict | None:
+        return await self.shard_for(user_id).load_thread(thread_id, user_id)
+
+    async def save_thread(
+        self,
+        thread_id: str,
+        user_id: str,
+        created_at: str,
+        data: str,
+        title: str | None = None,
+    ) -> None:
+        await self.shard_for(user_id).save_thread(
+            thread_id, user_id, created_at, data, title
+        )
+
+    async def insert_threads(self, rows: Sequence[tuple]) -> None:
+        await asyncio.gather(
+            *(
+                self.shards[index].insert_threads(group)
+                for index, group in self._group(rows, key=1).items()
+            )
+        )
+
+    async def list_threads(
+        self,
+        user_id: str,
+        limit: int,
+        after: str | None = None,
+        order: str = "desc",
+    ) -> List[ThreadSummary]:
+        return await self.shard_for(user_id).list_threads(user_id, limit, after, order)
+
+    async def search_threads(
+        self, user_id: str, query: str, limit: int
+    ) -> List[ThreadSummary]:
+        return await self.shard_for(user_id).search_threads(user_id, query, limit)
+
+    async def delete_thread(self, thread_id: str, user_id: str) -> None:
+        await self.shard_for(user_id).delete_thread(thread_id, user_id)
+
+    # --- Items ---
+    async def load_thread_items(
+        self, thread_id: str, user_id: str, limit: int
+    ) -> List[dict]:
+        return await self.shard_for(user_id).load_thread_items(
+            thread_id, user_id, limit
+        )
+
+    async def add_thread_item(
+        self, item_id: str, thread_id: str, user_id: str, created_at: str, data: str
+    ) -> None:
+        await self.shard_for(user_id).add_thread_item(
+            item_id, thread_id, user_id, created_at, data
+        )
+
+    async def insert_items(self, rows: Sequence[tuple]) -> None:
+        await asyncio.gather(
+            *(
+                self.shards[index].insert_items(group)
+                for index, group in self._group(rows, key=2).items()
+            )
+        )
+
+    async def save_item(
+        self, item_id: str, thread_id: str, user_id: str, created_at: str, data: str
+    ) -> None:
+        await self.shard_for(user_id).save_item(
+            item_id, thread_id, user_id, created_at, data
+        )
+
+    async def patch_item(
+        self,
+        thread_id: str,
+        item_id: str,
+        user_id: str,
+        patches: Sequence[tuple[JsonPath, str]],
+    ) -> None:
+        await self.shard_for(user_id).patch_item(thread_id, item_id, user_id, patches)
+
+    async def load_item(
+        self, thread_id: str, item_id: str, user_id: str
+    ) -> dict | None:
+        return await self.shard_for(user_id).load_item(thread_id, item_id, user_id)
+
+    async def delete_thread_item(
+        self, thread_id: str, item_id: str, user_id: str
+    ) -> None:
+        await self.shard_for(user_id).delete_thread_item(thread_id, item_id, user_id)
@@ -0,0 +1,811 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import AsyncIterator, List, Sequence
+
+import aiosqlite
+
+from app.database import DB_PATH, get_db_connection
+from app.store.backends.base import (
+    CONTACT_COLUMNS,
+    EVENT_COLUMNS,
+    EventConflictError,
+    SCHEMA_VERSION,
+    JsonPath,
+    PinnedConnection,
+    SEARCHABLE_ITEM_TYPES,
+    StoreBackend,
+    THREAD_SUMMARY_COLUMNS,
+    WORKING_HOURS_COLUMNS,
+    participant_rows,
+    search_terms,
+    thread_activity,
+)
+from app.types import ContactRecord, EventRecord, ThreadSummary, WorkingHours
+
+
+_EVENT_VALUES = f"({EVENT_COLUMNS}) VALUES ({', '.join(['?'] * len(EventRecord.__slots__))})"
+INSERT_EVENT = f"INSERT INTO events {_EVENT_VALUES}"
+# Bulk imports skip rows whose id or idempotency key already exists
+IMPORT_EVENT = f"INSERT OR IGNORE INTO events {_EVENT_VALUES}"
+INSERT_PARTICIPANT = "INSERT OR IGNORE INTO event_participants VALUES (?, ?, ?, ?, ?)"
+INSERT_ITEM = "INSERT INTO items (id, thread_id, user_id, created_at, data) VALUES (?, ?, ?, ?, ?)"
+# (count, created_at, thread_id): keeps the listing columns current
+BUMP_THREAD = """
+    UPDATE threads SET item_count = item_count + ?, updated_at = max(coalesce(updated_at, ''), ?)
+    WHERE id = ?
+"""
+
+
+def json_path(path: JsonPath) -> str:
+    """``("widget", "children", 0)`` -> ``$.widget.children[0]``"""
+    return "$" + "".join(f"[{step}]" if isinstance(step, int) else f".{step}" for step in path)
+
+
+class SqliteBackend(StoreBackend):
+    """
+    Single-file SQLite backend (the original ``chatkit.db`` layout).
+
+    With ``pool_size=0`` every call opens and closes its own connection, as
+    before. A positive ``pool_size`` keeps up to that many WAL-mode
+    connections open and hands them out per call. Inside a unit of work,
+    calls share the unit's connection instead.
+    """
+
+    def __init__(self, db_path: Path | str = DB_PATH, pool_size: int = 0):
+        self.db_path = db_path
+        self.pool_size = pool_size
+        self._idle: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._opened = 0
+        self._pinned: ContextVar[PinnedConnection | None] = ContextVar(
+            f"sqlite_unit_of_work_{id(self)}", default=None
+        )
+
+    async def _open(self) -> aiosqlite.Connection:
+        conn = await aiosqlite.connect(self.db_path)
+        conn.row_factory = aiosqlite.Row
+        # WAL lets readers proceed while another pooled connection writes
+        await conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    async def _acquire(self) -> aiosqlite.Connection:
+        if self._idle.empty() and self._opened < self.pool_size:
+            self._opened += 1
+            try:
+                return await self._open()
+            except BaseException:
+                self._opened -= 1
+                raise
+        return await self._idle.get()
+
+    @asynccontextmanager
+    async def connection(self):
+        pin = self._pinned.get()
+        if pin is None:
+            async with self._connect() as db:
+                yield db
+            return
+        async with pin.use() as db:
+            yield db
+
+    @asynccontextmanager
+    async def _connect(self):
+        if not self.pool_size:
+            async with get_db_connection(self.db_path) as db:
+                yield db
+            return
+
+        conn = await self._acquire()
+        try:
+            yield conn
+        except BaseException:
+            # Don't hand a half-finished transaction to the next caller
+            await conn.rollback()
+            raise
+        finally:
+            self._idle.put_nowait(conn)
+
+    @asynccontextmanager
+    async def _transaction(self):
+        """
+        BEGIN IMMEDIATE ... COMMIT around the block, or a savepoint if the
+        connection is already inside an enclosing ``transaction``.
+        """
+        async with self.connection() as db:
+            if db.in_transaction:
+                await db.execute("SAVEPOINT nested")
+                try:
+                    yield db
+                except BaseException:
+                    await db.execute("ROLLBACK TO nested")
+                    await db.execute("RELEASE nested")
+                    raise
+                await db.execute("RELEASE nested")
+                return
+
+            # Take the write lock up front, so a transaction that reads
+            # before writing can't fail to upgrade halfway through
+            await db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                await db.rollback()
+                raise
+            await db.commit()
+
+    @asynccontextmanager
+    async def unit_of_work(self, user_id: str):
+        if self._pinned.get() is not None:
+            yield
+            return
+        pin = PinnedConnection(self._connect)
+        token = self._pinned.set(pin)
+        try:
+            yield
+        finally:
+            self._pinned.reset(token)
+            await pin.close()
+
+    @asynccontextmanager
+    async def transaction(self, user_id: str):
+        async with self.unit_of_work(user_id), self._transaction():
+            yield
+
+    # --- Lifecycle ---
+    async def init_schema(self) -> None:
+        async with self.connection() as db:
+            # Warm databases: one pragma read instead of the DDL below
+            if await self._schema_version(db) >= SCHEMA_VERSION:
+                return
+            # Serialize workers racing on a cold database, then re-check
+            await db.execute("BEGIN IMMEDIATE")
+            if await self._schema_version(db) >= SCHEMA_VERSION:
+                await db.rollback()
+                return
+
+            # Business Tables
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS users (
+                    id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    email TEXT NOT NULL
+                )
+            """
+            )
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS contacts (
+                    id TEXT PRIMARY KEY,
+                    owner_id TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    email TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    avatar_url TEXT,
+                    FOREIGN KEY(owner_id) REFERENCES users(id)
+                )
+            """
+            )
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS events (
+                    id TEXT PRIMARY KEY,
+                    organizer_id TEXT NOT NULL,
+                    subject TEXT NOT NULL,
+                    start_time TEXT NOT NULL,
+                    end_time TEXT NOT NULL,
+                    attendees TEXT NOT NULL,
+                    location TEXT,
+                    agenda TEXT,
+                    status TEXT DEFAULT 'confirmed',
+                    idempotency_key TEXT,
+                    FOREIGN KEY(organizer_id) REFERENCES users(id)
+                )
+            """
+            )
+            # Databases created before idempotency keys existed
+            async with db.execute("PRAGMA table_info(events)") as cursor:
+                event_columns = {row[1] for row in await cursor.fetchall()}
+            upgrading_events = "idempotency_key" not in event_columns
+            if upgrading_events:
+                await db.execute("ALTER TABLE events ADD COLUMN idempotency_key TEXT")
+            await db.execute(
+                """
+                CREATE UNIQUE INDEX IF NOT EXISTS events_idempotency_idx
+                ON events (organizer_id, idempotency_key)
+            """
+            )
+            await db.execute(
+                """
+                CREATE INDEX IF NOT EXISTS events_organizer_idx
+                ON events (organizer_id, start_time, id)
+            """
+            )
+            # One row per (event, participant) so overlap checks are index range scans
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS event_participants (
+                    event_id TEXT NOT NULL,
+                    organizer_id TEXT NOT NULL,
+                    participant TEXT NOT NULL,
+                    start_time TEXT NOT NULL,
+                    end_time TEXT NOT NULL,
+                    PRIMARY KEY (event_id, participant)
+                )
+            """
+            )
+            await db.execute(
+                """
+                CREATE INDEX IF NOT EXISTS event_participants_time_idx
+                ON event_participants (participant, start_time, end_time)
+            """
+            )
+            if upgrading_events:
+                # Attendee names of old events aren't backfilled, only organizers
+                await db.execute(
+                    """
+                    INSERT OR IGNORE INTO event_participants
+                    SELECT id, organizer_id, organizer_id, start_time, end_time FROM events
+                """
+                )
+
+            # Availability: email lookup from contacts to users, and profiles
+            await db.execute(
+                "CREATE INDEX IF NOT EXISTS users_email_idx ON users (email)"
+            )
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS working_hours (
+                    user_id TEXT PRIMARY KEY,
+                    timezone TEXT NOT NULL DEFAULT 'UTC',
+                    day_start INTEGER NOT NULL DEFAULT 540,
+                    day_end INTEGER NOT NULL DEFAULT 1020,
+                    weekdays TEXT NOT NULL DEFAULT '01234'
+                )
+            """
+            )
+
+            # ChatKit Tables. title, updated_at and item_count are copies kept
+            # current by save_thread and the item writes, so the history
+            # sidebar is served without decoding ``data``.
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS threads (
+                    id TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    data JSON NOT NULL,
+                    title TEXT,
+                    updated_at TEXT,
+                    item_count INTEGER NOT NULL DEFAULT 0
+                )
+            """
+            )
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS items (
+                    id TEXT PRIMARY KEY,
+                    thread_id TEXT NOT NULL,
+                    user_id TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    data JSON NOT NULL,
+                    FOREIGN KEY(thread_id) REFERENCES threads(id) ON DELETE CASCADE
+                )
+            """
+            )
+            # Databases created before the listing columns existed
+            async with db.execute("PRAGMA table_info(threads)") as cursor:
+                thread_columns = {row[1] for row in await cursor.fetchall()}
+            upgrading_threads = "item_count" not in thread_columns
+            if upgrading_threads:
+                await db.execute("ALTER TABLE threads ADD COLUMN title TEXT")
+                await db.execute("ALTER TABLE threads ADD COLUMN updated_at TEXT")
+                await db.execute(
+                    "ALTER TABLE threads ADD COLUMN item_count INTEGER NOT NULL DEFAULT 0"
+                )
+                await db.execute(
+                    """
+                    UPDATE threads SET
+                        title = json_extract(data, '$.title'),
+                        updated_at = coalesce(
+                            (SELECT max(created_at) FROM items WHERE thread_id = threads.id),
+                            created_at
+                        ),
+                        item_count = (SELECT count(*) FROM items WHERE thread_id = threads.id)
+                """
+                )
+            await db.execute(
+                """
+                CREATE INDEX IF NOT EXISTS threads_user_updated_idx
+                ON threads (user_id, updated_at, id)
+            """
+            )
+            await db.execute(
+                """
+                CREATE INDEX IF NOT EXISTS items_thread_idx
+                ON items (thread_id, created_at)
+            """
+            )
+            await self._create_search_index(db, backfill=upgrading_threads)
+            await db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            await db.commit()
+
+    @staticmethod
+    async def _create_search_index(db: aiosqlite.Connection, backfill: bool) -> None:
+        """
+        FTS5 tables over thread titles and message text, keyed by the rowid
+        of the row they index and kept in sync by triggers, so every write
+        path (bulk loads and rebalance copies included) maintains them.
+        ``owner`` lets a search match only the user's rows inside the index.
+        The rowids of tables without an INTEGER PRIMARY KEY can change on
+        VACUUM; rebuild both tables if the database is ever vacuumed.
+        """
+        types = ", ".join(f"'{t}'" for t in SEARCHABLE_ITEM_TYPES)
+        item_text = f"""
+            SELECT new.rowid, new.user_id, group_concat(json_extract(value, '$.text'), ' ')
+            FROM json_each(new.data, '$.content')
+            WHERE json_extract(new.data, '$.type') IN ({types})
+            HAVING count(*) > 0
+        """
+        for statement in (
+            "CREATE VIRTUAL TABLE IF NOT EXISTS threads_fts USING fts5 (owner, title)",
+            "CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5 (owner, text)",
+            """
+            CREATE TRIGGER IF NOT EXISTS threads_fts_insert AFTER INSERT ON threads BEGIN
+                INSERT INTO threads_fts (rowid, owner, title)
+                VALUES (new.rowid, new.user_id, coalesce(new.title, ''));
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS threads_fts_update AFTER UPDATE OF title ON threads BEGIN
+                UPDATE threads_fts SET title = coalesce(new.title, '') WHERE rowid = new.rowid;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS threads_fts_delete AFTER DELETE ON threads BEGIN
+                DELETE FROM threads_fts WHERE rowid = old.rowid;
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS items_fts_insert AFTER INSERT ON items BEGIN
+                INSERT INTO items_fts (rowid, owner, text) {item_text};
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS items_fts_update AFTER UPDATE OF data ON items
+            WHEN json_extract(new.data, '$.type') IN ({types}) BEGIN
+                DELETE FROM items_fts WHERE rowid = old.rowid;
+                INSERT INTO items_fts (rowid, owner, text) {item_text};
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS items_fts_delete AFTER DELETE ON items BEGIN
+                DELETE FROM items_fts WHERE rowid = old.rowid;
+            END
+            """,
+        ):
+            await db.execute(statement)
+
+        if backfill:
+            await db.execute("DELETE FROM threads_fts")
+            await db.execute(
+                "INSERT INTO threads_fts (rowid, owner, title) SELECT rowid, user_id, coalesce(title, '') FROM threads"
+            )
+            await db.execute("DELETE FROM items_fts")
+            await db.execute(
+                f"""
+                INSERT INTO items_fts (rowid, owner, text)
+                SELECT items.rowid, items.user_id, group_concat(json_extract(value, '$.text'), ' ')
+                FROM items, json_each(items.data, '$.content')
+                WHERE json_extract(items.data, '$.type') IN ({types})
+                GROUP BY items.rowid
+            """
+            )
+
+    @staticmethod
+    async def _schema_version(db: aiosqlite.Connection) -> int:
+        async with db.execute("PRAGMA user_version") as cursor:
+            return (await cursor.fetchone())[0]
+
+    async def close(self) -> None:
+        while not self._idle.empty():
+            conn = self._idle.get_nowait()
+            await conn.close()
+            self._opened -= 1
+
+    # --- Users & Contacts ---
+    async def count_users(self) -> int:
+        async with self.connection() as db:
+            async with db.execute("SELECT count(*) FROM users") as cursor:
+                row = await cursor.fetchone()
+                return row[0]
+
+    async def has_users(self) -> bool:
+        async with self.connection() as db:
+            async with db.execute("SELECT EXISTS (SELECT 1 FROM users)") as cursor:
+                return bool((await cursor.fetchone())[0])
+
+    async def insert_users(self, rows: Sequence[tuple]) -> None:
+        async with self._transaction() as db:
+            await db.executemany(
+                "INSERT INTO users (id, name, email) VALUES (?, ?, ?)", rows
+            )
+
+    async def insert_contacts(self, rows: Sequence[tuple]) -> None:
+        async with self._transaction() as db:
+            await db.executemany(
+                "INSERT INTO contacts (id, owner_id, name, email, role, avatar_url) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    async def search_contacts(
+        self, owner_id: str, query: str, limit: int | None = None, offset: int = 0
+    ) -> List[ContactRecord]:
+        async with self.connection() as db:
+            # Use LOWER() for case-insensitive matching in SQLite
+            sql = f"""
+                SELECT {CONTACT_COLUMNS} FROM contacts 
+                WHERE owner_id = ? 
+                AND (LOWER(name) LIKE LOWER(?) OR LOWER(email) LIKE LOWER(?))
+                ORDER BY name, id
+                LIMIT ? OFFSET ?
+            """
+            search_term = f"%{query}%"
+            # LIMIT -1 means no limit in SQLite
+            params = (owner_id, search_term, search_term, limit or -1, offset)
+            async with db.execute(sql, params) as cursor:
+                rows = await cursor.fetchall()
+                return [ContactRecord(*row) for row in rows]
+
+    async def get_contacts_by_ids(
+        self, ids: List[str], owner_id: str | None = None
+    ) -> List[ContactRecord]:
+        async with self.connection() as db:
+            placeholders = ", ".join(["?"] * len(ids))
+            sql = f"SELECT {CONTACT_COLUMNS} FROM contacts WHERE id IN ({placeholders})"
+            params = list(ids)
+            if owner_id is not None:
+                sql += " AND owner_id = ?"
+                params.append(owner_id)
+            async with db.execute(sql, params) as cursor:
+                rows = await cursor.fetchall()
+                return [ContactRecord(*row) for row in rows]
+
+    async def get_user_ids_by_email(self, emails: Sequence[str]) -> dict[str, str]:
+        if not emails:
+            return {}
+        async with self.connection() as db:
+            placeholders = ", ".join(["?"] * len(emails))
+            sql = f"SELECT email, id FROM users WHERE email IN ({placeholders})"
+            async with db.execute(sql, list(emails)) as cursor:
+                return {email: user_id for email, user_id in await cursor.fetchall()}
+
+    async def upsert_working_hours(self, profiles: Sequence[WorkingHours]) -> None:
+        async with self._transaction() as db:
+            await db.executemany(
+                f"INSERT OR REPLACE INTO working_hours ({WORKING_HOURS_COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+                [profile.as_row() for profile in profiles],
+            )
+
+    async def get_working_hours(self, user_ids: Sequence[str]) -> List[WorkingHours]:
+        if not user_ids:
+            return []
+        async with self.connection() as db:
+            placeholders = ", ".join(["?"] * len(user_ids))
+            sql = f"SELECT {WORKING_HOURS_COLUMNS} FROM working_hours WHERE user_id IN ({placeholders})"
+            async with db.execute(sql, list(user_ids)) as cursor:
+                return [WorkingHours(*row) for row in await cursor.fetchall()]
+
+    # --- Events ---
+    async def insert_event(
+        self, event: EventRecord, participants: Sequence[str] | None = None
+    ) -> None:
+        if participants is None:
+            (participants,) = await self.resolve_participants([event])
+        async with self._transaction() as db:
+            await db.execute(INSERT_EVENT, event.as_row())
+            await db.executemany(INSERT_PARTICIPANT, participant_rows(event, participants))
+
+    async def create_event(
+        self, event: EventRecord, participants: Sequence[str] | None = None
+    ) -> str:
+        if participants is None:
+            (participants,) = await self.resolve_participants([event])
+        # The transaction takes the write lock before reading, so two
+        # concurrent creates can't both pass the overlap check
+        async with self._transaction() as db:
+            if event.idempotency_key:
+                async with db.execute(
+                    "SELECT id FROM events WHERE organizer_id = ? AND idempotency_key = ?",
+                    (event.organizer_id, event.idempotency_key),
+                ) as cursor:
+                    existing = await cursor.fetchone()
+                if existing:
+                    return existing[0]
+
+            conflicts = await self.get_conflicts(event, participants)
+            if conflicts:
+                raise EventConflictError(conflicts)
+
+            await db.execute(INSERT_EVENT, event.as_row())
+            await db.executemany(INSERT_PARTICIPANT, participant_rows(event, participants))
+        return event.id
+
+    async def get_conflicts(
+        self, event: EventRecord, participants: Sequence[str]
+    ) -> List[EventRecord]:
+        # Inside a transaction the BEGIN IMMEDIATE write lock does the locking
+        async with self.connection() as db:
+            placeholders = ", ".join(["?"] * len(participants))
+            sql = f"""
+                SELECT {EVENT_COLUMNS} FROM events WHERE id IN (
+                    SELECT event_id FROM event_participants
+                    WHERE participant IN ({placeholders})
+                    AND ((start_time < ? AND end_time > ?) OR start_time = ?)
+                )
+                ORDER BY start_time ASC
+            """
+            params = (*participants, event.end_time, event.start_time, event.start_time)
+            async with db.execute(sql, params) as cursor:
+                return [EventRecord(*row) for row in await cursor.fetchall()]
+
+    async def insert_events(
+        self,
+        events: Sequence[EventRecord],
+        participants: Sequence[Sequence[str]] | None = None,
+    ) -> int:
+        if participants is None:
+            participants = await self.resolve_participants(events)
+        async with self._transaction() as db:
+            before = db.total_changes
+            await db.executemany(
+                IMPORT_EVENT,
+                [event.as_row() for event in events],
+            )
+            inserted = db.total_changes - before
+            # Skip participant rows of events ignored above as duplicates
+            await db.executemany(
+                """
+                INSERT OR IGNORE INTO event_participants
+                SELECT ?, ?, ?, ?, ? WHERE EXISTS (SELECT 1 FROM events WHERE id = ?)
+                """,
+                [
+                    (*row, event.id)
+                    for event, keys in zip(events, participants)
+                    for row in participant_rows(event, keys)
+                ],
+            )
+        return inserted
+
+    async def get_events_by_organizer(
+        self, organizer_id: str
+    ) -> List[EventRecord]:
+        async with self.connection() as db:
+            sql = f"SELECT {EVENT_COLUMNS} FROM events WHERE organizer_id = ? ORDER BY start_time, id"
+            async with db.execute(sql, (organizer_id,)) as cursor:
+                rows = await cursor.fetchall()
+                return [EventRecord(*row) for row in rows]
+
+    async def iter_events_by_organizer(
+        self, organizer_id: str, window_size: int, since: str = ""
+    ) -> AsyncIterator[List[EventRecord]]:
+        # Keyset pages rather than one open cursor, so the connection is
+        # free between windows for other store calls in the unit of work
+        sql = f"""
+            SELECT {EVENT_COLUMNS} FROM events
+            WHERE organizer_id = ? AND (start_time, id) > (?, ?)
+            ORDER BY start_time, id LIMIT ?
+        """
+        after = (since, "")
+        while True:
+            async with self.connection() as db:
+                async with db.execute(sql, (organizer_id, *after, window_size)) as cursor:
+                    rows = await cursor.fetchall()
+            if not rows:
+                return
+            window = [EventRecord(*row) for row in rows]
+            after = (window[-1].start_time, window[-1].id)
+            yield window
+            if len(rows) < window_size:
+                return
+
+    async def count_events_by_organizer(self, organizer_id: str, since: str = "") -> int:
+        async with self.connection() as db:
+            async with db.execute(
+                "SELECT count(*) FROM events WHERE organizer_id = ? AND start_time >= ?",
+                (organizer_id, since),
+            ) as cursor:
+                (count,) = await cursor.fetchone()
+                return count
+
+    async def get_busy_intervals(
+        self, participants: Sequence[str], start: str, end: str
+    ) -> List[tuple]:
+        if not participants:
+            return []
+        async with self.connection() as db:
+            placeholders = ", ".join(["?"] * len(participants))
+            # Range scan per participant on event_participants_time_idx
+            sql = f"""
+                SELECT participant, start_time, end_time FROM event_participants
+                WHERE participant IN ({placeholders}) AND start_time < ? AND end_time > ?
+            """
+            async with db.execute(sql, (*participants, end, start)) as cursor:
+                return [tuple(row) for row in await cursor.fetchall()]
+
+    # --- Threads ---
+    async def load_thread(self, thread_id: str, user_id: str) -> dict | None:
+        async with self.connection() as db:
+            async with db.execute(
+                "SELECT data FROM threads WHERE id = ? AND user_id = ?",
+                (thread_id, user_id),
+            ) as cursor:
+                row = await cursor.fetchone()
+                return json.loads(row[0]) if row else None
+
+    async def save_thread(
+        self,
+        thread_id: str,
+        user_id: str,
+        created_at: str,
+        data: str,
+        title: str | None = None,
+    ) -> None:
+        async with self._transaction() as db:
+            await db.execute(
+                """
+                INSERT INTO threads (id, user_id, created_at, data, title, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET data = excluded.data, title = excluded.title
+                """,
+                (thread_id, user_id, created_at, data, title, created_at),
+            )
+
+    async def insert_threads(self, rows: Sequence[tuple]) -> None:
+        async with self._transaction() as db:
+            await db.executemany(
+                """
+                INSERT INTO threads (id, user_id, created_at, data, title, updated_at)
+                VALUES (?, ?, ?, ?, json_extract(?, '$.title'), ?)
+                """,
+                [(*row, row[3], row[2]) for row in rows],
+            )
+
+    async def list_threads(
+        self,
+        user_id: str,
+        limit: int,
+        after: str | None = None,
+        order: str = "desc",
+    ) -> List[ThreadSummary]:
+        direction, compare = ("ASC", ">") if order == "asc" else ("DESC", "<")
+        sql = f"SELECT {THREAD_SUMMARY_COLUMNS} FROM threads WHERE user_id = ?"
+        params: list = [user_id]
+        if after:
+            # Keyset pagination: a range scan of threads_user_updated_idx
+            sql += f"""
+                AND (updated_at, id) {compare} (
+                    SELECT updated_at, id FROM threads WHERE id = ? AND user_id = ?
+                )
+            """
+            params += [after, user_id]
+        sql += f" ORDER BY updated_at {direction}, id {direction} LIMIT ?"
+        params.append(limit)
+        async with self.connection() as db:
+            async with db.execute(sql, params) as cursor:
+                return [ThreadSummary(*row) for row in await cursor.fetchall()]
+
+    async def search_threads(
+        self, user_id: str, query: str, limit: int
+    ) -> List[ThreadSummary]:
+        terms = search_terms(query)
+        if not terms:
+            return []
+        # Every term as a prefix, within the user's rows of each index
+        owner = user_id.replace('"', '""')
+        words = " ".join(f'"{term}"*' for term in terms)
+        title_match = f'owner : "{owner}" AND title : ({words})'
+        text_match = f'owner : "{owner}" AND text : ({words})'
+        sql = f"""
+            SELECT {THREAD_SUMMARY_COLUMNS} FROM threads
+            WHERE user_id = ? AND (
+                rowid IN (SELECT rowid FROM threads_fts WHERE threads_fts MATCH ?)
+                OR id IN (
+                    SELECT items.thread_id FROM items_fts
+                    JOIN items ON items.rowid = items_fts.rowid
+                    WHERE items_fts MATCH ?
+                )
+            )
+            ORDER BY updated_at DESC, id DESC
+            LIMIT ?
+        """
+        async with self.connection() as db:
+            async with db.execute(sql, (user_id, title_match, text_match, limit)) as cursor:
+                return [ThreadSummary(*row) for row in await cursor.fetchall()]
+
+    async def delete_thread(self, thread_id: str, user_id: str) -> None:
+        async with self._transaction() as db:
+            cursor = await db.execute(
+                "DELETE FROM threads WHERE id = ? AND user_id = ?", (thread_id, user_id)
+            )
+            # foreign_keys is off, so the items' ON DELETE CASCADE never fires
+            if cursor.rowcount:
+                await db.execute("DELETE FROM items WHERE thread_id = ?", (thread_id,))
+
+    # --- Items ---
+    async def load_thread_items(
+        self, thread_id: str, user_id: str, limit: int
+    ) -> List[dict]:
+        async with self.connection() as db:
+            query = "SELECT data FROM items WHERE thread_id = ? ORDER BY created_at DESC LIMIT ?"
+            async with db.execute(query, (thread_id, limit)) as cursor:
+                rows = await cursor.fetchall()
+                return [json.loads(row[0]) for row in rows]
+
+    async def add_thread_item(
+        self, item_id: str, thread_id: str, user_id: str, created_at: str, data: str
+    ) -> None:
+        async with self._transaction() as db:
+            await db.execute(INSERT_ITEM, (item_id, thread_id, user_id, created_at, data))
+            await db.execute(BUMP_THREAD, (1, created_at, thread_id))
+
+    async def insert_items(self, rows: Sequence[tuple]) -> None:
+        async with self._transaction() as db:
+            await db.executemany(INSERT_ITEM, rows)
+            await db.executemany(BUMP_THREAD, thread_activity(rows))
+
+    async def save_item(
+        self, item_id: str, thread_id: str, user_id: str, created_at: str, data: str
+    ) -> None:
+        async with self._transaction() as db:
+            cursor = await db.execute(
+                "UPDATE items SET data = ? WHERE id = ?", (data, item_id)
+            )
+            # Only a new item changes the thread's count
+            if cursor.rowcount == 0:
+                await db.execute(INSERT_ITEM, (item_id, thread_id, user_id, created_at, data))
+                await db.execute(BUMP_THREAD, (1, created_at, thread_id))
+
+    async def patch_item(
+        self,
+        thread_id: str,
+        item_id: str,
+        user_id: str,
+        patches: Sequence[tuple[JsonPath, str]],
+    ) -> None:
+        if not patches:
+            return
+        # One json_set over all paths; the item is never decoded in Python
+        args = ", ".join(["?, json(?)"] * len(patches))
+        params = [arg for path, value in patches for arg in (json_path(path), value)]
+        async with self._transaction() as db:
+            await db.execute(
+                f"UPDATE items SET data = json_set(data, {args}) WHERE id = ? AND thread_id = ?",
+                (*params, item_id, thread_id),
+            )
+
+    async def load_item(
+        self, thread_id: str, item_id: str, user_id: str
+    ) -> dict | None:
+        async with self.connection() as db:
+            async with db.execute(
+                "SELECT data FROM items WHERE id = ? AND thread_id = ?",
+                (item_id, thread_id),
+            ) as cursor:
+                row = await cursor.fetchone()
+                return json.loads(row[0]) if row else None
+
+    async def delete_thread_item(
+        self, thread_id: str, item_id: str, user_id: str
+    ) -> None:
+        async with self._transaction() as db:
+            cursor = await db.execute(
+                "DELETE FROM items WHERE id = ? AND thread_id = ?", (item_id, thread_id)
+            )
+            if cursor.rowcount:
+                await db.execute(
+                    "UPDATE threads SET item_count = item_count - 1 WHERE id = ?",
+                    (thread_id,),
+                )
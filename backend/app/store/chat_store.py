@@ -1,15 +1,48 @@
 import json
 import uuid # Import uuid
-from typing import Any
+from datetime import datetime
+from typing import Any, List, Sequence
 from chatkit.store import Store, NotFoundError
 from chatkit.types import ThreadMetadata, ThreadItem, Page
-from app.database import get_db_connection
-from app.types import RequestContext
+from app.database import get_backend
+from app.offload import run_cpu
+from app.store.backends import StoreBackend
+from app.types import RequestContext, ThreadSummary
+from app.widgets.patch import WidgetPatch
 from pydantic import TypeAdapter
 
 thread_item_adapter = TypeAdapter(ThreadItem)
 
-class SqliteChatStore(Store[RequestContext]):
+
+# Module-level so they can be shipped to a process pool by run_cpu
+def _validate_items(rows: list[dict]) -> list[ThreadItem]:
+    return [thread_item_adapter.validate_python(row) for row in rows]
+
+
+def _dump_item(item: ThreadItem) -> str:
+    return item.model_dump_json()
+
+
+class ChatStore(Store[RequestContext]):
+
+    def __init__(self, backend: StoreBackend | None = None):
+        # None defers to the process-wide backend chosen by DATABASE_URL
+        self._backend = backend
+
+    @property
+    def backend(self) -> StoreBackend:
+        return self._backend or get_backend()
+
+    def unit_of_work(self, context: RequestContext):
+        """
+        One connection for everything done on behalf of ``context``: this
+        store's calls, the app-store helpers and the agent's tools.
+        """
+        return self.backend.unit_of_work(context.user_id)
+
+    def transaction(self, context: RequestContext):
+        """Writes made inside the block commit together or not at all."""
+        return self.backend.transaction(context.user_id)
     
     # Override ID generation to handle hidden items and prevent KeyError
     def generate_item_id(self, item_type: str, thread: ThreadMetadata, context: RequestContext) -> str:
@@ -33,46 +66,44 @@ class SqliteChatStore(Store[RequestContext]):
     async def load_thread(
         self, thread_id: str, context: RequestContext
     ) -> ThreadMetadata:
-        async with get_db_connection() as db:
-            async with db.execute(
-                "SELECT data FROM threads WHERE id = ? AND user_id = ?",
-                (thread_id, context.user_id),
-            ) as cursor:
-                row = await cursor.fetchone()
-                if not row:
-                    raise NotFoundError(f"Thread {thread_id} not found")
-                # ThreadMetadata is a class, so model_validate works
-                return ThreadMetadata.model_validate(json.loads(row[0]))
+        data = await self.backend.load_thread(thread_id, context.user_id)
+        if data is None:
+            raise NotFoundError(f"Thread {thread_id} not found")
+        # ThreadMetadata is a class, so model_validate works
+        return ThreadMetadata.model_validate(data)
 
     async def save_thread(
         self, thread: ThreadMetadata, context: RequestContext
     ) -> None:
-        async with get_db_connection() as db:
-            data = thread.model_dump_json()
-            await db.execute(
-                """
-                INSERT INTO threads (id, user_id, created_at, data) 
-                VALUES (?, ?, ?, ?)
-                ON CONFLICT(id) DO UPDATE SET data = excluded.data
-                """,
-                (thread.id, context.user_id, thread.created_at.isoformat(), data),
-            )
-            await db.commit()
+        await self.backend.save_thread(
+            thread.id,
+            context.user_id,
+            thread.created_at.isoformat(),
+            thread.model_dump_json(),
+            thread.title,
+        )
 
     async def load_threads(
         self, limit: int, after: str | None, order: str, context: RequestContext
     ) -> Page[ThreadMetadata]:
-        async with get_db_connection() as db:
-            query = "SELECT data FROM threads WHERE user_id = ? ORDER BY created_at DESC LIMIT ?"
-            params = [context.user_id, limit]
+        # Built from the listing columns alone. Threads are never locked or
+        # closed here, so the default status is the stored one.
+        rows = await self.backend.list_threads(context.user_id, limit + 1, after, order)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        data = [
+            ThreadMetadata(
+                id=row.id, title=row.title, created_at=datetime.fromisoformat(row.created_at)
+            )
+            for row in rows
+        ]
+        return Page(data=data, has_more=has_more, after=rows[-1].id if has_more else None)
 
-            async with db.execute(query, params) as cursor:
-                rows = await cursor.fetchall()
-                data = [
-                    ThreadMetadata.model_validate(json.loads(row[0])) for row in rows
-                ]
-
-        return Page(data=data, has_more=False)
+    async def search_threads(
+        self, query: str, limit: int, context: RequestContext
+    ) -> List[ThreadSummary]:
+        """Threads whose title or messages contain every word of ``query``."""
+        return await self.backend.search_threads(context.user_id, query, limit)
 
     async def load_thread_items(
         self,
@@ -82,83 +113,67 @@ class SqliteChatStore(Store[RequestContext]):
         order: str,
         context: RequestContext,
     ) -> Page[ThreadItem]:
-        async with get_db_connection() as db:
-            query = "SELECT data FROM items WHERE thread_id = ? ORDER BY created_at DESC LIMIT ?"
-            async with db.execute(query, (thread_id, limit)) as cursor:
-                rows = await cursor.fetchall()
-                data = [
-                    thread_item_adapter.validate_python(json.loads(row[0]))
-                    for row in rows
-                ]
-                if order == "asc":
-                    data.reverse()
+        rows = await self.backend.load_thread_items(
+            thread_id, context.user_id, limit
+        )
+        data = await run_cpu(_validate_items, rows)
+        if order == "asc":
+            data.reverse()
 
         return Page(data=data, has_more=False)
 
     async def add_thread_item(
         self, thread_id: str, item: ThreadItem, context: RequestContext
     ) -> None:
-        async with get_db_connection() as db:
-            data = item.model_dump_json()
-            await db.execute(
-                "INSERT INTO items (id, thread_id, user_id, created_at, data) VALUES (?, ?, ?, ?, ?)",
-                (
-                    item.id,
-                    thread_id,
-                    context.user_id,
-                    item.created_at.isoformat(),
-                    data,
-                ),
-            )
-            await db.commit()
+        await self.backend.add_thread_item(
+            item.id,
+            thread_id,
+            context.user_id,
+            item.created_at.isoformat(),
+            await run_cpu(_dump_item, item),
+        )
 
     async def save_item(
         self, thread_id: str, item: ThreadItem, context: RequestContext
     ) -> None:
-        async with get_db_connection() as db:
-            data = item.model_dump_json()
-            await db.execute(
-                """
-                INSERT INTO items (id, thread_id, user_id, created_at, data) 
-                VALUES (?, ?, ?, ?, ?)
-                ON CONFLICT(id) DO UPDATE SET data = excluded.data
-                """,
-                (
-                    item.id,
-                    thread_id,
-                    context.user_id,
-                    item.created_at.isoformat(),
-                    data,
-                ),
-            )
-            await db.commit()
+        await self.backend.save_item(
+            item.id,
+            thread_id,
+            context.user_id,
+            item.created_at.isoformat(),
+            await run_cpu(_dump_item, item),
+        )
+
+    async def patch_widget_item(
+        self,
+        thread_id: str,
+        item_id: str,
+        patches: Sequence[WidgetPatch],
+        context: RequestContext,
+    ) -> None:
+        """Rewrites only the patched parts of a stored widget item."""
+        await self.backend.patch_item(
+            thread_id,
+            item_id,
+            context.user_id,
+            [(("widget", *p.path), json.dumps(p.value)) for p in patches],
+        )
 
     async def load_item(
         self, thread_id: str, item_id: str, context: RequestContext
     ) -> ThreadItem:
-        async with get_db_connection() as db:
-            async with db.execute(
-                "SELECT data FROM items WHERE id = ? AND thread_id = ?",
-                (item_id, thread_id),
-            ) as cursor:
-                row = await cursor.fetchone()
-                if not row:
-                    raise NotFoundError(f"Item {item_id} not found")
-                return thread_item_adapter.validate_python(json.loads(row[0]))
+        data = await self.backend.load_item(thread_id, item_id, context.user_id)
+        if data is None:
+            raise NotFoundError(f"Item {item_id} not found")
+        return thread_item_adapter.validate_python(data)
 
     async def delete_thread(self, thread_id: str, context: RequestContext) -> None:
-        async with get_db_connection() as db:
-            await db.execute("DELETE FROM threads WHERE id = ?", (thread_id,))
-            await db.commit()
+        await self.backend.delete_thread(thread_id, context.user_id)
 
     async def delete_thread_item(
         self, thread_id: str, item_id: str, context: RequestContext
     ) -> None:
-        async with get_db_connection() as db:
-            await db.execute(
-                "DELETE FROM items WHERE id = ? AND thread_id = ?", (item_id, thread_id)
-            )
-            await db.commit()
+        await self.backend.delete_thread_item(thread_id, item_id, context.user_id)
 
     # Attachments not implemented for Phase 1
     async def save_attachment(self, attachment: Any, context: RequestContext) -> None:
@@ -170,4 +185,8 @@ class SqliteChatStore(Store[RequestContext]):
     async def delete_attachment(
         self, attachment_id: str, context: RequestContext
     ) -> None:
-        NotImplementedError("Attachment handling not implemented yet")
\ No newline at end of file
+        NotImplementedError("Attachment handling not implemented yet")
+
+
+# Backwards-compatible name from when SQLite was the only backend
+SqliteChatStore = ChatStore
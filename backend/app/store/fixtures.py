@@ -0,0 +1,254 @@
+"""
+Synthetic datasets for demos, staging and benchmarks.
+
+    python -m app.store.fixtures --users 10000 --contacts 50 --events 20 \
+        --threads 5 --items 8 [--seed 0]
+
+Each user's working hours, contacts, events, threads and items come from an RNG seeded with
+the user id, so a given seed always produces the same dataset and any slice
+of it can be regenerated on its own. Rows are generated lazily and written
+through the backends' bulk inserts a batch of users at a time.
+
+Run it against an empty database: ids are deterministic, so loading the same
+users twice fails on the primary keys. Benchmarks import ``generate_user``
+directly instead of hand-rolling their own rows.
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from itertools import batched
+from typing import Iterator, List
+
+from chatkit.types import (
+    AssistantMessageContent,
+    AssistantMessageItem,
+    InferenceOptions,
+    ThreadMetadata,
+    UserMessageItem,
+    UserMessageTextContent,
+)
+
+from app.database import close_backend, get_backend
+from app.store.app_store import init_db
+from app.store.backends import StoreBackend
+from app.types import ContactRecord, EventRecord, WorkingHours, format_attendees
+
+FIRST_NAMES = [
+    "Alex", "Bianca", "Chen", "Daria", "Emeka", "Farah", "Gus", "Hana", "Ivan",
+    "Jia", "Kofi", "Lena", "Mateo", "Nadia", "Omar", "Priya", "Quinn", "Rosa",
+    "Sam", "Tariq", "Uma", "Viktor", "Wen", "Yara", "Zane",
+]
+LAST_NAMES = [
+    "Adams", "Banerjee", "Costa", "Dubois", "Eriksen", "Fischer", "Garcia",
+    "Haddad", "Ito", "Jensen", "Kim", "Lopez", "Mensah", "Novak", "Okafor",
+    "Petrov", "Rossi", "Silva", "Tanaka", "Weber",
+]
+ROLES = [
+    "Engineer", "Designer", "Product Manager", "Sales", "Support", "Recruiter",
+    "Finance", "Legal", "Marketing", "Vendor",
+]
+SUBJECTS = [
+    "Weekly sync", "Design review", "Roadmap planning", "1:1", "Customer call",
+    "Interview", "Budget review", "Sprint retro", "Vendor demo", "Launch prep",
+]
+
+TIMEZONES = [
+    "America/Los_Angeles", "America/New_York", "America/Sao_Paulo", "Europe/London",
+    "Europe/Berlin", "Africa/Lagos", "Asia/Kolkata", "Asia/Singapore", "Asia/Tokyo",
+    "Australia/Sydney",
+]
+
+# Events land on working days from here on, between 09:00 and 17:00 UTC
+EPOCH = datetime(2026, 1, 5, tzinfo=timezone.utc)
+
+
+@dataclass(slots=True)
+class FixtureSpec:
+    users: int = 100
+    contacts_per_user: int = 20
+    events_per_user: int = 10
+    threads_per_user: int = 2
+    items_per_thread: int = 6
+    seed: int = 0
+
+
+@dataclass(slots=True)
+class UserFixture:
+    user: tuple
+    profile: WorkingHours
+    contacts: List[ContactRecord] = field(default_factory=list)
+    events: List[EventRecord] = field(default_factory=list)
+    threads: List[tuple] = field(default_factory=list)
+    items: List[tuple] = field(default_factory=list)
+
+
+def user_id(index: int) -> str:
+    return f"user{index}"
+
+
+def generate_user(spec: FixtureSpec, index: int) -> UserFixture:
+    uid = user_id(index)
+    rng = random.Random(f"{spec.seed}:{uid}")
+    day_start = rng.choice((7, 8, 9, 10)) * 60
+    fixture = UserFixture(
+        user=(uid, _name(rng), f"{uid}@example.com"),
+        profile=WorkingHours(uid, rng.choice(TIMEZONES), day_start, day_start + 8 * 60),
+    )
+
+    for n in range(spec.contacts_per_user):
+        name = _name(rng)
+        fixture.contacts.append(
+            ContactRecord(
+                id=f"{uid}-c{n}",
+                owner_id=uid,
+                name=name,
+                email=f"{name.lower().replace(' ', '.')}.{n}@example.com",
+                role=rng.choice(ROLES),
+                avatar_url=f"https://i.pravatar.cc/150?u={uid}-c{n}",
+            )
+        )
+
+    for n in range(spec.events_per_user):
+        day = rng.randrange(60)
+        start = EPOCH + timedelta(
+            days=day // 5 * 7 + day % 5, hours=9 + rng.randrange(8), minutes=rng.choice((0, 30))
+        )
+        end = start + timedelta(minutes=rng.choice((30, 60)))
+        attendees = rng.sample(fixture.contacts, k=min(len(fixture.contacts), rng.randint(1, 3)))
+        fixture.events.append(
+            EventRecord(
+                id=f"{uid}-e{n}",
+                organizer_id=uid,
+                subject=rng.choice(SUBJECTS),
+                start_time=start.isoformat(),
+                end_time=end.isoformat(),
+                attendees=format_attendees((c.name, c.email) for c in attendees),
+                location=rng.choice(("Zoom", "Meet", "Office")),
+                agenda="",
+            )
+        )
+
+    for n in range(spec.threads_per_user):
+        thread_id = f"thr_{uid}_{n}"
+        created = EPOCH + timedelta(minutes=rng.randrange(60 * 24 * 60))
+        subject = rng.choice(SUBJECTS)
+        thread = ThreadMetadata(id=thread_id, title=subject, created_at=created)
+        fixture.threads.append(
+            (thread_id, uid, created.isoformat(), thread.model_dump_json())
+        )
+        for m in range(spec.items_per_thread):
+            fixture.items.append(_item(thread_id, uid, m, created, subject))
+
+    return fixture
+
+
+def generate(spec: FixtureSpec, start: int = 0) -> Iterator[UserFixture]:
+    for index in range(start, spec.users):
+        yield generate_user(spec, index)
+
+
+async def load_fixtures(
+    spec: FixtureSpec, backend: StoreBackend | None = None, batch_users: int = 500
+) -> dict[str, int]:
+    """Writes the dataset in batches of ``batch_users`` users. Returns row counts."""
+    backend = backend or get_backend()
+    counts = dict.fromkeys(
+        ("users", "working_hours", "contacts", "events", "threads", "items"), 0
+    )
+    for batch in batched(generate(spec), batch_users):
+        users = [f.user for f in batch]
+        profiles = [f.profile for f in batch]
+        contacts = [
+            (c.id, c.owner_id, c.name, c.email, c.role, c.avatar_url)
+            for f in batch
+            for c in f.contacts
+        ]
+        events = [e for f in batch for e in f.events]
+        threads = [t for f in batch for t in f.threads]
+        items = [i for f in batch for i in f.items]
+
+        await backend.insert_users(users)
+        await backend.upsert_working_hours(profiles)
+        await backend.insert_contacts(contacts)
+        await backend.insert_events(events)
+        await backend.insert_threads(threads)
+        await backend.insert_items(items)
+
+        for name, rows in (
+            ("users", users),
+            ("working_hours", profiles),
+            ("contacts", contacts),
+            ("events", events),
+            ("threads", threads),
+            ("items", items),
+        ):
+            counts[name] += len(rows)
+    return counts
+
+
+def _name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def _item(thread_id: str, uid: str, n: int, created: datetime, subject: str) -> tuple:
+    item_id = f"msg_{thread_id}_{n}"
+    at = created + timedelta(seconds=n * 30)
+    if n % 2 == 0:
+        item = UserMessageItem(
+            id=item_id,
+            thread_id=thread_id,
+            created_at=at,
+            content=[UserMessageTextContent(text=f"Schedule a {subject.lower()} next week")],
+            inference_options=InferenceOptions(),
+        )
+    else:
+        item = AssistantMessageItem(
+            id=item_id,
+            thread_id=thread_id,
+            created_at=at,
+            content=[AssistantMessageContent(text="Here are the best available slots.")],
+        )
+    return (item_id, thread_id, uid, at.isoformat(), item.model_dump_json())
+
+
+async def _run(spec: FixtureSpec, batch_users: int) -> None:
+    await init_db()
+    start = time.perf_counter()
+    counts = await load_fixtures(spec, batch_users=batch_users)
+    elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+    summary = ", ".join(f"{n} {name}" for name, n in counts.items())
+    print(f"Loaded {summary} in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+    await close_backend()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load a synthetic dataset")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--contacts", type=int, default=20, help="Contacts per user")
+    parser.add_argument("--events", type=int, default=10, help="Events per user")
+    parser.add_argument("--threads", type=int, default=2, help="Threads per user")
+    parser.add_argument("--items", type=int, default=6, help="Items per thread")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-users", type=int, default=500)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    spec = FixtureSpec(
+        users=args.users,
+        contacts_per_user=args.contacts,
+        events_per_user=args.events,
+        threads_per_user=args.threads,
+        items_per_thread=args.items,
+        seed=args.seed,
+    )
+    asyncio.run(_run(spec, args.batch_users))
+
+
+if __name__ == "__main__":
+    main()
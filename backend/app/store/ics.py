@@ -0,0 +1,739 @@
+"""
+Streaming iCalendar (.ics) import and export for the ``events`` table.
+
+    python -m app.store.ics import --user alice calendar.ics
+    python -m app.store.ics export --user alice out.ics
+
+Import parses line by line with generators and writes in batched
+transactions, so memory stays flat however large the file is. Only
+recurring events are held back: their RRULE is expanded into one row per
+occurrence (up to RECURRENCE_HORIZON ahead) once the whole file has been
+read, so RECURRENCE-ID overrides anywhere in it are applied. TZIDs resolve
+to IANA zones or to the file's own VTIMEZONE definitions. Export streams
+events out of the store in windows.
+"""
+
+import argparse
+import asyncio
+import logging
+import re
+import uuid
+from bisect import bisect_right
+from calendar import monthrange
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from itertools import batched
+from typing import AsyncIterator, Iterable, Iterator
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from app.store.app_store import create_events, init_db, iter_events_by_user
+from app.types import EventRecord, format_attendees
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = 1000
+# Open-ended RRULEs are expanded this far past the import
+RECURRENCE_HORIZON = timedelta(days=366)
+
+_DURATION_RE = re.compile(
+    r"^(?P<sign>[+-])?P(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?"
+    r"(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$"
+)
+_OFFSET_RE = re.compile(r"^(?P<sign>[+-])(?P<hours>\d{2})(?P<minutes>\d{2})(?P<seconds>\d{2})?$")
+_TEXT_ESCAPES = {"n": "\n", "N": "\n", "\\": "\\", ";": ";", ",": ","}
+_WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+_RRULE_PARTS = {"FREQ", "INTERVAL", "COUNT", "UNTIL", "BYDAY", "BYMONTHDAY", "BYMONTH", "WKST"}
+
+# {NAME: [(params, value), ...]} for one component
+Properties = dict[str, list[tuple[dict, str]]]
+
+
+@dataclass(slots=True)
+class ImportResult:
+    read: int = 0  # events (occurrences, for recurring ones) parsed
+    imported: int = 0  # of those, rows that were new
+    skipped: int = 0  # VEVENTs that couldn't be parsed or expanded
+
+
+# --- Parsing ---
+def unfold_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Joins RFC 5545 folded lines (continuations start with a space or tab)."""
+    current = None
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def parse_content_line(line: str) -> tuple[str, dict[str, str], str]:
+    """Splits ``NAME;PARAM=x;PARAM="y:z":value`` into its parts."""
+    colon = line.find(":")
+    if colon == -1:
+        return line.upper(), {}, ""
+    head, value = line[:colon], line[colon + 1 :]
+    if head.count('"') % 2:
+        # The first colon sits inside a quoted parameter value; scan properly
+        in_quotes = False
+        for index, char in enumerate(line):
+            if char == '"':
+                in_quotes = not in_quotes
+            elif char == ":" and not in_quotes:
+                head, value = line[:index], line[index + 1 :]
+                break
+
+    name, *raw_params = head.split(";")
+    params = {}
+    for raw in raw_params:
+        key, _, val = raw.partition("=")
+        params[key.upper()] = val.strip('"')
+    return name.upper(), params, value
+
+
+def unescape_text(value: str) -> str:
+    out = []
+    chars = iter(value)
+    for char in chars:
+        if char == "\\":
+            nxt = next(chars, "")
+            out.append(_TEXT_ESCAPES.get(nxt, nxt))
+        else:
+            out.append(char)
+    return "".join(out)
+
+
+def parse_components(lines: Iterable[str]) -> Iterator[tuple[str, Properties, list]]:
+    """
+    Yields the components of a calendar (VEVENT, VTIMEZONE, ...) one at a
+    time as ``(name, properties, children)``, children (VALARM, STANDARD,
+    ...) nested the same way.
+    """
+    stack: list[tuple[str, Properties, list]] = []
+    for line in unfold_lines(lines):
+        name, params, value = parse_content_line(line)
+        if name == "BEGIN":
+            if value.upper() != "VCALENDAR":
+                stack.append((value.upper(), {}, []))
+        elif name == "END":
+            if stack and value.upper() == stack[-1][0]:
+                component = stack.pop()
+                if stack:
+                    stack[-1][2].append(component)
+                else:
+                    yield component
+        elif stack:
+            stack[-1][1].setdefault(name, []).append((params, value))
+
+
+def parse_offset(value: str) -> timedelta:
+    """``+0200`` / ``-053000`` as in TZOFFSETFROM and TZOFFSETTO."""
+    match = _OFFSET_RE.match(value.strip())
+    if not match:
+        raise ValueError(f"Invalid UTC offset {value!r}")
+    delta = timedelta(
+        hours=int(match["hours"]),
+        minutes=int(match["minutes"]),
+        seconds=int(match["seconds"] or 0),
+    )
+    return -delta if match["sign"] == "-" else delta
+
+
+class VTimezone(tzinfo):
+    """
+    A time zone defined by a VTIMEZONE component. Each STANDARD or DAYLIGHT
+    observance switches to its TZOFFSETTO at its DTSTART and at every
+    RRULE/RDATE onset after it (all in local time). Transitions are worked
+    out a year at a time as later dates are asked for.
+    """
+
+    def __init__(self, tzid: str, observances: list[tuple[datetime, timedelta, timedelta, str | None, list[datetime]]]):
+        if not observances:
+            raise ValueError(f"VTIMEZONE {tzid!r} has no observances")
+        self._tzid = tzid
+        # (dtstart, offset_from, offset_to, rrule, rdates)
+        self._observances = sorted(observances, key=lambda o: o[0])
+        self._through = 0
+        self._onsets: list[datetime] = []
+        self._offsets: list[timedelta] = []
+
+    @classmethod
+    def from_component(cls, props: Properties, children: list) -> "VTimezone":
+        tzid = props["TZID"][0][1]
+        observances = []
+        for name, sub, _ in children:
+            if name not in ("STANDARD", "DAYLIGHT"):
+                continue
+            start = datetime.strptime(sub["DTSTART"][0][1], "%Y%m%dT%H%M%S")
+            rrule = sub["RRULE"][0][1] if "RRULE" in sub else None
+            rdates = [
+                datetime.strptime(value, "%Y%m%dT%H%M%S")
+                for _, values in sub.get("RDATE", [])
+                for value in values.split(",")
+            ]
+            observances.append(
+                (start, parse_offset(sub["TZOFFSETFROM"][0][1]), parse_offset(sub["TZOFFSETTO"][0][1]), rrule, rdates)
+            )
+        return cls(tzid, observances)
+
+    def _extend(self, year: int) -> None:
+        if year <= self._through:
+            return
+        limit = datetime(year + 1, 1, 1)
+        transitions = []
+        for start, offset_from, offset_to, rrule, rdates in self._observances:
+            onsets = [start]
+            if rrule:
+                # UNTIL is in UTC; onsets are local times on the old offset
+                until = rrule_until(rrule)
+                last = until.replace(tzinfo=None) + offset_from if until else limit
+                onsets = rrule_starts(rrule, start, min(last, limit))
+            transitions.extend((onset, offset_to) for onset in onsets if onset < limit)
+            transitions.extend((onset, offset_to) for onset in rdates)
+        transitions.sort(key=lambda t: t[0])
+        self._onsets = [onset for onset, _ in transitions]
+        self._offsets = [offset for _, offset in transitions]
+        self._through = year
+
+    def utcoffset(self, dt: datetime | None) -> timedelta:
+        if dt is None:
+            return self._observances[0][2]
+        local = dt.replace(tzinfo=None)
+        self._extend(local.year)
+        index = bisect_right(self._onsets, local) - 1
+        # Before the first onset the earliest observance's old offset holds
+        return self._offsets[index] if index >= 0 else self._observances[0][1]
+
+    def dst(self, dt: datetime | None) -> None:
+        return None
+
+    def fromutc(self, dt: datetime) -> datetime:
+        # Onsets are local, so guess the offset and settle on it; exact
+        # except within the hour a transition repeats or skips
+        utc = dt.replace(tzinfo=None)
+        offset = self.utcoffset(utc + self._observances[0][2])
+        offset = self.utcoffset(utc + offset)
+        return (utc + offset).replace(tzinfo=self)
+
+    def tzname(self, dt: datetime | None) -> str:
+        return self._tzid
+
+
+def resolve_tzid(tzid: str, timezones: dict[str, tzinfo]) -> tzinfo:
+    """
+    The zone for a TZID parameter: an IANA zone if the name is one, else the
+    file's VTIMEZONE of that name, else UTC (with a warning).
+    """
+    if tzid in timezones:
+        return timezones[tzid]
+    try:
+        # A leading "/" marks a globally unique name, which IANA names are
+        zone = ZoneInfo(tzid.removeprefix("/"))
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning(f"Unknown TZID {tzid!r}, treating as UTC")
+        zone = timezone.utc
+    timezones[tzid] = zone
+    return zone
+
+
+def parse_ics_local(
+    value: str, params: dict[str, str], timezones: dict[str, tzinfo] | None = None
+) -> datetime:
+    """
+    An aware datetime in the value's own zone: its TZID, else UTC. Floating
+    times (no ``Z`` and no ``TZID``) are taken as UTC; all-day ``DATE``
+    values start at midnight.
+    """
+    zone = timezone.utc
+    if "TZID" in params and not value.endswith("Z"):
+        zone = resolve_tzid(params["TZID"], {} if timezones is None else timezones)
+    if params.get("VALUE") == "DATE" or len(value) == 8:
+        day = date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+        return datetime(day.year, day.month, day.day, tzinfo=zone)
+    return datetime.strptime(value.rstrip("Z"), "%Y%m%dT%H%M%S").replace(tzinfo=zone)
+
+
+def parse_ics_datetime(
+    value: str, params: dict[str, str], timezones: dict[str, tzinfo] | None = None
+) -> datetime:
+    """Returns an aware UTC datetime (see ``parse_ics_local``)."""
+    return parse_ics_local(value, params, timezones).astimezone(timezone.utc)
+
+
+# --- Recurrence ---
+def _byday(value: str) -> list[tuple[int | None, int]]:
+    """``1MO,-1FR,TU`` -> ``[(1, 0), (-1, 4), (None, 1)]``"""
+    days = []
+    for part in value.split(","):
+        ordinal, weekday = part[:-2], part[-2:]
+        if weekday not in _WEEKDAYS:
+            raise ValueError(f"Invalid BYDAY {part!r}")
+        days.append((int(ordinal) if ordinal else None, _WEEKDAYS[weekday]))
+    return days
+
+
+def _month_days(
+    year: int, month: int, byday: list | None, bymonthday: list[int] | None, default: int
+) -> list[int]:
+    """Days of one month selected by BYMONTHDAY / BYDAY, else ``default``."""
+    length = monthrange(year, month)[1]
+    if bymonthday:
+        days = {d if d > 0 else length + d + 1 for d in bymonthday}
+    elif byday:
+        days = set()
+        for ordinal, weekday in byday:
+            first = (weekday - date(year, month, 1).weekday()) % 7 + 1
+            matches = list(range(first, length + 1, 7))
+            if ordinal is None:
+                days.update(matches)
+            elif -len(matches) <= ordinal <= len(matches) and ordinal:
+                days.add(matches[ordinal - 1] if ordinal > 0 else matches[ordinal])
+    else:
+        days = {default}
+    return sorted(d for d in days if 1 <= d <= length)
+
+
+def rrule_until(rule: str, timezones: dict[str, tzinfo] | None = None, zone: tzinfo = timezone.utc) -> datetime | None:
+    """The RRULE's UNTIL as an aware UTC datetime; floating values are in ``zone``."""
+    for part in rule.upper().split(";"):
+        name, _, value = part.partition("=")
+        if name == "UNTIL":
+            local = parse_ics_local(value, {}, timezones)
+            if not value.endswith("Z"):
+                local = local.replace(tzinfo=zone)
+            return local.astimezone(timezone.utc)
+    return None
+
+
+def rrule_starts(rule: str, dtstart: datetime, until: datetime) -> Iterator[datetime]:
+    """
+    Occurrence starts of an RRULE, as naive wall times like ``dtstart``
+    (which is always the first), in order and up to its COUNT or to
+    ``until``. UNTIL is left to the caller, which knows the zone. Supports
+    FREQ=DAILY/WEEKLY/MONTHLY/YEARLY with INTERVAL, COUNT, BYDAY,
+    BYMONTHDAY and BYMONTH; anything else raises ValueError.
+    """
+    parts = dict(part.partition("=")[::2] for part in rule.upper().split(";") if part)
+    unsupported = sorted(set(parts) - _RRULE_PARTS)
+    if unsupported:
+        raise ValueError(f"Unsupported RRULE parts {unsupported} in {rule!r}")
+    freq = parts.get("FREQ")
+    interval = int(parts.get("INTERVAL", "1"))
+    count = int(parts["COUNT"]) if "COUNT" in parts else None
+    byday = _byday(parts["BYDAY"]) if "BYDAY" in parts else None
+    bymonthday = [int(d) for d in parts["BYMONTHDAY"].split(",")] if "BYMONTHDAY" in parts else None
+    bymonth = {int(m) for m in parts["BYMONTH"].split(",")} if "BYMONTH" in parts else None
+    if freq not in ("DAILY", "WEEKLY", "MONTHLY", "YEARLY"):
+        raise ValueError(f"Unsupported FREQ in {rule!r}")
+    if interval < 1:
+        raise ValueError(f"Invalid INTERVAL in {rule!r}")
+    if byday and freq in ("DAILY", "WEEKLY") and any(o is not None for o, _ in byday):
+        raise ValueError(f"BYDAY ordinals need FREQ=MONTHLY or YEARLY in {rule!r}")
+    if freq == "YEARLY" and byday and not bymonth:
+        raise ValueError(f"FREQ=YEARLY with BYDAY needs BYMONTH in {rule!r}")
+
+    clock = dtstart.time()
+    weekdays = {w for _, w in byday} if byday else None
+
+    def periods() -> Iterator[tuple[date, list[date]]]:
+        """(first day, candidate days) per period: day, week, month or year."""
+        if freq == "DAILY":
+            day = dtstart.date()
+            while True:
+                yield day, [day]
+                day += timedelta(days=interval)
+        elif freq == "WEEKLY":
+            week_start = _WEEKDAYS[parts.get("WKST", "MO")]
+            monday = dtstart.date() - timedelta(days=(dtstart.weekday() - week_start) % 7)
+            days = sorted((w - week_start) % 7 for w in (weekdays or {dtstart.weekday()}))
+            while True:
+                yield monday, [monday + timedelta(days=d) for d in days]
+                monday += timedelta(weeks=interval)
+        elif freq == "MONTHLY":
+            year, month = dtstart.year, dtstart.month
+            while True:
+                yield date(year, month, 1), [
+                    date(year, month, d)
+                    for d in _month_days(year, month, byday, bymonthday, dtstart.day)
+                ]
+                month += interval
+                year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+        elif freq == "YEARLY":
+            year = dtstart.year
+            while True:
+                yield date(year, 1, 1), [
+                    date(year, month, d)
+                    for month in sorted(bymonth or {dtstart.month})
+                    for d in _month_days(year, month, byday, bymonthday, dtstart.day)
+                ]
+                year += interval
+
+    yield dtstart
+    produced = 1
+    for first, days in periods():
+        if count is not None and produced >= count:
+            return
+        if datetime.combine(first, datetime.min.time()) > until:
+            return
+        for day in days:
+            start = datetime.combine(day, clock)
+            if start <= dtstart:
+                continue
+            if bymonth and day.month not in bymonth:
+                continue
+            if freq == "DAILY" and (
+                (weekdays and day.weekday() not in weekdays)
+                or (bymonthday and day.day not in _month_days(day.year, day.month, None, bymonthday, day.day))
+            ):
+                continue
+            if start > until:
+                return
+            yield start
+            produced += 1
+            if count is not None and produced >= count:
+                return
+
+
+def parse_duration(value: str) -> timedelta:
+    match = _DURATION_RE.match(value)
+    if not match:
+        raise ValueError(f"Invalid DURATION {value!r}")
+    parts = {k: int(v) for k, v in match.groupdict().items() if v and k != "sign"}
+    delta = timedelta(**parts)
+    return -delta if match["sign"] == "-" else delta
+
+
+def _first(event: dict, name: str) -> tuple[dict, str] | None:
+    values = event.get(name)
+    return values[0] if values else None
+
+
+def _attendee(params: dict[str, str], value: str) -> tuple[str, str | None]:
+    """``(name, email)`` of an ATTENDEE; the CN is the name when there is one."""
+    address = value[7:] if value[:7].lower() == "mailto:" else None
+    return params.get("CN") or address or value, address
+
+
+def _cancelled(event: Properties) -> bool:
+    status = _first(event, "STATUS")
+    return bool(status) and status[1].upper() == "CANCELLED"
+
+
+def _event_key(uid: str, start: datetime) -> str:
+    """Idempotency key of one occurrence of a recurring event."""
+    return f"{uid}/{start:%Y%m%dT%H%M%SZ}"
+
+
+def _event_times(
+    event: Properties, timezones: dict[str, tzinfo]
+) -> tuple[datetime, datetime] | None:
+    """Aware start and end in the DTSTART's zone; None without DTSTART."""
+    dtstart = _first(event, "DTSTART")
+    if dtstart is None:
+        return None
+    start = parse_ics_local(dtstart[1], dtstart[0], timezones)
+    if dtend := _first(event, "DTEND"):
+        end = parse_ics_local(dtend[1], dtend[0], timezones)
+    elif duration := _first(event, "DURATION"):
+        end = start + parse_duration(duration[1])
+    else:
+        end = start
+    return start, end
+
+
+def to_event_record(
+    event: Properties,
+    organizer_id: str,
+    timezones: dict[str, tzinfo] | None = None,
+    key: str | None = None,
+    times: tuple[datetime, datetime] | None = None,
+) -> EventRecord | None:
+    """
+    Maps a parsed VEVENT onto an ``events`` row; None if it has no DTSTART.
+    ``key`` and ``times`` override the UID and the event's own times, for
+    occurrences of recurring events.
+    """
+    times = times or _event_times(event, {} if timezones is None else timezones)
+    if times is None:
+        return None
+    start, end = (t.astimezone(timezone.utc) for t in times)
+
+    uid = _first(event, "UID")
+    # The UID doubles as idempotency key; the row id is derived from it so
+    # re-importing the same file is a no-op.
+    key = key or (uid[1] if uid else None)
+    event_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"{organizer_id}/{key}")) if key else str(uuid.uuid4())
+
+    summary = _first(event, "SUMMARY")
+    location = _first(event, "LOCATION")
+    description = _first(event, "DESCRIPTION")
+    status = _first(event, "STATUS")
+    attendees = format_attendees(
+        _attendee(params, value) for params, value in event.get("ATTENDEE", [])
+    )
+    return EventRecord(
+        id=event_id,
+        organizer_id=organizer_id,
+        subject=unescape_text(summary[1]) if summary else "No Subject",
+        start_time=start.isoformat(),
+        end_time=end.isoformat(),
+        attendees=attendees,
+        location=unescape_text(location[1]) if location else None,
+        agenda=unescape_text(description[1]) if description else None,
+        status=status[1].lower() if status else "confirmed",
+        idempotency_key=key,
+    )
+
+
+def expand_event(
+    event: Properties,
+    organizer_id: str,
+    timezones: dict[str, tzinfo],
+    overrides: dict[str, Properties],
+    horizon: datetime,
+) -> Iterator[EventRecord]:
+    """
+    One row per occurrence of a recurring VEVENT, through its UNTIL or
+    ``horizon``. EXDATEs are left out; ``overrides`` (RECURRENCE-ID events,
+    by occurrence key) replace their occurrence, or cancel it.
+    """
+    uid = _first(event, "UID")[1]
+    start, end = _event_times(event, timezones)
+    length = end - start
+    zone = start.tzinfo
+    rule = _first(event, "RRULE")[1]
+    until = rrule_until(rule, timezones, zone) or horizon
+    until = min(until, horizon)
+
+    excluded = {
+        parse_ics_datetime(value, params, timezones)
+        for params, values in event.get("EXDATE", [])
+        for value in values.split(",")
+    }
+    # Wall times, so occurrences keep their local time across DST changes;
+    # the bound is loose by a day and checked exactly below
+    local_until = until.astimezone(zone).replace(tzinfo=None) + timedelta(days=1)
+    for local in rrule_starts(rule, start.replace(tzinfo=None), local_until):
+        occurrence = local.replace(tzinfo=zone).astimezone(timezone.utc)
+        if occurrence > until:
+            return
+        if occurrence in excluded:
+            continue
+        key = _event_key(uid, occurrence)
+        override = overrides.pop(key, None)
+        if override is None:
+            yield to_event_record(event, organizer_id, key=key, times=(occurrence, occurrence + length))
+        elif not _cancelled(override):
+            yield to_event_record(override, organizer_id, timezones, key=key)
+
+
+def iter_event_records(
+    lines: Iterable[str],
+    organizer_id: str,
+    result: ImportResult | None = None,
+    now: datetime | None = None,
+) -> Iterator[EventRecord]:
+    """
+    Events of a calendar as rows. One-off events stream straight through;
+    recurring ones and their overrides are kept until the end of the file
+    and then expanded. VEVENTs that can't be parsed are logged, counted in
+    ``result.skipped`` and left out.
+    """
+    result = result or ImportResult()
+    horizon = (now or datetime.now(timezone.utc)) + RECURRENCE_HORIZON
+    timezones: dict[str, tzinfo] = {}
+    recurring: dict[str, Properties] = {}
+    overrides: dict[str, dict[str, Properties]] = {}
+    cancelled: set[str] = set()
+
+    for name, event, children in parse_components(lines):
+        try:
+            if name == "VTIMEZONE":
+                zone = VTimezone.from_component(event, children)
+                timezones[zone.tzname(None)] = zone
+                continue
+            if name != "VEVENT":
+                continue
+            uid = _first(event, "UID")
+            if uid and (recurrence_id := _first(event, "RECURRENCE-ID")):
+                start = parse_ics_datetime(recurrence_id[1], recurrence_id[0], timezones)
+                overrides.setdefault(uid[1], {})[_event_key(uid[1], start)] = event
+                continue
+            if _cancelled(event):
+                # Nobody is busy for a cancelled meeting, or its series
+                if uid:
+                    cancelled.add(uid[1])
+                continue
+            if uid and "RRULE" in event:
+                recurring[uid[1]] = event
+                continue
+            if "RRULE" in event:
+                raise ValueError("RRULE without a UID")
+            record = to_event_record(event, organizer_id, timezones)
+        except (KeyError, ValueError) as e:
+            logger.warning(f"Skipping unparseable {name}: {e!r}")
+            result.skipped += 1
+            continue
+        if record is not None:
+            yield record
+
+    for uid, event in recurring.items():
+        try:
+            yield from expand_event(event, organizer_id, timezones, overrides.get(uid, {}), horizon)
+        except (KeyError, ValueError) as e:
+            logger.warning(f"Skipping recurring VEVENT {uid!r}: {e!r}")
+            result.skipped += 1
+
+    # Overrides of occurrences that aren't in the file stand on their own
+    for uid, by_key in overrides.items():
+        for key, event in by_key.items():
+            if _cancelled(event) or uid in cancelled:
+                continue
+            try:
+                record = to_event_record(event, organizer_id, timezones, key=key)
+            except (KeyError, ValueError) as e:
+                logger.warning(f"Skipping unparseable VEVENT: {e!r}")
+                result.skipped += 1
+                continue
+            if record is not None:
+                yield record
+
+
+async def import_ics(
+    lines: Iterable[str], organizer_id: str, batch_size: int = IMPORT_BATCH_SIZE
+) -> ImportResult:
+    """
+    Imports every VEVENT in ``lines`` for ``organizer_id``, committing once
+    per batch. Each batch is read and parsed on a worker thread, so a large
+    upload doesn't hold up the event loop.
+    """
+    result = ImportResult()
+    batches = batched(iter_event_records(lines, organizer_id, result), batch_size)
+    # One batch at a time: the generator is never advanced concurrently
+    while batch := await asyncio.to_thread(next, batches, None):
+        result.read += len(batch)
+        result.imported += await create_events(batch)
+    return result
+
+
+# --- Export ---
+def escape_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line: str) -> str:
+    """Folds a content line at 75 octets, as RFC 5545 requires."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Don't split a multi-byte UTF-8 sequence
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode())
+        encoded = encoded[cut:]
+        limit = 74  # continuation lines carry a leading space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _ics_utc(value: str) -> str | None:
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def format_vevent(event: EventRecord, stamp: str) -> str | None:
+    start = _ics_utc(event.start_time)
+    if start is None:
+        # Rows booked before times were stored hold labels such as
+        # "Today, 2:00 PM", which have no absolute time
+        return None
+    end = _ics_utc(event.end_time) or start
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{event.idempotency_key or event.id}",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART:{start}",
+        f"DTEND:{end}",
+        f"SUMMARY:{escape_text(event.subject)}",
+    ]
+    if event.location:
+        lines.append(f"LOCATION:{escape_text(event.location)}")
+    if event.agenda:
+        lines.append(f"DESCRIPTION:{escape_text(event.agenda)}")
+    for name, email in event.attendee_list():
+        # An ATTENDEE needs an address; name-only entries (older rows) can't
+        # be invited by a calendar client, so they are left out
+        if email:
+            cn = name.replace('"', "")
+            lines.append(f'ATTENDEE;CN="{cn}":mailto:{email}')
+    if event.status:
+        lines.append(f"STATUS:{event.status.upper()}")
+    lines.append("END:VEVENT")
+    return "".join(fold_line(line) for line in lines)
+
+
+async def export_ics(user_id: str) -> AsyncIterator[str]:
+    """Yields an iCalendar document for the user's events, one VEVENT at a time."""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Executive Scheduler//EN\r\n"
+    skipped = 0
+    async for window in iter_events_by_user(user_id):
+        for event in window:
+            vevent = format_vevent(event, stamp)
+            if vevent is None:
+                skipped += 1
+            else:
+                yield vevent
+    if skipped:
+        logger.info(f"Skipped {skipped} events without an absolute time")
+    yield "END:VCALENDAR\r\n"
+
+
+# --- CLI ---
+async def _run(args: argparse.Namespace) -> None:
+    await init_db()
+    if args.command == "import":
+        with open(args.path, encoding="utf-8", newline="") as f:
+            result = await import_ics(f, args.user, args.batch_size)
+        print(
+            f"Imported {result.imported} of {result.read} events for {args.user}"
+            f" ({result.read - result.imported} already there, {result.skipped} skipped)"
+        )
+    else:
+        with open(args.path, "w", encoding="utf-8", newline="") as f:
+            async for chunk in export_ics(args.user):
+                f.write(chunk)
+        print(f"Exported events for {args.user} to {args.path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import or export .ics calendars")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("path")
+    parser.add_argument("--user", required=True, help="Organizer user id")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
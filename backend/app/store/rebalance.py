@@ -0,0 +1,119 @@
+"""
+Moves rows between SQLite shard files after a change of DB_SHARDS.
+
+    python -m app.store.rebalance --from-shards 1 --to-shards 4
+
+Run it with the server stopped. Rows are copied to their new shard and
+committed before being deleted from the old one, and copies skip rows the
+target already has, so an interrupted run can simply be started again.
+Copies are plain inserts: the targets' triggers index them for thread
+search, and nothing is deleted and re-inserted on a rerun.
+"""
+
+import argparse
+import asyncio
+import logging
+from collections import Counter
+from contextlib import AsyncExitStack
+
+from app.database import get_db_connection, shard_paths
+from app.store.backends import SqliteBackend, shard_index
+
+logger = logging.getLogger(__name__)
+
+# Table -> (column holding the owning user id, column rows are deleted by).
+# Threads precede items so a thread always lands on its new shard before
+# its items do.
+ROUTING = {
+    "users": ("id", "id"),
+    "working_hours": ("user_id", "user_id"),
+    "contacts": ("owner_id", "id"),
+    "events": ("organizer_id", "id"),
+    "event_participants": ("organizer_id", "event_id"),
+    "threads": ("user_id", "id"),
+    "items": ("user_id", "id"),
+}
+
+
+async def rebalance(
+    from_shards: int, to_shards: int, batch_size: int = 1000
+) -> Counter:
+    sources = shard_paths(from_shards)
+    targets = shard_paths(to_shards)
+    # Also brings older source files up to the current schema
+    for path in {*targets, *(path for path in sources if path.exists())}:
+        await SqliteBackend(path).init_schema()
+
+    moved: Counter = Counter()
+    async with AsyncExitStack() as stack:
+        target_dbs = [
+            await stack.enter_async_context(get_db_connection(path))
+            for path in targets
+        ]
+        for source in sources:
+            if not source.exists():
+                continue
+            async with get_db_connection(source) as db:
+                for table, (column, key) in ROUTING.items():
+                    moved[table] += await _move_table(
+                        db, source, table, column, key, targets, target_dbs, batch_size
+                    )
+    return moved
+
+
+async def _move_table(
+    db, source, table, column, key, targets, target_dbs, batch_size
+):
+    moved = 0
+    moved_keys = set()
+    async with db.execute(f"SELECT * FROM {table}") as cursor:
+        while rows := await cursor.fetchmany(batch_size):
+            batches: dict[int, list] = {}
+            for row in rows:
+                index = shard_index(row[column], len(targets))
+                if targets[index] != source:
+                    batches.setdefault(index, []).append(row)
+            for index, batch in batches.items():
+                columns = ", ".join(batch[0].keys())
+                placeholders = ", ".join(["?"] * len(batch[0]))
+                # Not OR REPLACE: that deletes the existing row without
+                # firing delete triggers, leaving its search index rows stale
+                await target_dbs[index].executemany(
+                    f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+                    " ON CONFLICT DO NOTHING",
+                    [tuple(row) for row in batch],
+                )
+                await target_dbs[index].commit()
+                moved += len(batch)
+                moved_keys.update(row[key] for row in batch)
+
+    # Delete only after the copies are durable on their new shard
+    moved_keys = list(moved_keys)
+    for start in range(0, len(moved_keys), batch_size):
+        chunk = moved_keys[start : start + batch_size]
+        placeholders = ", ".join(["?"] * len(chunk))
+        await db.execute(
+            f"DELETE FROM {table} WHERE {key} IN ({placeholders})", chunk
+        )
+    await db.commit()
+
+    if moved:
+        logger.info(f"Moved {moved} {table} rows out of {source.name}")
+    return moved
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--from-shards", type=int, required=True)
+    parser.add_argument("--to-shards", type=int, required=True)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    moved = asyncio.run(rebalance(args.from_shards, args.to_shards, args.batch_size))
+    for table in ROUTING:
+        print(f"{table}: {moved[table]} rows moved")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,13 @@
+import re
 from dataclasses import dataclass
+from typing import Iterable, List, Tuple
+
 from pydantic import BaseModel
 
-@dataclass
+# One entry of EventRecord.attendees: "Bob Manager <bob@example.com>"
+_ATTENDEE_RE = re.compile(r"^(?P<name>.*?)\s*<(?P<email>[^<>]*)>$")
+
+@dataclass(slots=True)
 class RequestContext:
     user_id: str
 
@@ -16,4 +22,131 @@ class Contact(BaseModel):
     name: str
     email: str
     role: str
-    avatar_url: str | None = None
\ No newline at end of file
+    avatar_url: str | None = None
+
+
+# --- Internal hot-path records ---
+# Slotted dataclasses built straight from DB row tuples. The store and the
+# availability code pass these around; they are only turned into pydantic
+# models or widget payloads at the API boundary. Field order matches the
+# table column order so ``Record(*row)`` works.
+
+@dataclass(slots=True)
+class ContactRecord:
+    id: str
+    owner_id: str
+    name: str
+    email: str
+    role: str
+    avatar_url: str | None = None
+
+    def to_model(self) -> Contact:
+        return Contact(
+            id=self.id,
+            owner_id=self.owner_id,
+            name=self.name,
+            email=self.email,
+            role=self.role,
+            avatar_url=self.avatar_url,
+        )
+
+@dataclass(slots=True)
+class EventRecord:
+    id: str
+    organizer_id: str
+    subject: str
+    start_time: str
+    end_time: str
+    # "Name <email>, ..."; imported and older rows may lack the addresses
+    attendees: str
+    location: str | None = None
+    agenda: str | None = None
+    status: str = "confirmed"
+    idempotency_key: str | None = None
+
+    def as_row(self) -> tuple:
+        return (
+            self.id,
+            self.organizer_id,
+            self.subject,
+            self.start_time,
+            self.end_time,
+            self.attendees,
+            self.location,
+            self.agenda,
+            self.status,
+            self.idempotency_key,
+        )
+
+    def attendee_list(self) -> List[Tuple[str, str | None]]:
+        """``(name, email)`` per attendee; email is None for name-only entries."""
+        attendees = []
+        for entry in filter(None, (a.strip() for a in self.attendees.split(","))):
+            match = _ATTENDEE_RE.match(entry)
+            if match:
+                attendees.append((match["name"], match["email"].strip() or None))
+            elif "@" in entry:
+                attendees.append((entry, entry))
+            else:
+                attendees.append((entry, None))
+        return attendees
+
+
+def format_attendees(attendees: Iterable[Tuple[str, str | None]]) -> str:
+    """The ``EventRecord.attendees`` string for ``(name, email)`` pairs."""
+    entries = []
+    for name, email in attendees:
+        # Commas separate attendees, angle brackets delimit the address
+        name = " ".join(re.sub(r"[,<>]", " ", name).split())
+        entries.append(f"{name} <{email}>" if email else name)
+    return ", ".join(entries)
+
+@dataclass(slots=True)
+class WorkingHours:
+    """A user's working-hours profile. Minutes are after local midnight."""
+    user_id: str
+    timezone: str = "UTC"
+    day_start: int = 9 * 60
+    day_end: int = 17 * 60
+    weekdays: str = "01234"  # Monday=0, as date.weekday()
+
+    def as_row(self) -> tuple:
+        return (self.user_id, self.timezone, self.day_start, self.day_end, self.weekdays)
+
+@dataclass(slots=True)
+class ThreadSummary:
+    """A thread's denormalized listing columns, read without its JSON blob."""
+    id: str
+    title: str | None
+    created_at: str
+    updated_at: str
+    item_count: int = 0
+
+    def to_payload(self) -> dict:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "item_count": self.item_count,
+        }
+
+@dataclass(slots=True)
+class TimeSlot:
+    id: str
+    time_label: str
+    duration: str
+    conflict: bool = False
+    # ISO 8601 UTC start and length, sent back when the slot is picked
+    start: str = ""
+    minutes: int = 0
+
+    def to_payload(self) -> dict:
+        return {
+            "id": self.id,
+            "time_label": self.time_label,
+            "duration": self.duration,
+            "conflict": self.conflict,
+            "start": self.start,
+            "minutes": self.minutes,
+        }
@@ -1,8 +1,9 @@
 import os
-from typing import List, Dict, Any
+import uuid
+from typing import List, Sequence
 from pydantic import TypeAdapter  # Added this
 from chatkit.widgets import WidgetTemplate, WidgetRoot
-from app.types import Contact
+from app.types import ContactRecord, TimeSlot
 
 # Helper to get template path
 TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "templates")
@@ -26,7 +27,26 @@ meeting_confirmed_tmpl = WidgetTemplate.from_file(
 )
 
 
-def build_contact_picker(contacts: List[Contact]) -> WidgetRoot:
+# Contacts per picker page; larger result sets page via "Show more"
+CONTACT_PAGE_SIZE = 10
+
+
+def build_contact_picker(
+    contacts: Sequence[ContactRecord],
+    query: str = "",
+    offset: int = 0,
+    has_more: bool = False,
+    carried: Sequence[str] = (),
+) -> WidgetRoot:
+    """
+    Builds one page of the contact picker. ``carried`` holds contact IDs
+    selected on other pages. Only the paging buttons in the ``contact-pager``
+    row carry them, so turning a page patches that row and ``contact-list``
+    rather than the whole card; on confirm, ``picker_carried`` reads them
+    back from the stored widget.
+    """
+    carried_ids = set(carried)
+    page_ids = {c.id for c in contacts}
     payload = {
         "contacts": [
             {
@@ -34,30 +54,62 @@ def build_contact_picker(contacts: List[Contact]) -> WidgetRoot:
                 "name": c.name,
                 "role": c.role,
                 "avatar_url": c.avatar_url or "https://i.pravatar.cc/162?u=" + c.id,
+                "checked": c.id in carried_ids,
             }
             for c in contacts
-        ]
+        ],
+        "query": query,
+        "offset": offset,
+        "prev_offset": max(offset - CONTACT_PAGE_SIZE, 0) if offset else None,
+        "next_offset": offset + len(contacts) if has_more else None,
+        # Contacts on this page are tracked by their checkboxes instead
+        "carried": [cid for cid in carried if cid not in page_ids],
     }
     return contact_picker_tmpl.build(payload)
 
 
-def build_time_picker(slots: List[Dict[str, Any]]) -> WidgetRoot:
-    return time_picker_tmpl.build({"slots": slots})
+def picker_carried(widget: WidgetRoot) -> list[str]:
+    """Contact IDs a stored contact picker carries over from other pages."""
+    pending = [widget.model_dump(exclude_none=True)]
+    while pending:
+        node = pending.pop()
+        if node.get("id") == "contact-pager":
+            for child in node.get("children", []):
+                action = child.get("onClickAction") or {}
+                if action.get("type") == "contacts.page":
+                    return list(action.get("payload", {}).get("carried", []))
+            return []
+        pending.extend(c for c in node.get("children", []) if isinstance(c, dict))
+    return []
+
+
+def build_time_picker(slots: List[TimeSlot]) -> WidgetRoot:
+    return time_picker_tmpl.build({"slots": [s.to_payload() for s in slots]})
 
 
 def build_invite_editor(
-    subject: str, 
-    agenda: str, 
-    location: str, 
-    attendees: str, 
-    time_str: str
+    subject: str,
+    agenda: str,
+    location: str,
+    attendees: str,
+    time_str: str,
+    start_time: str,
+    end_time: str,
 ) -> WidgetRoot:
+    """
+    ``time_str`` is the label shown; ``start_time``/``end_time`` are the ISO
+    times the meeting is booked at when the form is sent.
+    """
     payload = {
         "subject": subject,
         "agenda": agenda,
         "location": location,
         "attendees": attendees,
         "time_str": time_str,
+        "start_time": start_time,
+        "end_time": end_time,
+        # Sent back with invite.send so a retried submit doesn't double-book
+        "idempotency_key": uuid.uuid4().hex,
     }
     return invite_editor_tmpl.build(payload)
 
@@ -0,0 +1,104 @@
+"""
+Minimal widget updates.
+
+``diff_widgets`` compares the widget a client already shows with its next
+state and returns the smallest set of replacements ChatKit can express:
+whole components addressed by ``id`` (``widget.component.updated``) or, when
+a change isn't contained in an addressable component, the whole root
+(``widget.root.updated``). Each patch also carries its JSON path inside the
+stored item so the store can rewrite just that subtree.
+
+Templates opt in by giving independently-changing components an ``id``.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from chatkit.types import WidgetComponentUpdated, WidgetItem, WidgetRootUpdated
+from chatkit.widgets import WidgetRoot
+from pydantic import TypeAdapter
+
+JsonPath = tuple[str | int, ...]
+
+# Same validation a widget goes through when its item is loaded from the store
+stored_widget_adapter = TypeAdapter(WidgetItem.model_fields["widget"].annotation)
+
+
+@dataclass(slots=True)
+class WidgetPatch:
+    path: JsonPath  # relative to the widget root; () is the root itself
+    component_id: str | None
+    value: dict[str, Any]  # JSON-ready replacement, as the store serializes it
+
+    def to_update(self, widget: WidgetRoot) -> WidgetComponentUpdated | WidgetRootUpdated:
+        if self.component_id is None:
+            return WidgetRootUpdated(widget=widget)
+        return WidgetComponentUpdated(
+            component_id=self.component_id, component=_component_at(widget, self.path)
+        )
+
+
+def diff_widgets(before: WidgetRoot, after: WidgetRoot) -> list[WidgetPatch]:
+    old = _stored_form(before)
+    new = _stored_form(after)
+    patches = _diff(old, new, ())
+    if patches is None:
+        return [WidgetPatch((), None, new)]
+    return patches
+
+
+def _stored_form(widget: WidgetRoot) -> dict[str, Any]:
+    # Freshly built widgets are dynamic components while stored ones reload
+    # as typed components with defaults filled in; compare them as stored
+    data = widget.model_dump(mode="json", exclude_none=True)
+    return stored_widget_adapter.validate_python(data).model_dump(
+        mode="json", exclude_none=True
+    )
+
+
+def _diff(before: Any, after: Any, path: JsonPath) -> list[WidgetPatch] | None:
+    """
+    Patches for addressable descendants, or None when the change can only be
+    expressed by replacing an ancestor.
+    """
+    if before == after:
+        return []
+    if not (isinstance(before, dict) and isinstance(after, dict)):
+        return None
+    if before.keys() != after.keys() or before.get("type") != after.get("type"):
+        return None
+
+    patches: list[WidgetPatch] = []
+    for key, old in before.items():
+        new = after[key]
+        if old == new:
+            continue
+        if key != "children" or not isinstance(old, list) or len(old) != len(new):
+            return None
+        for index, (old_child, new_child) in enumerate(zip(old, new)):
+            if old_child == new_child:
+                continue
+            child_path = (*path, "children", index)
+            child_patches = _diff(old_child, new_child, child_path)
+            if child_patches is None:
+                component_id = _stable_id(old_child, new_child)
+                if component_id is None:
+                    return None
+                child_patches = [WidgetPatch(child_path, component_id, new_child)]
+            patches.extend(child_patches)
+    return patches
+
+
+def _stable_id(before: Any, after: Any) -> str | None:
+    if isinstance(before, dict) and isinstance(after, dict):
+        component_id = before.get("id")
+        if component_id and component_id == after.get("id"):
+            return component_id
+    return None
+
+
+def _component_at(widget: WidgetRoot, path: JsonPath) -> Any:
+    node: Any = widget
+    for step in path:
+        node = node[step] if isinstance(step, int) else getattr(node, step)
+    return node
@@ -0,0 +1,98 @@
+"""
+Tail latency for well-behaved users while one client floods /chatkit.
+
+    python -m benchmarks.admission [--duration 5] [--noisy 50] [--users 10]
+
+The downstream (model quota + DB writer) is simulated as a fixed number of
+slots with a fixed service time. Without admission control every request
+queues for those slots, so the flood sets everyone's latency; with it the
+noisy user is cut off with 429s and the rest stay close to the service time.
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.admission import AdmissionController, AdmissionRejected
+
+SERVICE_TIME = 0.05
+CAPACITY = 8
+
+
+async def _simulate(
+    admission: AdmissionController | None,
+    duration: float,
+    noisy: int,
+    users: int,
+) -> tuple[list[float], int, int]:
+    downstream = asyncio.Semaphore(CAPACITY)
+    deadline = time.perf_counter() + duration
+    latencies: list[float] = []
+    rejected = {"noisy": 0, "good": 0}
+
+    async def request(user_id: str) -> float | None:
+        start = time.perf_counter()
+        ticket = None
+        if admission is not None:
+            try:
+                ticket = await admission.acquire(user_id)
+            except AdmissionRejected:
+                return None
+        try:
+            async with downstream:
+                await asyncio.sleep(SERVICE_TIME)
+        finally:
+            if ticket is not None:
+                ticket.release()
+        return time.perf_counter() - start
+
+    async def noisy_client() -> None:
+        while time.perf_counter() < deadline:
+            if await request("noisy") is None:
+                rejected["noisy"] += 1
+                await asyncio.sleep(0.001)
+
+    async def good_client(index: int) -> None:
+        while time.perf_counter() < deadline:
+            latency = await request(f"user{index}")
+            if latency is None:
+                rejected["good"] += 1
+            else:
+                latencies.append(latency)
+            await asyncio.sleep(0.5)
+
+    await asyncio.gather(
+        *(noisy_client() for _ in range(noisy)),
+        *(good_client(i) for i in range(users)),
+    )
+    return latencies, rejected["noisy"], rejected["good"]
+
+
+def _report(label: str, latencies: list[float], noisy: int, good: int) -> None:
+    latencies.sort()
+    p = lambda q: latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1000
+    print(
+        f"{label:<18} well-behaved p50 {p(0.5):7.1f} ms  p99 {p(0.99):7.1f} ms"
+        f"  | 429s noisy {noisy}, well-behaved {good}"
+    )
+
+
+async def _run(duration: float, noisy: int, users: int) -> None:
+    _report("no admission", *await _simulate(None, duration, noisy, users))
+    admission = AdmissionController(
+        rate_per_minute=120, burst=10, max_per_user=2, max_inflight=CAPACITY
+    )
+    _report("admission", *await _simulate(admission, duration, noisy, users))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--noisy", type=int, default=50)
+    parser.add_argument("--users", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(_run(args.duration, args.noisy, args.users))
+
+
+if __name__ == "__main__":
+    main()
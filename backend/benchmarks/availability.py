@@ -0,0 +1,172 @@
+"""
+Common free slots: 15-minute bitmaps vs naive interval merging.
+
+    python -m benchmarks.availability [--runs 20]
+
+Attendees and their busy time come from app.store.fixtures, moved into
+one time zone (``--timezone``) so that large groups still share some
+working hours instead of short-circuiting on an empty overlap. The naive version builds each attendee's
+working-hour intervals, subtracts their merged busy intervals and
+intersects the interval lists pairwise; the bitmap version is
+app.availability.find_common_slots, timed with a cold and a warm
+working-hours cache. Both return the same slots.
+"""
+
+import argparse
+import time
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from typing import List, Sequence, Tuple
+
+from app.availability import (
+    SLOT,
+    Calendar,
+    _parse,
+    _zone,
+    find_common_slots,
+    horizon,
+    working_day_mask,
+)
+from app.store.fixtures import EPOCH, FixtureSpec, generate_user
+
+Interval = Tuple[datetime, datetime]
+
+
+def _calendars(attendees: int, tz: str) -> List[Calendar]:
+    spec = FixtureSpec(users=attendees, contacts_per_user=3, events_per_user=60, threads_per_user=0)
+    calendars = []
+    for index in range(attendees):
+        fixture = generate_user(spec, index)
+        calendars.append(
+            (replace(fixture.profile, timezone=tz), [(e.start_time, e.end_time) for e in fixture.events])
+        )
+    return calendars
+
+
+def _working_intervals(profile, start: datetime, end: datetime) -> List[Interval]:
+    zone = _zone(profile.timezone)
+    intervals = []
+    day = start.astimezone(zone).date() - timedelta(days=1)
+    while day <= end.astimezone(zone).date():
+        if str(day.weekday()) in profile.weekdays:
+            midnight = datetime(day.year, day.month, day.day, tzinfo=zone)
+            open_at = (midnight + timedelta(minutes=profile.day_start)).astimezone(timezone.utc)
+            close_at = (midnight + timedelta(minutes=profile.day_end)).astimezone(timezone.utc)
+            if close_at > start and open_at < end:
+                intervals.append((max(open_at, start), min(close_at, end)))
+        day += timedelta(days=1)
+    return intervals
+
+
+def _merge(intervals: List[Interval]) -> List[Interval]:
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _subtract(free: List[Interval], busy: List[Interval]) -> List[Interval]:
+    result, j = [], 0
+    for start, end in free:
+        while j < len(busy) and busy[j][1] <= start:
+            j += 1
+        k, cursor = j, start
+        while k < len(busy) and busy[k][0] < end:
+            if busy[k][0] > cursor:
+                result.append((cursor, busy[k][0]))
+            cursor = max(cursor, busy[k][1])
+            k += 1
+        if cursor < end:
+            result.append((cursor, end))
+    return result
+
+
+def _intersect(a: List[Interval], b: List[Interval]) -> List[Interval]:
+    result, i, j = [], 0, 0
+    while i < len(a) and j < len(b):
+        start, end = max(a[i][0], b[j][0]), min(a[i][1], b[j][1])
+        if start < end:
+            result.append((start, end))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def naive_common_slots(
+    calendars: Sequence[Calendar], duration_minutes: int, now: datetime, days: int,
+    limit: int = 3, per_day: int = 2,
+) -> List[datetime]:
+    origin, end = horizon(now, days)
+    # Same slot grid as the bitmaps: busy time rounds outwards, starts upwards
+    first = origin + -(-(now - origin) // SLOT) * SLOT
+    common = [(first, end)]
+    for profile, intervals in calendars:
+        busy = []
+        for busy_start, busy_end in intervals:
+            s, e = _parse(busy_start), _parse(busy_end)
+            if s is None or e is None:
+                continue
+            s = origin + ((s - origin) // SLOT) * SLOT
+            e = origin + -(-(e - origin) // SLOT) * SLOT
+            busy.append((s, e))
+        free = _subtract(_working_intervals(profile, origin, end), _merge(busy))
+        common = _intersect(common, free)
+        if not common:
+            return []
+
+    length = timedelta(minutes=-(-duration_minutes // 15) * 15)
+    found, day_counts = [], {}
+    for start, stop in common:
+        # Snap to the slot grid, as working hours may open off-grid
+        cursor = origin + -(-(start - origin) // SLOT) * SLOT
+        while cursor + length <= stop and len(found) < limit:
+            day = (cursor - origin).days
+            if day_counts.get(day, 0) >= per_day:
+                cursor = origin + timedelta(days=day + 1)
+                continue
+            day_counts[day] = day_counts.get(day, 0) + 1
+            found.append(cursor)
+            cursor += length
+    return found
+
+
+def _time(fn, runs: int, cold: bool = False) -> Tuple[float, List[datetime]]:
+    total = 0.0
+    for _ in range(runs):
+        if cold:
+            working_day_mask.cache_clear()
+        start = time.perf_counter()
+        result = fn()
+        total += time.perf_counter() - start
+    return total / runs * 1000, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--timezone", default="Europe/Berlin")
+    args = parser.parse_args()
+
+    now = EPOCH + timedelta(hours=6)
+    print(f"{'attendees':>9} {'days':>5} {'naive ms':>9} {'bitmap cold':>12} {'bitmap warm':>12}")
+    for attendees in (2, 10, 50, 200):
+        calendars = _calendars(attendees, args.timezone)
+        for days in (5, 30, 90):
+            naive_ms, expected = _time(
+                lambda: naive_common_slots(calendars, 30, now, days), args.runs
+            )
+            cold_ms, got = _time(
+                lambda: find_common_slots(calendars, 30, now, days), args.runs, cold=True
+            )
+            warm_ms, _ = _time(lambda: find_common_slots(calendars, 30, now, days), args.runs)
+            assert got == expected, (attendees, days, got, expected)
+            print(f"{attendees:>9} {days:>5} {naive_ms:>9.2f} {cold_ms:>12.2f} {warm_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
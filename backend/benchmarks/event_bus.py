@@ -0,0 +1,137 @@
+"""
+Following a thread from other tabs: polling the store vs the event bus.
+
+    python -m benchmarks.event_bus [--events 500] [--redis redis://localhost:6379/0]
+
+For 1, 10 and 100 followers of one thread this compares one polling
+round (every follower reloads the latest 20 items, as a tab without
+the bus would) with fanning one serialized event out to all of them.
+"stalled" adds a follower that never reads: once more than
+EVENT_BUFFER_SIZE events are published its buffer fills and it is cut
+off ("cut off" counts these), and the publisher's cost per event stays
+the same. With ``--redis`` the same run goes through RedisEventBus,
+including the broker round trip.
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from chatkit.types import AssistantMessageContentPartTextDelta, ThreadItemUpdatedEvent
+
+from app.events import EventBus, RedisEventBus
+from app.store.backends import SqliteBackend
+from app.store.chat_store import ChatStore
+from app.store.fixtures import FixtureSpec, load_fixtures
+from app.types import RequestContext
+
+THREAD = "thr_user0_0"
+
+
+def _payload() -> bytes:
+    # A token delta, the bulk of a model stream
+    event = ThreadItemUpdatedEvent(
+        item_id="msg_bench",
+        update=AssistantMessageContentPartTextDelta(content_index=0, delta="available "),
+    )
+    # Serialized the way ChatKitServer writes SSE events
+    return event.model_dump_json(
+        by_alias=True, exclude_none=True, context={"exclude_metadata": True}
+    ).encode()
+
+
+async def _poll_ms(store: ChatStore, followers: int, runs: int) -> float:
+    context = RequestContext(user_id="user0")
+    start = time.perf_counter()
+    for _ in range(runs):
+        for _ in range(followers):
+            await store.load_thread_items(THREAD, None, 20, "desc", context)
+    return (time.perf_counter() - start) / runs * 1000
+
+
+async def _fan_out(bus: EventBus, followers: int, events: int, stalled: bool) -> tuple[float, float]:
+    """Publisher ms per event, and ms until every follower has every event."""
+    payload = _payload()
+    async with asyncio.TaskGroup() as group:
+        done = []
+
+        async def follow(ready: asyncio.Event) -> None:
+            async with bus.subscribe(THREAD) as subscription:
+                ready.set()
+                for _ in range(events):
+                    await subscription.get()
+            done.append(time.perf_counter())
+
+        async def stall(ready: asyncio.Event, finished: asyncio.Event) -> None:
+            async with bus.subscribe(THREAD):
+                ready.set()
+                await finished.wait()
+
+        finished = asyncio.Event()
+        readies = [asyncio.Event() for _ in range(followers)]
+        for ready in readies:
+            group.create_task(follow(ready))
+        if stalled:
+            readies.append(asyncio.Event())
+            group.create_task(stall(readies[-1], finished))
+        for ready in readies:
+            await ready.wait()
+        if isinstance(bus, RedisEventBus):
+            # Let the broker subscription settle before publishing
+            await asyncio.sleep(0.2)
+
+        start = time.perf_counter()
+        publish = 0.0
+        for n in range(events):
+            tick = time.perf_counter()
+            bus.publish(THREAD, payload)
+            publish += time.perf_counter() - tick
+            if n % 64 == 0:
+                # Followers read while the stream is still going
+                await asyncio.sleep(0)
+        while len(done) < followers:
+            await asyncio.sleep(0.001)
+        finished.set()
+    return publish / events * 1000, (max(done) - start) * 1000
+
+
+async def _run(events: int, runs: int, redis_url: str | None) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = SqliteBackend(Path(tmp) / "bench.db", pool_size=1)
+        await backend.init_schema()
+        await load_fixtures(FixtureSpec(users=1, items_per_thread=40), backend)
+        store = ChatStore(backend)
+
+        buses = {"memory": EventBus()}
+        if redis_url:
+            buses["redis"] = RedisEventBus(redis_url)
+            await buses["redis"].start()
+
+        print(f"{'bus':<7} {'followers':>9} {'poll round ms':>14} {'publish us/event':>17}"
+              f" {'stalled us/event':>17} {'all delivered ms':>17} {'cut off':>8}")
+        for followers in (1, 10, 100):
+            poll = await _poll_ms(store, followers, runs)
+            for name, bus in buses.items():
+                overflows = bus.overflows
+                publish, delivered = await _fan_out(bus, followers, events, stalled=False)
+                stalled, _ = await _fan_out(bus, followers, events, stalled=True)
+                print(f"{name:<7} {followers:>9} {poll:>14.2f} {publish * 1000:>17.2f}"
+                      f" {stalled * 1000:>17.2f} {delivered:>17.2f} {bus.overflows - overflows:>8}")
+        for bus in buses.values():
+            await bus.close()
+        await backend.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--redis", default=None, help="Also run against this Redis URL")
+    args = parser.parse_args()
+    asyncio.run(_run(args.events, args.runs, args.redis))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Event import throughput: one create_event call per event versus the bulk
+create_events path.
+
+    python -m benchmarks.events_import [--rows 100000] [--single-rows 2000]
+
+Runs against a throwaway SQLite file. The per-event path opens, checks and
+commits once per event, so it is measured on a smaller sample.
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from app.store.backends import SqliteBackend
+from app.types import EventRecord
+
+
+def _events(n: int, prefix: str) -> list[EventRecord]:
+    return [
+        EventRecord(
+            id=f"{prefix}{i}",
+            organizer_id=f"user{i % 100}",
+            subject=f"Sync {i}",
+            start_time=f"2026-01-01T{i % 24:02}:00:{i % 60:02}.{i:06}",
+            end_time=f"2026-01-01T{i % 24:02}:00:{i % 60:02}.{i:06}",
+            attendees="Bob Manager, Charlie Designer",
+            location="Zoom",
+            agenda="",
+        )
+        for i in range(n)
+    ]
+
+
+async def _run(rows: int, single_rows: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = SqliteBackend(Path(tmp) / "bench.db")
+        await backend.init_schema()
+
+        events = _events(single_rows, "single")
+        start = time.perf_counter()
+        for event in events:
+            await backend.create_event(event)
+        elapsed = time.perf_counter() - start
+        print(f"create_event x{single_rows:<8} {single_rows / elapsed:12,.0f} events/s")
+
+        events = _events(rows, "bulk")
+        start = time.perf_counter()
+        await backend.insert_events(events)
+        elapsed = time.perf_counter() - start
+        print(f"insert_events x{rows:<7} {rows / elapsed:12,.0f} events/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--single-rows", type=int, default=2_000)
+    args = parser.parse_args()
+    asyncio.run(_run(args.rows, args.single_rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+.ics import throughput and peak memory.
+
+    python -m benchmarks.ics_import [--events 100000]
+
+Writes a synthetic calendar to a temp dir, imports it into a throwaway
+SQLite file and reports events/sec. Peak traced memory should stay flat as
+--events grows, since the file is parsed and inserted in batches.
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import app.database as database
+from app.store.backends import SqliteBackend
+from app.store.ics import import_ics
+
+
+def write_calendar(path: Path, events: int) -> None:
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//bench//EN\r\n")
+        for i in range(events):
+            dtstart = start + timedelta(minutes=30 * i)
+            dtend = dtstart + timedelta(minutes=30)
+            f.write(
+                "BEGIN:VEVENT\r\n"
+                f"UID:bench-{i}@example.com\r\n"
+                f"DTSTART:{dtstart:%Y%m%dT%H%M%SZ}\r\n"
+                f"DTEND:{dtend:%Y%m%dT%H%M%SZ}\r\n"
+                f"SUMMARY:Weekly sync {i}\r\n"
+                "LOCATION:Zoom\r\n"
+                "DESCRIPTION:Agenda line one\\nAgenda line two that is long enough\r\n"
+                "  to be folded onto a continuation line\r\n"
+                'ATTENDEE;CN="Bob Manager":mailto:bob@example.com\r\n'
+                'ATTENDEE;CN="Charlie Designer":mailto:charlie@example.com\r\n'
+                "END:VEVENT\r\n"
+            )
+        f.write("END:VCALENDAR\r\n")
+
+
+async def _run(events: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.ics"
+        write_calendar(path, events)
+        database._backend = SqliteBackend(Path(tmp) / "bench.db")
+        await database._backend.init_schema()
+
+        start = time.perf_counter()
+        with open(path, encoding="utf-8", newline="") as f:
+            count = (await import_ics(f, "alice")).imported
+        elapsed = time.perf_counter() - start
+
+        # Second pass under tracemalloc (which skews timings); the rows are
+        # already there, so this measures parse + duplicate-skipping inserts
+        tracemalloc.start()
+        with open(path, encoding="utf-8", newline="") as f:
+            await import_ics(f, "alice")
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        size = path.stat().st_size / 2**20
+        print(f"{count} events ({size:.1f} MiB) in {elapsed:.1f}s")
+        print(f"{count / elapsed:,.0f} events/s, peak traced memory {peak / 2**20:.1f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=100_000)
+    args = parser.parse_args()
+    asyncio.run(_run(args.events))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Memory/time cost of turning 100k DB rows into hot-path objects.
+
+    python -m benchmarks.records [--rows 100000]
+
+Compares the old representations (pydantic ``Contact(**dict(row))``, plain
+``dict(row)`` events and dict slots) with the slotted records in app.types.
+"""
+
+import argparse
+import sqlite3
+import time
+import tracemalloc
+
+from app.store.backends.base import CONTACT_COLUMNS, EVENT_COLUMNS
+from app.types import Contact, ContactRecord, EventRecord, TimeSlot
+
+
+def _placeholders(record) -> str:
+    return ", ".join(["?"] * len(record.__slots__))
+
+
+def _rows(n: int):
+    db = sqlite3.connect(":memory:")
+    db.row_factory = sqlite3.Row
+    db.execute(f"CREATE TABLE contacts ({CONTACT_COLUMNS})")
+    db.execute(f"CREATE TABLE events ({EVENT_COLUMNS})")
+    db.executemany(
+        f"INSERT INTO contacts ({CONTACT_COLUMNS}) VALUES ({_placeholders(ContactRecord)})",
+        (
+            (f"c{i}", "alice", f"Name {i}", f"user{i}@example.com", "Engineer", None)
+            for i in range(n)
+        ),
+    )
+    db.executemany(
+        f"INSERT INTO events ({EVENT_COLUMNS}) VALUES ({_placeholders(EventRecord)})",
+        (
+            (f"e{i}", "alice", f"Sync {i}", "2026-01-01T10:00", "2026-01-01T11:00",
+             "Bob, Charlie", "Zoom", "", "confirmed", None)
+            for i in range(n)
+        ),
+    )
+    contacts = db.execute(f"SELECT {CONTACT_COLUMNS} FROM contacts").fetchall()
+    events = db.execute(f"SELECT {EVENT_COLUMNS} FROM events").fetchall()
+    return contacts, events
+
+
+def _measure(label: str, build) -> None:
+    # Time and memory are taken on separate runs; tracemalloc skews timings
+    start = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(f"{label:<34} {elapsed * 1000:9.1f} ms {size / 2**20:9.1f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    contacts, events = _rows(args.rows)
+    print(f"{args.rows} rows{'':<24} {'time':>12} {'retained':>13}")
+
+    _measure("contacts: Contact(**dict(row))", lambda: [Contact(**dict(r)) for r in contacts])
+    _measure("contacts: ContactRecord(*row)", lambda: [ContactRecord(*r) for r in contacts])
+    _measure("events: dict(row)", lambda: [dict(r) for r in events])
+    _measure("events: EventRecord(*row)", lambda: [EventRecord(*r) for r in events])
+    _measure(
+        "slots: dict",
+        lambda: [
+            {"id": f"slot_{i}", "time_label": "Today", "duration": "1 hour", "conflict": False}
+            for i in range(args.rows)
+        ],
+    )
+    _measure(
+        "slots: TimeSlot",
+        lambda: [TimeSlot(f"slot_{i}", "Today", "1 hour", False) for i in range(args.rows)],
+    )
+
+
+if __name__ == "__main__":
+    main()
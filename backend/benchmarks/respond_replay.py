@@ -0,0 +1,76 @@
+"""
+Server overhead of respond() with the model replayed from a cassette.
+
+    MODEL_CASSETTE_DIR=cassettes python -m benchmarks.respond_replay \
+        [--runs 200] [--concurrency 10] [--speed 0]
+
+Record a cassette first by running the server with MODEL_MODE=record.
+With --speed 0 the model adds no latency, so the timings are the cost of
+the agent runner, store, tools and widget rendering alone.
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from chatkit.types import ThreadMetadata
+
+import app.agents.models as models
+import app.database as database
+from app.server import MeetingSchedulerServer
+from app.store.app_store import init_db, seed_db
+from app.store.backends import SqliteBackend
+from app.types import RequestContext
+
+
+async def _one(server: MeetingSchedulerServer, index: int) -> float:
+    context = RequestContext(user_id="alice")
+    thread = ThreadMetadata(id=f"thr_bench_{index}", created_at=datetime.now())
+    await server.store.save_thread(thread, context)
+    start = time.perf_counter()
+    async for _ in server.respond(thread, None, context):
+        pass
+    return time.perf_counter() - start
+
+
+async def _run(runs: int, concurrency: int, speed: float) -> None:
+    models.model_provider = models.SchedulerModelProvider("replay", speed=speed)
+    with tempfile.TemporaryDirectory() as tmp:
+        database._backend = SqliteBackend(Path(tmp) / "bench.db")
+        await init_db()
+        await seed_db()
+        server = MeetingSchedulerServer()
+        limit = asyncio.Semaphore(concurrency)
+
+        async def bounded(index: int) -> float:
+            async with limit:
+                return await _one(server, index)
+
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(bounded(i) for i in range(runs)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p = lambda q: latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1000
+    print(f"{runs} runs, concurrency {concurrency}: {runs / elapsed:.1f} runs/s")
+    print(
+        f"latency ms  p50 {p(0.5):.1f}  p95 {p(0.95):.1f}  p99 {p(0.99):.1f}"
+        f"  mean {statistics.mean(latencies) * 1000:.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--speed", type=float, default=0.0)
+    args = parser.parse_args()
+    asyncio.run(_run(args.runs, args.concurrency, args.speed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Write throughput by shard count, and what one heavy tenant costs the rest.
+
+    python -m benchmarks.sharding [--writers 64] [--seconds 3]
+
+``--writers`` tasks add items to their users' threads as fast as they
+can, for 1, 2, 4 and 8 SQLite shards (pool of 4 connections per shard,
+as with DB_SHARDS). Half of the writers belong to one heavy user; the
+rest are spread over 200 others. Reported: total writes/s and p50/p95
+latency of the other users' writes. SQLite serializes writers per file,
+so throughput scales with shards only as far as the box has cores for
+the per-connection threads.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from chatkit.types import AssistantMessageContent, AssistantMessageItem
+
+from app.store.backends import ShardedBackend, SqliteBackend
+from app.store.fixtures import FixtureSpec, load_fixtures
+
+USERS = 201
+HEAVY = "user0"
+
+
+def _item(thread_id: str, n: int) -> tuple[str, str, str]:
+    created_at = datetime(2026, 6, 1, tzinfo=timezone.utc) + timedelta(microseconds=n)
+    item = AssistantMessageItem(
+        id=f"msg_{thread_id}_w{n}",
+        thread_id=thread_id,
+        created_at=created_at,
+        content=[AssistantMessageContent(text="Here are the best available slots.")],
+    )
+    return item.id, created_at.isoformat(), item.model_dump_json()
+
+
+async def _writer(backend, user_id: str, seq, deadline: float, latencies: list | None) -> int:
+    thread_id = f"thr_{user_id}_0"
+    writes = 0
+    while time.perf_counter() < deadline:
+        item_id, created_at, data = _item(thread_id, next(seq))
+        start = time.perf_counter()
+        await backend.add_thread_item(item_id, thread_id, user_id, created_at, data)
+        if latencies is not None:
+            latencies.append(time.perf_counter() - start)
+        writes += 1
+    return writes
+
+
+async def _run_shards(shards: int, writers: int, seconds: float) -> tuple[float, float, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = ShardedBackend(
+            [SqliteBackend(Path(tmp) / f"shard{i}.db", pool_size=4) for i in range(shards)]
+        )
+        await backend.init_schema()
+        await load_fixtures(
+            FixtureSpec(users=USERS, contacts_per_user=0, events_per_user=0,
+                        threads_per_user=1, items_per_thread=0),
+            backend,
+        )
+
+        seq = iter(range(10**9))
+        latencies: list[float] = []
+        deadline = time.perf_counter() + seconds
+        tasks = []
+        for n in range(writers):
+            if n % 2 == 0:
+                tasks.append(_writer(backend, HEAVY, seq, deadline, None))
+            else:
+                user = f"user{1 + n // 2 % (USERS - 1)}"
+                tasks.append(_writer(backend, user, seq, deadline, latencies))
+        writes = sum(await asyncio.gather(*tasks))
+        await backend.close()
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p95 = latencies[int(len(latencies) * 0.95)] * 1000
+    return writes / seconds, p50, p95
+
+
+async def _run(writers: int, seconds: float) -> None:
+    print(f"{os.cpu_count()} cores, {writers} writers")
+    print(f"{'shards':>6} {'writes/s':>9} {'others p50 ms':>14} {'others p95 ms':>14}")
+    for shards in (1, 2, 4, 8):
+        rate, p50, p95 = await _run_shards(shards, writers, seconds)
+        print(f"{shards:>6} {rate:>9.0f} {p50:>14.2f} {p95:>14.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+    asyncio.run(_run(args.writers, args.seconds))
+
+
+if __name__ == "__main__":
+    main()
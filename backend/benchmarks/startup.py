@@ -0,0 +1,66 @@
+"""
+Cost of the lifespan's init_db + seed_db on an already-populated database.
+
+    python -m benchmarks.startup [--users 20000] [--runs 50]
+
+Loads a synthetic dataset with app.store.fixtures, then times startup with
+the schema-version fast check (warm) against the full DDL pass every start
+used to run (forced by resetting ``user_version``).
+"""
+
+import argparse
+import asyncio
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import app.database as database
+from app.store.app_store import init_db, seed_db
+from app.store.backends import SqliteBackend
+from app.store.fixtures import FixtureSpec, load_fixtures
+
+
+async def _startup_ms(path: Path, runs: int, reset_version: bool) -> float:
+    total = 0.0
+    for _ in range(runs):
+        if reset_version:
+            with sqlite3.connect(path) as conn:
+                conn.execute("PRAGMA user_version = 0")
+        # A fresh backend per run, as after a worker restart
+        database._backend = SqliteBackend(path)
+        start = time.perf_counter()
+        await init_db()
+        await seed_db()
+        total += time.perf_counter() - start
+        await database.close_backend()
+    return total / runs * 1000
+
+
+async def _run(users: int, runs: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        backend = SqliteBackend(path)
+        await backend.init_schema()
+        start = time.perf_counter()
+        counts = await load_fixtures(FixtureSpec(users=users), backend)
+        elapsed = time.perf_counter() - start
+        rows = sum(counts.values())
+        print(f"fixtures: {rows:,} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)")
+
+        full = await _startup_ms(path, runs, reset_version=True)
+        warm = await _startup_ms(path, runs, reset_version=False)
+        print(f"startup, full schema pass  {full:8.2f} ms")
+        print(f"startup, version fast path {warm:8.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(_run(args.users, args.runs))
+
+
+if __name__ == "__main__":
+    main()
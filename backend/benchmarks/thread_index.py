@@ -0,0 +1,100 @@
+"""
+History sidebar: thread JSON blobs vs the listing columns and FTS index.
+
+    python -m benchmarks.thread_index [--threads 10000] [--runs 50]
+
+One user with ``--threads`` threads from app.store.fixtures, on SQLite.
+Listing compares the previous path (select every ``data`` blob ordered by
+``created_at``, validate each into ThreadMetadata, OFFSET for later pages)
+with ``ChatStore.load_threads`` over ``(updated_at, id)`` keyset pages.
+Search compares ``LIKE`` over the thread and item JSON with
+``ChatStore.search_threads`` over the FTS5 tables.
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from chatkit.types import ThreadMetadata
+
+from app.store.backends import SqliteBackend
+from app.store.chat_store import ChatStore
+from app.store.fixtures import FixtureSpec, load_fixtures
+from app.types import RequestContext
+
+PAGE = 20
+
+
+async def _blob_page(backend: SqliteBackend, user_id: str, offset: int) -> list:
+    async with backend.connection() as db:
+        async with db.execute(
+            "SELECT data FROM threads WHERE user_id = ? ORDER BY created_at DESC LIMIT ? OFFSET ?",
+            (user_id, PAGE, offset),
+        ) as cursor:
+            rows = await cursor.fetchall()
+    return [ThreadMetadata.model_validate_json(row[0]) for row in rows]
+
+
+async def _blob_search(backend: SqliteBackend, user_id: str, query: str) -> list:
+    pattern = f"%{query}%"
+    async with backend.connection() as db:
+        async with db.execute(
+            """
+            SELECT id FROM threads WHERE user_id = ? AND data LIKE ?
+            UNION
+            SELECT thread_id FROM items WHERE user_id = ? AND data LIKE ?
+            LIMIT ?
+            """,
+            (user_id, pattern, user_id, pattern, PAGE),
+        ) as cursor:
+            return await cursor.fetchall()
+
+
+async def _index_page(store: ChatStore, context: RequestContext, pages: int) -> list:
+    page, after = None, None
+    for _ in range(pages):
+        page = await store.load_threads(PAGE, after, "desc", context)
+        after = page.after
+    return page.data
+
+
+async def _ms(fn, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        await fn()
+    return (time.perf_counter() - start) / runs * 1000
+
+
+async def _run(threads: int, runs: int) -> None:
+    context = RequestContext(user_id="user0")
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = SqliteBackend(Path(tmp) / "bench.db", pool_size=1)
+        await backend.init_schema()
+        await load_fixtures(FixtureSpec(users=1, threads_per_user=threads), backend)
+        store = ChatStore(backend)
+
+        print(f"{'query':<18} {'blob ms':>9} {'index ms':>9}")
+        for pages in (1, 5):
+            blob = await _ms(lambda: _blob_page(backend, "user0", (pages - 1) * PAGE), runs)
+            # Keyset pages are walked from the first, as the sidebar scrolls
+            index = await _ms(lambda: _index_page(store, context, pages), runs) / pages
+            print(f"{f'list page {pages}':<18} {blob:>9.2f} {index:>9.2f}")
+        for query in ("budget", "next week", "lisbon"):
+            blob = await _ms(lambda: _blob_search(backend, "user0", query), runs)
+            index = await _ms(lambda: store.search_threads(query, PAGE, context), runs)
+            print(f"{f'search {query!r}':<18} {blob:>9.2f} {index:>9.2f}")
+        await backend.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(_run(args.threads, args.runs))
+
+
+if __name__ == "__main__":
+    main()
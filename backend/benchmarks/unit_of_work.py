@@ -0,0 +1,115 @@
+"""
+Store calls of one /chatkit action: a connection per call vs one unit of work.
+
+    python -m benchmarks.unit_of_work [--runs 300]
+
+Replays the store traffic of a ``contacts.confirm`` action (resolve the
+contacts, lock the picker, add the hidden-context item, reload history for
+the agent, save its reply) against SQLite, unpooled and pooled, with each
+call taking its own connection and with the whole request inside
+``ChatStore.unit_of_work`` and the related writes inside ``transaction``.
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+
+from chatkit.types import (
+    AssistantMessageContent,
+    AssistantMessageItem,
+    HiddenContextItem,
+    WidgetItem,
+)
+
+from app.store.backends import SqliteBackend
+from app.store.chat_store import ChatStore
+from app.store.fixtures import FixtureSpec, load_fixtures
+from app.types import RequestContext
+from app.widgets.builders import build_contact_picker, build_selection_locked
+from app.widgets.patch import diff_widgets
+
+
+async def _action(store: ChatStore, context: RequestContext, n: int, grouped: bool) -> None:
+    thread_id = "thr_user0_0"
+    contacts = await store.backend.get_contacts_by_ids(
+        ["user0-c0", "user0-c1"], owner_id=context.user_id
+    )
+    async with store.transaction(context) if grouped else nullcontext():
+        picker = await store.load_item(thread_id, "wdg_bench", context)
+        patches = diff_widgets(
+            picker.widget, build_selection_locked("Attendees Confirmed", contacts[0].name)
+        )
+        await store.patch_widget_item(thread_id, picker.id, patches, context)
+        await store.add_thread_item(
+            thread_id,
+            HiddenContextItem(
+                id=f"hcx_{n}", thread_id=thread_id, created_at=datetime.now(), content="x"
+            ),
+            context,
+        )
+    await store.load_thread_items(thread_id, None, 20, "desc", context)
+    await store.add_thread_item(
+        thread_id,
+        AssistantMessageItem(
+            id=f"msg_bench_{n}",
+            thread_id=thread_id,
+            created_at=datetime.now(),
+            content=[AssistantMessageContent(text="Here are the best available slots.")],
+        ),
+        context,
+    )
+
+
+async def _setup(path: Path, pool_size: int, context: RequestContext) -> ChatStore:
+    backend = SqliteBackend(path, pool_size=pool_size)
+    await backend.init_schema()
+    await load_fixtures(FixtureSpec(users=1), backend)
+    store = ChatStore(backend)
+    picker = build_contact_picker(
+        await backend.search_contacts("user0", "", limit=10), "", 0, True
+    )
+    await store.add_thread_item(
+        "thr_user0_0",
+        WidgetItem(
+            id="wdg_bench", thread_id="thr_user0_0", created_at=datetime.now(), widget=picker
+        ),
+        context,
+    )
+    return store
+
+
+async def _request_ms(store: ChatStore, context: RequestContext, runs: int, pinned: bool) -> float:
+    start = time.perf_counter()
+    for n in range(runs):
+        async with store.unit_of_work(context) if pinned else nullcontext():
+            await _action(store, context, n, grouped=pinned)
+    return (time.perf_counter() - start) / runs * 1000
+
+
+async def _run(runs: int) -> None:
+    context = RequestContext(user_id="user0")
+    print(f"{'pool':>4} {'per call ms':>12} {'unit of work ms':>16}")
+    for pool_size in (0, 4):
+        with tempfile.TemporaryDirectory() as tmp:
+            # A fresh database per mode: history grows with every run
+            timings = []
+            for pinned in (False, True):
+                store = await _setup(Path(tmp) / f"{pinned}.db", pool_size, context)
+                timings.append(await _request_ms(store, context, runs, pinned))
+                await store.backend.close()
+            print(f"{pool_size:>4} {timings[0]:>12.2f} {timings[1]:>16.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=300)
+    args = parser.parse_args()
+    asyncio.run(_run(args.runs))
+
+
+if __name__ == "__main__":
+    main()
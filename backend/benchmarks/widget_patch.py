@@ -0,0 +1,111 @@
+"""
+Widget patches vs full item replacement: bytes on the wire and DB writes.
+
+    python -m benchmarks.widget_patch [--contacts 10] [--runs 500]
+
+For each transition (picker page -> next page, picker -> locked card) this
+compares the SSE payload of a ``thread.item.replaced`` event with the
+``thread.item.updated`` patches, and ``save_item`` (re-serialize and upsert
+the whole item) with ``patch_widget_item`` (rewrite only the changed paths).
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from chatkit.types import (
+    ThreadItemReplacedEvent,
+    ThreadItemUpdatedEvent,
+    ThreadMetadata,
+    WidgetItem,
+)
+
+from app.store.backends import SqliteBackend
+from app.store.chat_store import ChatStore
+from app.store.fixtures import FixtureSpec, generate_user
+from app.types import ContactRecord, RequestContext
+from app.widgets.builders import build_contact_picker, build_selection_locked
+from app.widgets.patch import diff_widgets
+
+
+def _wire_size(event) -> int:
+    # Serialized the way ChatKitServer writes SSE events
+    return len(
+        event.model_dump_json(
+            by_alias=True, exclude_none=True, context={"exclude_metadata": True}
+        )
+    )
+
+
+def _contacts(count: int, start: int) -> list[ContactRecord]:
+    contacts = generate_user(FixtureSpec(contacts_per_user=start + count), 0).contacts
+    return contacts[start:]
+
+
+async def _run(page_size: int, runs: int) -> None:
+    first = build_contact_picker(_contacts(page_size, 0), "", 0, True)
+    transitions = {
+        "next page": build_contact_picker(
+            _contacts(page_size, page_size), "", page_size, True
+        ),
+        "lock": build_selection_locked("Attendees Confirmed", "3 selected"),
+    }
+    context = RequestContext(user_id="alice")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ChatStore(SqliteBackend(Path(tmp) / "bench.db"))
+        await store.backend.init_schema()
+        thread = ThreadMetadata(id="thr_bench", created_at=datetime.now())
+        await store.save_thread(thread, context)
+        item = WidgetItem(
+            id="wdg_bench", thread_id=thread.id, created_at=datetime.now(), widget=first
+        )
+        await store.add_thread_item(thread.id, item, context)
+        item = await store.load_item(thread.id, item.id, context)
+
+        print(f"{'transition':<10} {'wire replaced':>14} {'wire patched':>13}"
+              f" {'db replaced':>12} {'db patched':>11} {'save ms':>8} {'patch ms':>9}")
+        for name, widget in transitions.items():
+            replaced = item.model_copy(update={"widget": widget})
+            patches = diff_widgets(item.widget, widget)
+
+            wire_full = _wire_size(ThreadItemReplacedEvent(item=replaced))
+            wire_patch = sum(
+                _wire_size(ThreadItemUpdatedEvent(item_id=item.id, update=p.to_update(widget)))
+                for p in patches
+            )
+            db_full = len(replaced.model_dump_json())
+            db_patch = sum(len(json.dumps(p.value)) for p in patches)
+
+            start = time.perf_counter()
+            for _ in range(runs):
+                await store.save_item(thread.id, replaced, context)
+            save_ms = (time.perf_counter() - start) / runs * 1000
+
+            start = time.perf_counter()
+            for _ in range(runs):
+                # Re-apply the same patch: same write size every iteration
+                await store.patch_widget_item(thread.id, item.id, patches, context)
+            patch_ms = (time.perf_counter() - start) / runs * 1000
+
+            # Put the original widget back for the next transition
+            await store.save_item(thread.id, item, context)
+
+            print(f"{name:<10} {wire_full:>12} B {wire_patch:>11} B"
+                  f" {db_full:>10} B {db_patch:>9} B {save_ms:>8.3f} {patch_ms:>9.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--contacts", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(_run(args.contacts, args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,41 @@
+import asyncio
+import io
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request, Response
+from fastapi import FastAPI, Request, Response, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from chatkit.server import StreamingResult
+from chatkit.store import NotFoundError
 
 from app.server import MeetingSchedulerServer
 from app.types import RequestContext
 from app.store.app_store import init_db, seed_db
+from app.database import close_backend
+from app.store.ics import export_ics, import_ics
+from app.admission import AdmissionRejected, admission
+from app.metrics import render_metrics
+from app.monitoring import create_loop_monitor
+from app.offload import shutdown_executor
+from app.events import EVENT_KEEPALIVE, create_event_bus
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    if loop_monitor:
+        loop_monitor.start()
     await init_db()
     await seed_db()
+    await server.events.start()
     yield
     # Shutdown
+    await server.events.close()
+    await close_backend()
+    shutdown_executor()
+    if loop_monitor:
+        await loop_monitor.stop()
+
+loop_monitor = create_loop_monitor()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -27,7 +47,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-server = MeetingSchedulerServer()
+server = MeetingSchedulerServer(events=create_event_bus())
 
 
 @app.post("/chatkit")
@@ -37,12 +57,138 @@ async def chatkit_endpoint(request: Request):
     context = RequestContext(user_id=user_id)
 
     body = await request.body()
-    result = await server.process(body, context)
+    # Non-streaming requests (thread lists, item pages) run in process() and
+    # are cheap, so they skip admission; streaming ones only start their
+    # agent run once the response is iterated
+    async with server.store.unit_of_work(context):
+        result = await server.process(body, context)
+
+    if not isinstance(result, StreamingResult):
+        return Response(content=result.json, media_type="application/json")
+
+    try:
+        ticket = await admission.acquire(user_id)
+    except AdmissionRejected as e:
+        await result.json_events.aclose()
+        return JSONResponse(
+            {"error": e.reason},
+            status_code=429,
+            headers={"Retry-After": str(max(1, round(e.retry_after)))},
+        )
+    return AdmittedStreamingResponse(
+        _release_when_done(result, ticket, context),
+        ticket,
+        media_type="text/event-stream",
+    )
+
+
+class AdmittedStreamingResponse(StreamingResponse):
+    """
+    Releases its admission ticket however the response ends, including when
+    the client is gone before the body is first iterated and
+    ``_release_when_done`` never starts.
+    """
+
+    def __init__(self, content, ticket, **kwargs):
+        super().__init__(content, **kwargs)
+        self.ticket = ticket
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.ticket.release()
+
+
+async def _release_when_done(stream, ticket, context):
+    # The agent run happens while streaming, so hold the slot until it ends.
+    # Its store calls, tools included, share one connection.
+    try:
+        async with server.store.unit_of_work(context):
+            async for chunk in stream:
+                yield chunk
+    finally:
+        ticket.release()
+
+
+@app.post("/calendar/import")
+async def calendar_import(request: Request, file: UploadFile):
+    user_id = request.headers.get("X-User-ID", "anonymous")
+
+    # Parse straight off the spooled upload rather than reading it into
+    # memory; import_ics does the reading and parsing on a worker thread
+    lines = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    result = await import_ics(lines, user_id)
+    return {
+        "imported": result.imported,
+        "duplicates": result.read - result.imported,
+        "skipped": result.skipped,
+    }
+
+
+@app.get("/calendar/export")
+async def calendar_export(request: Request):
+    user_id = request.headers.get("X-User-ID", "anonymous")
+    return StreamingResponse(
+        export_ics(user_id),
+        media_type="text/calendar",
+        headers={"Content-Disposition": 'attachment; filename="calendar.ics"'},
+    )
+
+
+@app.get("/threads/search")
+async def threads_search(request: Request, q: str = "", limit: int = 20):
+    # Title and message-text search for the history sidebar
+    user_id = request.headers.get("X-User-ID", "anonymous")
+    context = RequestContext(user_id=user_id)
+    threads = await server.store.search_threads(q, max(1, min(limit, 100)), context)
+    return {"data": [thread.to_payload() for thread in threads]}
+
+
+@app.get("/threads/{thread_id}/events")
+async def thread_events(request: Request, thread_id: str):
+    # Follow a thread's events from another tab or worker
+    user_id = request.headers.get("X-User-ID", "anonymous")
+    context = RequestContext(user_id=user_id)
+
+    # One ownership check up front; the events themselves never touch the store
+    try:
+        await server.store.load_thread(thread_id, context)
+    except NotFoundError:
+        return JSONResponse({"error": "not_found"}, status_code=404)
+    return StreamingResponse(
+        _follow_thread(thread_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+async def _follow_thread(thread_id: str):
+    async with server.events.subscribe(thread_id) as subscription:
+        while True:
+            try:
+                payload = await asyncio.wait_for(subscription.get(), EVENT_KEEPALIVE)
+            except TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            if payload is None:
+                break
+            yield b"data: " + payload + b"\n\n"
+    # "overflow": events were lost, reload the thread before resubscribing
+    yield f'event: end\ndata: {{"reason": "{subscription.reason}"}}\n\n'.encode()
+
+
+@app.get("/metrics")
+async def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
 
-    if isinstance(result, StreamingResult):
-        return StreamingResponse(result, media_type="text/event-stream")
 
-    return Response(content=result.json, media_type="application/json")
+@app.get("/debug/loop")
+async def debug_loop():
+    # Recent stalls with the stack the loop was stuck in
+    if loop_monitor is None:
+        return {"enabled": False}
+    return {"enabled": True, **loop_monitor.snapshot()}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,66 @@
+"""
+Shared fixtures.
+
+``backend`` runs a test once per StoreBackend implementation: SQLite, a
+three-shard ShardedBackend over SQLite, and PostgreSQL when
+TEST_POSTGRES_URL (or a postgres DATABASE_URL) points at a server. Each
+PostgreSQL test gets a schema of its own, dropped afterwards, so the
+database named by the URL is never written to outside it.
+"""
+
+import os
+import uuid
+from contextlib import AsyncExitStack, asynccontextmanager
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import pytest
+
+from app.store.backends import PostgresBackend, ShardedBackend, SqliteBackend
+
+POSTGRES_URL = os.getenv("TEST_POSTGRES_URL") or (
+    os.getenv("DATABASE_URL", "")
+    if os.getenv("DATABASE_URL", "").startswith(("postgres://", "postgresql://"))
+    else None
+)
+
+
+def _with_search_path(url: str, schema: str) -> str:
+    # asyncpg passes unknown DSN parameters on as server settings
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query) + [("search_path", schema)]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+@asynccontextmanager
+async def postgres_schema():
+    """A PostgresBackend confined to a fresh schema, dropped on exit."""
+    import asyncpg
+
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    admin = await asyncpg.connect(POSTGRES_URL)
+    await admin.execute(f"CREATE SCHEMA {schema}")
+    backend = PostgresBackend(_with_search_path(POSTGRES_URL, schema), max_size=4)
+    try:
+        yield backend
+    finally:
+        await backend.close()
+        await admin.execute(f"DROP SCHEMA {schema} CASCADE")
+        await admin.close()
+
+
+@pytest.fixture(params=["sqlite", "sharded", "postgres"])
+async def backend(request, tmp_path):
+    async with AsyncExitStack() as stack:
+        if request.param == "sqlite":
+            backend = SqliteBackend(tmp_path / "test.db")
+        elif request.param == "sharded":
+            backend = ShardedBackend(
+                [SqliteBackend(tmp_path / f"shard{i}.db") for i in range(3)]
+            )
+        elif POSTGRES_URL:
+            backend = await stack.enter_async_context(postgres_schema())
+        else:
+            pytest.skip("TEST_POSTGRES_URL is not set")
+        await backend.init_schema()
+        yield backend
+        await backend.close()
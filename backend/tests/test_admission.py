@@ -0,0 +1,140 @@
+"""
+Admission applies to agent runs only, not to cheap non-streaming requests.
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+import main
+from app import database
+from app.admission import AdmissionController, AdmissionRejected
+from app.store.backends import SqliteBackend
+
+LIST_THREADS = {"type": "threads.list", "params": {"limit": 20}}
+NEW_THREAD = {
+    "type": "threads.create",
+    "params": {
+        "input": {
+            "content": [{"type": "input_text", "text": "Book a meeting"}],
+            "attachments": [],
+            "inference_options": {},
+        }
+    },
+}
+
+
+@pytest.fixture
+async def client(tmp_path, monkeypatch):
+    backend = SqliteBackend(tmp_path / "test.db")
+    await backend.init_schema()
+    monkeypatch.setattr(database, "_backend", backend)
+    # No slots at all for anyone
+    monkeypatch.setattr(main, "admission", AdmissionController(max_per_user=0))
+    yield TestClient(main.app, headers={"X-User-ID": "alice"})
+    await backend.close()
+
+
+async def test_only_streaming_requests_are_admitted(client):
+    for _ in range(3):
+        assert client.post("/chatkit", json=LIST_THREADS).status_code == 200
+
+    response = client.post("/chatkit", json=NEW_THREAD)
+    assert response.status_code == 429
+    assert response.json() == {"error": "user_concurrency"}
+    assert main.admission.rejected["user_concurrency"] == 1
+
+
+def _request(payload: dict) -> Request:
+    messages = [{"type": "http.request", "body": json.dumps(payload).encode()}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.Event().wait()  # Nothing more from the client
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/chatkit",
+        "headers": [(b"x-user-id", b"alice")],
+        "query_string": b"",
+    }
+    return Request(scope, receive)
+
+
+async def test_slot_released_when_the_response_never_starts(tmp_path, monkeypatch):
+    backend = SqliteBackend(tmp_path / "test.db")
+    await backend.init_schema()
+    monkeypatch.setattr(database, "_backend", backend)
+    admission = AdmissionController(max_per_user=2, max_inflight=2)
+    monkeypatch.setattr(main, "admission", admission)
+
+    async def disconnected(message):
+        raise OSError("client went away")
+
+    # More than the user's slots: none may stay taken
+    for _ in range(3):
+        request = _request(NEW_THREAD)
+        response = await main.chatkit_endpoint(request)
+        with pytest.raises(OSError):
+            await response(request.scope, request.receive, disconnected)
+    assert (admission.inflight, admission.admitted) == (0, 3)
+    assert sum(admission.rejected.values()) == 0
+    await backend.close()
+
+
+# --- AdmissionController: one token a minute, so none refill during a test ---
+async def _rejected(controller: AdmissionController, user_id: str) -> AdmissionRejected:
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.acquire(user_id)
+    return rejected.value
+
+
+async def test_rate_limit_per_user():
+    controller = AdmissionController(rate_per_minute=1, burst=2)
+    for _ in range(2):
+        (await controller.acquire("alice")).release()
+
+    rejected = await _rejected(controller, "alice")
+    assert rejected.reason == "rate_limited"
+    assert 0 < rejected.retry_after <= 60
+    # Other users have buckets of their own
+    (await controller.acquire("bob")).release()
+
+
+async def test_full_queue_rejects_without_using_a_token():
+    controller = AdmissionController(rate_per_minute=1, burst=2, max_inflight=1, queue_size=0)
+    running = await controller.acquire("bob")
+    assert (await _rejected(controller, "alice")).reason == "queue_full"
+    assert (await _rejected(controller, "alice")).reason == "queue_full"
+    running.release()
+
+    # Both rejections were refunded: alice still has her whole burst
+    for _ in range(2):
+        (await controller.acquire("alice")).release()
+    assert (await _rejected(controller, "alice")).reason == "rate_limited"
+
+
+async def test_queued_requests_run_in_turn_or_time_out():
+    controller = AdmissionController(
+        rate_per_minute=1, burst=2, max_inflight=1, queue_size=1, queue_timeout=0.05
+    )
+    running = await controller.acquire("bob")
+    assert (await _rejected(controller, "alice")).reason == "queue_timeout"
+    assert controller.queued == 0
+
+    # A slot freed while waiting goes to the queued request
+    waiting = asyncio.create_task(controller.acquire("alice"))
+    await asyncio.sleep(0)
+    assert controller.queued == 1
+    running.release()
+    (await waiting).release()
+    assert controller.inflight == 0
+    # The timed-out attempt was refunded, so alice has one token left
+    (await controller.acquire("alice")).release()
+    assert (await _rejected(controller, "alice")).reason == "rate_limited"
+
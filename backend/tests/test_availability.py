@@ -0,0 +1,123 @@
+"""
+find_availability against a real store: booked meetings stop being offered.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from agents.tool_context import ToolContext
+from chatkit.agents import AgentContext
+from chatkit.types import ThreadItemDoneEvent, ThreadMetadata, WidgetItem
+
+from app import database
+from app.agents import tools
+from app.agents.tools import check_schedule, draft_invite, find_availability
+from app.store.app_store import create_event, create_events
+from app.store.chat_store import ChatStore
+from app.types import EventRecord, RequestContext, WorkingHours
+
+EVERY_DAY = "0123456"
+
+
+@pytest.fixture
+async def store(backend, monkeypatch):
+    monkeypatch.setattr(database, "_backend", backend)
+    await backend.insert_users(
+        [("alice", "Alice", "alice@example.com"), ("dana", "Dana", "dana@example.com")]
+    )
+    await backend.insert_contacts(
+        [
+            ("c1", "alice", "Dana Engineer", "dana@example.com", "CTO", None),
+            ("c2", "alice", "Eve External", "eve@vendor.com", "Vendor", None),
+        ]
+    )
+    await backend.upsert_working_hours(
+        [WorkingHours("alice", "UTC", weekdays=EVERY_DAY), WorkingHours("dana", "UTC", weekdays=EVERY_DAY)]
+    )
+    return ChatStore(backend)
+
+
+def _context(store: ChatStore, user_id: str) -> AgentContext:
+    return AgentContext(
+        thread=ThreadMetadata(id="thr_1", created_at="2026-01-01T00:00:00Z"),
+        store=store,
+        request_context=RequestContext(user_id=user_id),
+    )
+
+
+async def _invoke(tool, context: AgentContext, **args) -> str:
+    arguments = json.dumps(args)
+    return await tool.on_invoke_tool(
+        ToolContext(context, tool_name=tool.name, tool_call_id="call_1", tool_arguments=arguments),
+        arguments,
+    )
+
+
+async def _call(tool, store: ChatStore, user_id: str, **args):
+    """Runs a tool as the agent would; returns its widget payload, if any."""
+    context = _context(store, user_id)
+    await _invoke(tool, context, **args)
+    widgets = []
+    while not context._events.empty():
+        event = context._events.get_nowait()
+        if isinstance(event, ThreadItemDoneEvent) and isinstance(event.item, WidgetItem):
+            widgets.append(event.item.widget.model_dump(exclude_none=True))
+    return widgets[-1] if widgets else None
+
+
+async def _offered(store: ChatStore, user_id: str, attendee_ids: list[str]) -> list[dict]:
+    widget = await _call(find_availability, store, user_id, attendee_ids=attendee_ids, duration_minutes=60)
+    return [item["onClickAction"]["payload"] for item in widget["children"]]
+
+
+async def test_booked_slot_is_not_offered_again(store):
+    first, *_ = await _offered(store, "alice", ["c1", "c2"])
+
+    # Draft and send it the way the invite editor does
+    editor = await _call(
+        draft_invite,
+        store,
+        "alice",
+        subject="Roadmap",
+        agenda="",
+        start_time=first["start"],
+        attendee_ids=["c1", "c2"],
+        duration_minutes=first["duration_minutes"],
+    )
+    sent = editor["children"][0]["onSubmitAction"]["payload"]
+    await create_event(
+        organizer_id="alice",
+        subject="Roadmap",
+        agenda="",
+        location="Zoom",
+        attendees=sent["attendees"],
+        start_time=sent["start_time"],
+        end_time=sent["end_time"],
+    )
+
+    assert first["start"] not in [s["start"] for s in await _offered(store, "alice", ["c1"])]
+    # The invitees' calendars are blocked too, whoever asks next
+    assert first["start"] not in [s["start"] for s in await _offered(store, "dana", [])]
+
+
+async def test_schedule_lists_upcoming_meetings_first(store, monkeypatch):
+    monkeypatch.setattr(tools, "SCHEDULE_SUMMARY_LIMIT", 3)
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+    def meeting(name: str, hours: int) -> EventRecord:
+        start = now + timedelta(hours=hours)
+        return EventRecord(
+            name, "alice", name, start.isoformat(), (start + timedelta(minutes=30)).isoformat(), ""
+        )
+
+    # Plenty of history, as an imported calendar has
+    await create_events([meeting(f"past{n}", -24 * (n + 1)) for n in range(5)])
+    await create_events([meeting(f"next{n}", 24 * (n + 1)) for n in range(4)])
+
+    summary = await _invoke(check_schedule, _context(store, "alice"))
+    assert [line.split(" at ")[0] for line in summary.splitlines()[1:4]] == [
+        "- next0", "- next1", "- next2"
+    ]
+    assert summary.splitlines()[4] == "...and 1 more meetings not listed."
+
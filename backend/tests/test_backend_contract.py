@@ -0,0 +1,402 @@
+"""
+Behaviour every StoreBackend must share. Each test runs once per backend
+(see ``backend`` in conftest.py).
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from chatkit.types import (
+    AssistantMessageContent,
+    AssistantMessageItem,
+    HiddenContextItem,
+    InferenceOptions,
+    ThreadMetadata,
+    UserMessageItem,
+    UserMessageTextContent,
+)
+
+from app.store.backends import EventConflictError
+from app.types import EventRecord, WorkingHours
+
+START = datetime(2026, 3, 2, 10, tzinfo=timezone.utc)
+
+
+def _at(minutes: int) -> str:
+    return (START + timedelta(minutes=minutes)).isoformat()
+
+
+def _event(event_id: str, start: int, end: int, organizer: str = "alice", **fields) -> EventRecord:
+    return EventRecord(
+        id=event_id,
+        organizer_id=organizer,
+        subject=fields.pop("subject", f"Meeting {event_id}"),
+        start_time=_at(start),
+        end_time=_at(end),
+        attendees=fields.pop("attendees", ""),
+        **fields,
+    )
+
+
+async def _thread(backend, thread_id: str, user_id: str = "alice", title: str | None = None, minutes: int = 0):
+    thread = ThreadMetadata(
+        id=thread_id, title=title, created_at=START + timedelta(minutes=minutes)
+    )
+    await backend.save_thread(
+        thread.id, user_id, thread.created_at.isoformat(), thread.model_dump_json(), title
+    )
+    return thread
+
+
+def _message(item_id: str, thread_id: str, text: str, minutes: int = 0, user: bool = True):
+    created_at = START + timedelta(minutes=minutes)
+    if user:
+        return UserMessageItem(
+            id=item_id,
+            thread_id=thread_id,
+            created_at=created_at,
+            content=[UserMessageTextContent(text=text)],
+            inference_options=InferenceOptions(),
+        )
+    return AssistantMessageItem(
+        id=item_id,
+        thread_id=thread_id,
+        created_at=created_at,
+        content=[AssistantMessageContent(text=text)],
+    )
+
+
+async def _add(backend, item, user_id: str = "alice") -> None:
+    await backend.add_thread_item(
+        item.id, item.thread_id, user_id, item.created_at.isoformat(), item.model_dump_json()
+    )
+
+
+# --- Users & Contacts ---
+async def test_users_and_contacts(backend):
+    assert not await backend.has_users()
+    await backend.insert_users([("alice", "Alice", "alice@example.com"), ("bob", "Bob", "bob@example.com")])
+    await backend.insert_contacts(
+        [
+            ("a-c1", "alice", "Zed Jones", "zed@example.com", "Sales", None),
+            ("a-c2", "alice", "Amy Lee", "amy@example.com", "Legal", None),
+            ("a-c3", "alice", "Mia Kim", "mia@example.com", "Finance", None),
+            ("b-c1", "bob", "Amy Lee", "amy@example.com", "Legal", None),
+        ]
+    )
+
+    assert await backend.count_users() == 2
+    assert await backend.has_users()
+    assert await backend.get_user_ids_by_email(["bob@example.com", "nobody@example.com"]) == {
+        "bob@example.com": "bob"
+    }
+
+    names = [c.name for c in await backend.search_contacts("alice", "")]
+    assert names == ["Amy Lee", "Mia Kim", "Zed Jones"]
+    page = await backend.search_contacts("alice", "", limit=1, offset=1)
+    assert [c.id for c in page] == ["a-c3"]
+    assert [c.id for c in await backend.search_contacts("alice", "AMY")] == ["a-c2"]
+
+    owned = await backend.get_contacts_by_ids(["a-c1", "b-c1"], owner_id="alice")
+    assert [c.id for c in owned] == ["a-c1"]
+    assert {c.id for c in await backend.get_contacts_by_ids(["a-c1", "b-c1"])} == {"a-c1", "b-c1"}
+
+
+async def test_working_hours_upsert(backend):
+    await backend.upsert_working_hours([WorkingHours("alice", "Europe/Berlin"), WorkingHours("bob")])
+    await backend.upsert_working_hours([WorkingHours("alice", "Asia/Tokyo", 8 * 60, 16 * 60, "0123")])
+
+    profiles = {p.user_id: p for p in await backend.get_working_hours(["alice", "bob", "carol"])}
+    assert profiles.keys() == {"alice", "bob"}
+    assert profiles["alice"] == WorkingHours("alice", "Asia/Tokyo", 480, 960, "0123")
+
+
+# --- Events ---
+async def test_create_event_checks_overlaps(backend):
+    assert await backend.create_event(_event("e1", 0, 60)) == "e1"
+
+    with pytest.raises(EventConflictError) as conflict:
+        await backend.create_event(_event("e2", 30, 90))
+    assert [e.id for e in conflict.value.conflicts] == ["e1"]
+
+    # Back to back is not an overlap
+    assert await backend.create_event(_event("e3", 60, 90)) == "e3"
+    # Nor is someone else's calendar
+    assert await backend.create_event(_event("e4", 0, 60, organizer="bob")) == "e4"
+    assert [e.id for e in await backend.get_events_by_organizer("alice")] == ["e1", "e3"]
+
+
+async def test_create_event_checks_every_participant(backend):
+    # alice and dana live on different shards of the sharded backend
+    await backend.insert_users(
+        [("alice", "Alice", "alice@example.com"), ("dana", "Dana", "dana@example.com")]
+    )
+    await backend.create_event(_event("d1", 0, 60, organizer="dana"))
+    invite = "Dana Engineer <dana@example.com>, Eve External <eve@vendor.com>"
+
+    # The invitee's own meetings count
+    with pytest.raises(EventConflictError) as conflict:
+        await backend.create_event(_event("a1", 30, 90, attendees=invite))
+    assert [e.id for e in conflict.value.conflicts] == ["d1"]
+    assert await backend.get_events_by_organizer("alice") == []
+
+    # And so do meetings they're invited to: by user id, else by email
+    assert await backend.create_event(_event("a2", 60, 120, attendees=invite)) == "a2"
+    with pytest.raises(EventConflictError) as conflict:
+        await backend.create_event(_event("d2", 90, 150, organizer="dana"))
+    assert [e.id for e in conflict.value.conflicts] == ["a2"]
+    busy = await backend.get_busy_intervals(["dana", "eve@vendor.com"], _at(0), _at(600))
+    assert sorted(busy) == [
+        ("dana", _at(0), _at(60)),
+        ("dana", _at(60), _at(120)),
+        ("eve@vendor.com", _at(60), _at(120)),
+    ]
+
+
+async def test_create_event_inside_a_transaction(backend):
+    # As invite.send books: inside the request's unit of work and transaction
+    await backend.insert_users(
+        [("alice", "Alice", "alice@example.com"), ("dana", "Dana", "dana@example.com")]
+    )
+    invite = "Dana Engineer <dana@example.com>"
+    async with backend.unit_of_work("alice"):
+        async with backend.transaction("alice"):
+            assert await backend.create_event(_event("a1", 0, 60, attendees=invite)) == "a1"
+        with pytest.raises(EventConflictError):
+            async with backend.transaction("alice"):
+                await backend.create_event(_event("a2", 30, 90, attendees=invite))
+
+    assert [e.id for e in await backend.get_events_by_organizer("alice")] == ["a1"]
+    assert await backend.get_busy_intervals(["dana"], _at(0), _at(600)) == [
+        ("dana", _at(0), _at(60))
+    ]
+
+
+async def test_create_event_is_idempotent(backend):
+    first = _event("e1", 0, 60, idempotency_key="draft-1")
+    assert await backend.create_event(first) == "e1"
+    # A retried submit returns the booked event instead of conflicting with it
+    retry = _event("e1-retry", 0, 60, idempotency_key="draft-1")
+    assert await backend.create_event(retry) == "e1"
+    assert len(await backend.get_events_by_organizer("alice")) == 1
+
+
+async def test_insert_events_skips_duplicates(backend):
+    assert await backend.insert_events([_event("e1", 0, 60, idempotency_key="uid-1")]) == 1
+    inserted = await backend.insert_events(
+        [
+            _event("e1-again", 0, 60, idempotency_key="uid-1"),
+            _event("e2", 0, 60, idempotency_key="uid-2"),
+        ]
+    )
+    assert inserted == 1
+    events = await backend.get_events_by_organizer("alice")
+    assert [e.id for e in events] == ["e1", "e2"]
+    # Skipped events leave no busy time behind
+    busy = await backend.get_busy_intervals(["alice"], _at(0), _at(60))
+    assert len(busy) == 2
+
+
+async def test_events_by_organizer_in_windows(backend):
+    events = [_event(f"e{n}", n * 60, n * 60 + 30) for n in range(7)]
+    await backend.insert_events(list(reversed(events)))
+
+    windows = [w async for w in backend.iter_events_by_organizer("alice", 3)]
+    assert [len(w) for w in windows] == [3, 3, 1]
+    assert [e for w in windows for e in w] == await backend.get_events_by_organizer("alice")
+    assert [e.id for w in windows for e in w] == [e.id for e in events]
+
+    # From a point in time on, and counted
+    windows = [w async for w in backend.iter_events_by_organizer("alice", 3, since=_at(120))]
+    assert [e.id for w in windows for e in w] == ["e2", "e3", "e4", "e5", "e6"]
+    assert await backend.count_events_by_organizer("alice", since=_at(120)) == 5
+    assert await backend.count_events_by_organizer("alice") == 7
+
+
+async def test_busy_intervals(backend):
+    await backend.insert_events(
+        [_event("e1", 0, 60), _event("e2", 120, 180), _event("e3", 0, 60, organizer="bob")]
+    )
+    busy = await backend.get_busy_intervals(["alice", "carol"], _at(30), _at(130))
+    assert sorted(busy) == [("alice", _at(0), _at(60)), ("alice", _at(120), _at(180))]
+    assert await backend.get_busy_intervals(["alice"], _at(60), _at(120)) == []
+    assert await backend.get_busy_intervals([], _at(0), _at(600)) == []
+
+
+# --- Threads ---
+async def test_thread_round_trip(backend):
+    thread = await _thread(backend, "thr_1", title="Offsite")
+    assert ThreadMetadata.model_validate(await backend.load_thread("thr_1", "alice")) == thread
+    assert await backend.load_thread("thr_1", "bob") is None
+
+    thread.title = "Renamed"
+    await backend.save_thread(
+        thread.id, "alice", thread.created_at.isoformat(), thread.model_dump_json(), thread.title
+    )
+    (summary,) = await backend.list_threads("alice", 10)
+    assert summary.title == "Renamed"
+
+
+async def test_list_threads_by_activity(backend):
+    for n in range(5):
+        await _thread(backend, f"thr_{n}", minutes=n)
+    # Activity moves the oldest thread to the top
+    await _add(backend, _message("msg_1", "thr_0", "hello", minutes=100))
+
+    ids = [t.id for t in await backend.list_threads("alice", 10)]
+    assert ids == ["thr_0", "thr_4", "thr_3", "thr_2", "thr_1"]
+
+    pages, after = [], None
+    while page := await backend.list_threads("alice", 2, after=after):
+        pages.append([t.id for t in page])
+        after = page[-1].id
+    assert pages == [["thr_0", "thr_4"], ["thr_3", "thr_2"], ["thr_1"]]
+
+    ascending = await backend.list_threads("alice", 2, after="thr_2", order="asc")
+    assert [t.id for t in ascending] == ["thr_3", "thr_4"]
+    assert await backend.list_threads("bob", 10) == []
+
+
+async def test_search_threads(backend):
+    await _thread(backend, "thr_1", title="Quarterly offsite")
+    await _thread(backend, "thr_2", title="Hiring", minutes=1)
+    await _add(backend, _message("msg_1", "thr_2", "Book the Lisbon venue"))
+    await _add(backend, _message("msg_2", "thr_2", "Lisbon works", user=False))
+    hidden = HiddenContextItem(
+        id="hcx_1", thread_id="thr_1", created_at=START, content="<USER_ACTION>secret</USER_ACTION>"
+    )
+    await _add(backend, hidden)
+    await _thread(backend, "thr_3", user_id="bob", title="Lisbon trip")
+
+    assert [t.id for t in await backend.search_threads("alice", "OFFSITE!", 10)] == ["thr_1"]
+    assert [t.id for t in await backend.search_threads("alice", "lisb", 10)] == ["thr_2"]
+    assert [t.id for t in await backend.search_threads("alice", "book venue", 10)] == ["thr_2"]
+    assert await backend.search_threads("alice", "book offsite", 10) == []
+    assert await backend.search_threads("alice", "secret", 10) == []
+    assert await backend.search_threads("alice", "  ", 10) == []
+
+
+async def test_delete_thread(backend):
+    await _thread(backend, "thr_1")
+    await _add(backend, _message("msg_1", "thr_1", "Lisbon"))
+    await backend.delete_thread("thr_1", "bob")
+    assert await backend.load_thread("thr_1", "alice") is not None
+
+    await backend.delete_thread("thr_1", "alice")
+    assert await backend.load_thread("thr_1", "alice") is None
+    assert await backend.load_thread_items("thr_1", "alice", 10) == []
+    assert await backend.search_threads("alice", "lisbon", 10) == []
+
+
+# --- Items ---
+async def test_item_counts_follow_writes(backend):
+    await _thread(backend, "thr_1")
+    await _add(backend, _message("msg_1", "thr_1", "one", minutes=1))
+    second = _message("msg_2", "thr_1", "two", minutes=2)
+    await backend.save_item(
+        second.id, "thr_1", "alice", second.created_at.isoformat(), second.model_dump_json()
+    )
+    second.content[0].text = "two, edited"
+    await backend.save_item(
+        second.id, "thr_1", "alice", second.created_at.isoformat(), second.model_dump_json()
+    )
+
+    (summary,) = await backend.list_threads("alice", 10)
+    assert (summary.item_count, summary.updated_at) == (2, _at(2))
+    items = await backend.load_thread_items("thr_1", "alice", 10)
+    assert [i["id"] for i in items] == ["msg_2", "msg_1"]
+    assert items[0]["content"][0]["text"] == "two, edited"
+
+    await backend.delete_thread_item("thr_1", "msg_1", "alice")
+    await backend.delete_thread_item("thr_1", "msg_1", "alice")
+    (summary,) = await backend.list_threads("alice", 10)
+    assert summary.item_count == 1
+    assert await backend.load_item("thr_1", "msg_1", "alice") is None
+
+
+async def test_bulk_loads(backend):
+    threads, items = [], []
+    for n, user_id in enumerate(("alice", "bob", "carol")):
+        thread = ThreadMetadata(id=f"thr_{n}", title=f"Plan {n}", created_at=START)
+        threads.append((thread.id, user_id, START.isoformat(), thread.model_dump_json()))
+        for m in range(3):
+            item = _message(f"msg_{n}_{m}", thread.id, "next week", minutes=m)
+            items.append(
+                (item.id, thread.id, user_id, item.created_at.isoformat(), item.model_dump_json())
+            )
+    await backend.insert_threads(threads)
+    await backend.insert_items(items)
+
+    for n, user_id in enumerate(("alice", "bob", "carol")):
+        (summary,) = await backend.list_threads(user_id, 10)
+        assert (summary.title, summary.item_count, summary.updated_at) == (f"Plan {n}", 3, _at(2))
+        assert [t.id for t in await backend.search_threads(user_id, "next", 10)] == [f"thr_{n}"]
+
+
+async def test_patch_item(backend):
+    await _thread(backend, "thr_1")
+    await _add(backend, _message("msg_1", "thr_1", "before"))
+    await backend.patch_item(
+        "thr_1", "msg_1", "alice", [(("content", 0, "text"), '"after"')]
+    )
+    item = await backend.load_item("thr_1", "msg_1", "alice")
+    assert item["content"][0]["text"] == "after"
+    assert item["thread_id"] == "thr_1"
+
+
+# --- Transactions ---
+async def test_transaction_rolls_back(backend):
+    await _thread(backend, "thr_1")
+    with pytest.raises(RuntimeError):
+        async with backend.transaction("alice"):
+            await _add(backend, _message("msg_1", "thr_1", "lost"))
+            await backend.create_event(_event("e1", 0, 60))
+            raise RuntimeError("fail after both writes")
+
+    assert await backend.load_thread_items("thr_1", "alice", 10) == []
+    assert await backend.get_events_by_organizer("alice") == []
+    (summary,) = await backend.list_threads("alice", 10)
+    assert summary.item_count == 0
+
+
+async def test_nested_transaction_rolls_back_alone(backend):
+    await _thread(backend, "thr_1")
+    async with backend.transaction("alice"):
+        await _add(backend, _message("msg_1", "thr_1", "kept"))
+        with pytest.raises(EventConflictError):
+            async with backend.transaction("alice"):
+                await backend.create_event(_event("e1", 0, 60))
+                await backend.create_event(_event("e2", 0, 60))
+
+    assert [i["id"] for i in await backend.load_thread_items("thr_1", "alice", 10)] == ["msg_1"]
+    assert await backend.get_events_by_organizer("alice") == []
+
+
+async def test_unit_of_work_reads_its_own_writes(backend):
+    async with backend.unit_of_work("alice"):
+        await _thread(backend, "thr_1")
+        async with backend.unit_of_work("alice"):
+            await _add(backend, _message("msg_1", "thr_1", "hello"))
+        assert len(await backend.load_thread_items("thr_1", "alice", 10)) == 1
+    (summary,) = await backend.list_threads("alice", 10)
+    assert summary.item_count == 1
+
+
+async def test_tasks_take_turns_outside_transactions(backend):
+    await _thread(backend, "thr_1")
+    await backend.insert_events([_event(f"e{n}", n * 60, n * 60 + 30) for n in range(5)])
+    async with asyncio.timeout(10), backend.unit_of_work("alice"):
+        # Fan-outs share the connection between store calls...
+        threads, events = await asyncio.gather(
+            backend.list_threads("alice", 10), backend.get_events_by_organizer("alice")
+        )
+        assert (len(threads), len(events)) == (1, 5)
+        # ...including between the windows of an iteration
+        async for window in backend.iter_events_by_organizer("alice", 2):
+            (threads,) = await asyncio.gather(backend.list_threads("alice", 10))
+
+        # Inside a transaction they would wait for it forever; they fail instead
+        with pytest.raises(RuntimeError, match="holds the unit of work's connection"):
+            async with backend.transaction("alice"):
+                await asyncio.gather(backend.list_threads("alice", 10))
@@ -0,0 +1,72 @@
+"""
+Redis event bus: lost events cut off subscribers on every worker, so their
+clients reload the thread instead of missing part of it. Needs Redis at
+REDIS_URL; skipped otherwise.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+
+from app.events import REDIS_URL, RedisEventBus
+
+
+@pytest.fixture
+async def workers():
+    """Two buses on one Redis, as two server processes would have."""
+    buses = [RedisEventBus(REDIS_URL, outbox_size=1), RedisEventBus(REDIS_URL)]
+    try:
+        for bus in buses:
+            await bus.start()
+    except Exception as e:
+        for bus in buses:
+            await bus.close()
+        pytest.skip(f"Redis is not available at {REDIS_URL}: {e}")
+    yield buses
+    for bus in buses:
+        await bus.close()
+
+
+async def _drain(subscription) -> list[bytes]:
+    events = []
+    async with asyncio.timeout(5):
+        while (payload := await subscription.get()) is not None:
+            events.append(payload)
+    return events
+
+
+async def test_outbox_overflow_ends_subscriptions_everywhere(workers):
+    publisher, other = workers
+    thread_id = f"thr_{uuid.uuid4().hex}"
+    async with publisher.subscribe(thread_id) as local, other.subscribe(thread_id) as remote:
+        # The outbox holds one event; the second is dropped
+        publisher.publish(thread_id, b'{"n": 1}')
+        publisher.publish(thread_id, b'{"n": 2}')
+
+        assert local.reason == "overflow"
+        assert b'{"n": 2}' not in await _drain(remote)
+        assert remote.reason == "overflow"
+    assert publisher.outbox_drops == 1
+
+
+async def test_failed_publish_ends_subscriptions_everywhere(workers, monkeypatch):
+    _, publisher = workers
+    thread_id = f"thr_{uuid.uuid4().hex}"
+    pipeline = publisher._client.pipeline
+    failures = iter([True])
+
+    def flaky_pipeline(**kwargs):
+        if next(failures, False):
+            raise ConnectionError("Redis went away")
+        return pipeline(**kwargs)
+
+    monkeypatch.setattr(publisher._client, "pipeline", flaky_pipeline)
+    async with publisher.subscribe(thread_id) as local, workers[0].subscribe(thread_id) as remote:
+        publisher.publish(thread_id, b'{"n": 1}')
+
+        # The retry announces the loss once Redis is back
+        assert await _drain(remote) == []
+        assert remote.reason == "overflow"
+        assert local.reason == "overflow"
+    assert publisher.outbox_drops == 1
@@ -0,0 +1,154 @@
+"""
+.ics import and export: recurrence, time zones and attendee addresses.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from app import database
+from app.store.app_store import create_event
+from app.store.ics import export_ics, import_ics, iter_event_records
+
+# A weekly meeting in a zone the file defines itself (not an IANA name),
+# crossing the March DST change. The 23rd is cancelled via EXDATE and the
+# 30th moved to the afternoon by an override that comes before the master.
+CALENDAR = """BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//test//EN
+BEGIN:VTIMEZONE
+TZID:Office Time
+BEGIN:STANDARD
+DTSTART:19701025T030000
+RRULE:FREQ=YEARLY;BYMONTH=10;BYDAY=-1SU
+TZOFFSETFROM:+0200
+TZOFFSETTO:+0100
+END:STANDARD
+BEGIN:DAYLIGHT
+DTSTART:19700329T020000
+RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=-1SU
+TZOFFSETFROM:+0100
+TZOFFSETTO:+0200
+END:DAYLIGHT
+END:VTIMEZONE
+BEGIN:VEVENT
+UID:standup@example.com
+RECURRENCE-ID;TZID=Office Time:20260330T100000
+DTSTART;TZID=Office Time:20260330T150000
+DTEND;TZID=Office Time:20260330T153000
+SUMMARY:Standup (moved)
+END:VEVENT
+BEGIN:VEVENT
+UID:standup@example.com
+DTSTART;TZID=Office Time:20260316T100000
+DTEND;TZID=Office Time:20260316T103000
+RRULE:FREQ=WEEKLY;COUNT=4
+EXDATE;TZID=Office Time:20260323T100000
+SUMMARY:Standup
+ATTENDEE;CN="Bob Manager";ROLE=REQ-PARTICIPANT:mailto:bob@example.com
+END:VEVENT
+BEGIN:VEVENT
+UID:review@example.com
+DTSTART;TZID=America/New_York:20260402T090000
+DURATION:PT1H
+SUMMARY:Review
+ATTENDEE;CN=Eve:mailto:eve@vendor.com
+END:VEVENT
+BEGIN:VEVENT
+UID:hourly@example.com
+DTSTART:20260401T090000Z
+RRULE:FREQ=HOURLY;COUNT=3
+SUMMARY:Unsupported
+END:VEVENT
+END:VCALENDAR
+""".splitlines(keepends=True)
+
+NOW = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def test_recurring_events_in_a_vtimezone():
+    events = sorted(iter_event_records(CALENDAR, "alice", now=NOW), key=lambda e: e.start_time)
+    assert [(e.subject, e.start_time, e.end_time) for e in events] == [
+        ("Standup", "2026-03-16T09:00:00+00:00", "2026-03-16T09:30:00+00:00"),
+        # Summer time from the 29th: same wall time, an hour earlier in UTC
+        ("Standup (moved)", "2026-03-30T13:00:00+00:00", "2026-03-30T13:30:00+00:00"),
+        ("Review", "2026-04-02T13:00:00+00:00", "2026-04-02T14:00:00+00:00"),
+        ("Standup", "2026-04-06T08:00:00+00:00", "2026-04-06T08:30:00+00:00"),
+    ]
+    assert events[0].attendee_list() == [("Bob Manager", "bob@example.com")]
+    # Occurrences get keys of their own; the override keeps its occurrence's
+    assert events[1].idempotency_key == "standup@example.com/20260330T080000Z"
+
+
+@pytest.fixture
+def store(backend, monkeypatch):
+    monkeypatch.setattr(database, "_backend", backend)
+    return backend
+
+
+async def test_import_counts_and_export_round_trip(store):
+    result = await import_ics(CALENDAR, "alice")
+    assert (result.read, result.imported, result.skipped) == (4, 4, 1)
+    again = await import_ics(CALENDAR, "alice")
+    assert (again.read, again.imported) == (4, 0)
+
+    exported = "".join([chunk async for chunk in export_ics("alice")])
+    assert 'ATTENDEE;CN="Bob Manager":mailto:bob@example.com' in exported
+    assert "invalid:nomail" not in exported
+    assert "DTSTART:20260330T130000Z" in exported
+
+    # The export imports back as the same four events
+    round_trip = list(iter_event_records(exported.splitlines(keepends=True), "alice"))
+    assert sorted(e.start_time for e in round_trip) == sorted(
+        e.start_time for e in await store.get_events_by_organizer("alice")
+    )
+
+
+CANCELLED = """BEGIN:VCALENDAR
+VERSION:2.0
+BEGIN:VEVENT
+UID:offsite@example.com
+DTSTART:20260401T090000Z
+DTEND:20260401T170000Z
+SUMMARY:Offsite
+STATUS:CANCELLED
+END:VEVENT
+BEGIN:VEVENT
+UID:sync@example.com
+DTSTART:20260402T090000Z
+DTEND:20260402T093000Z
+RRULE:FREQ=DAILY;COUNT=3
+SUMMARY:Sync
+STATUS:CANCELLED
+END:VEVENT
+BEGIN:VEVENT
+UID:sync@example.com
+RECURRENCE-ID:20260403T090000Z
+DTSTART:20260403T100000Z
+DTEND:20260403T103000Z
+SUMMARY:Sync (moved)
+END:VEVENT
+BEGIN:VEVENT
+UID:lunch@example.com
+DTSTART:20260401T120000Z
+DTEND:20260401T130000Z
+SUMMARY:Lunch
+END:VEVENT
+END:VCALENDAR
+""".splitlines(keepends=True)
+
+
+async def test_cancelled_events_are_not_imported(store):
+    result = await import_ics(CANCELLED, "alice")
+    assert (result.read, result.imported, result.skipped) == (1, 1, 0)
+    assert [e.subject for e in await store.get_events_by_organizer("alice")] == ["Lunch"]
+
+    # The cancelled offsite leaves the day free
+    busy = await store.get_busy_intervals(
+        ["alice"], "2026-04-01T00:00:00+00:00", "2026-04-04T00:00:00+00:00"
+    )
+    assert busy == [("alice", "2026-04-01T12:00:00+00:00", "2026-04-01T13:00:00+00:00")]
+    # ...and bookable
+    assert await create_event(
+        "alice", "Planning", "", "Room 1", "", "2026-04-01T10:00:00+00:00", "2026-04-01T11:00:00+00:00"
+    )
@@ -0,0 +1,66 @@
+"""
+Model record/replay: concurrent recordings and order-independent replay.
+"""
+
+import asyncio
+
+from agents import Model
+from openai.types.responses import ResponseTextDeltaEvent
+
+from app.agents.models import SchedulerModelProvider
+
+
+def _delta(text: str, n: int) -> ResponseTextDeltaEvent:
+    return ResponseTextDeltaEvent(
+        type="response.output_text.delta", content_index=0, delta=text, item_id="msg_1",
+        logprobs=[], output_index=0, sequence_number=n,
+    )
+
+
+class EchoModel(Model):
+    """Streams the last user message back, word by word."""
+
+    async def get_response(self, *args, **kwargs):
+        raise NotImplementedError
+
+    async def stream_response(self, system_instructions, input, *args, **kwargs):
+        for n, word in enumerate(input[-1]["content"].split()):
+            await asyncio.sleep(0)  # interleave with the other recording
+            yield _delta(word, n)
+
+
+class EchoProvider:
+    def get_model(self, model_name):
+        return EchoModel()
+
+
+def _user(text: str) -> list[dict]:
+    return [{"role": "user", "content": text}]
+
+
+async def _stream(provider: SchedulerModelProvider, input: list[dict]) -> list[str]:
+    model = provider.get_model(None)
+    events = model.stream_response("Be brief.", input, None, [], None, [], None,
+                                   previous_response_id=None, conversation_id=None, prompt=None)
+    return [event.delta async for event in events]
+
+
+async def test_concurrent_recordings_replay_by_request(tmp_path):
+    record = SchedulerModelProvider("record", tmp_path, base=EchoProvider())
+    await asyncio.gather(
+        _stream(record, _user("find a slot on monday")),
+        _stream(record, _user("invite dana and eve")),
+    )
+    assert len(list(tmp_path.glob("call-*.jsonl"))) == 2
+
+    replay = SchedulerModelProvider("replay", tmp_path, speed=0)
+    # Arrival order doesn't matter: each request gets its own recording
+    invite, slot = await asyncio.gather(
+        _stream(replay, _user("invite dana and eve")),
+        _stream(replay, _user("find a slot on monday")),
+    )
+    assert invite == ["invite", "dana", "and", "eve"]
+    assert slot == ["find", "a", "slot", "on", "monday"]
+
+    # A request that only differs in text still replays its closest recording
+    assert len(await _stream(replay, _user("something never recorded"))) in (4, 5)
@@ -0,0 +1,60 @@
+import sqlite3
+
+import pytest
+
+from app.store import rebalance as rebalance_module
+from app.store.backends import ShardedBackend, SqliteBackend
+from app.store.fixtures import FixtureSpec, load_fixtures
+
+SPEC = FixtureSpec(users=12, contacts_per_user=3, events_per_user=3, threads_per_user=2)
+
+
+@pytest.fixture
+def shard_files(tmp_path, monkeypatch):
+    def shard_paths(shard_count):
+        if shard_count == 1:
+            return [tmp_path / "chatkit.db"]
+        return [tmp_path / f"chatkit.shard{i}.db" for i in range(shard_count)]
+
+    monkeypatch.setattr(rebalance_module, "shard_paths", shard_paths)
+    return shard_paths
+
+
+def _count(path, sql: str) -> int:
+    with sqlite3.connect(path) as db:
+        return db.execute(sql).fetchone()[0]
+
+
+async def test_rerun_after_interrupted_rebalance(shard_files, tmp_path):
+    (source,) = shard_files(1)
+    backend = SqliteBackend(source)
+    await backend.init_schema()
+    loaded = await load_fixtures(SPEC, backend)
+    # The state of the source after the copies were committed but before
+    # any deletes: a crash in between, then a second run
+    snapshot = tmp_path / "snapshot.db"
+    with sqlite3.connect(source) as db, sqlite3.connect(snapshot) as copy:
+        db.backup(copy)
+
+    await rebalance_module.rebalance(1, 3)
+    with sqlite3.connect(snapshot) as copy, sqlite3.connect(source) as db:
+        copy.backup(db)
+    await rebalance_module.rebalance(1, 3)
+
+    targets = shard_files(3)
+    for table in ("users", "contacts", "events", "threads", "items"):
+        assert sum(_count(path, f"SELECT count(*) FROM {table}") for path in targets) == loaded[table]
+    for path in targets:
+        # Exactly one search row per thread and per message
+        assert _count(path, "SELECT count(*) FROM threads_fts") == _count(
+            path, "SELECT count(*) FROM threads"
+        )
+        assert _count(path, "SELECT count(*) FROM items_fts") == _count(
+            path, "SELECT count(*) FROM items"
+        )
+
+    sharded = ShardedBackend([SqliteBackend(path) for path in targets])
+    for index in range(SPEC.users):
+        threads = await sharded.list_threads(f"user{index}", 10)
+        assert [t.item_count for t in threads] == [SPEC.items_per_thread] * SPEC.threads_per_user
+        assert len(await sharded.search_threads(f"user{index}", "next week", 10)) == SPEC.threads_per_user
@@ -0,0 +1,141 @@
+"""
+Widget actions through MeetingSchedulerServer.action, inside the request's
+unit of work as /chatkit runs them.
+"""
+
+from datetime import datetime
+
+import pytest
+from chatkit.types import (
+    Action,
+    AssistantMessageItem,
+    HiddenContextItem,
+    ThreadItemDoneEvent,
+    ThreadItemUpdatedEvent,
+    ThreadMetadata,
+    WidgetItem,
+    WidgetRootUpdated,
+)
+
+from app import database
+from app.server import MeetingSchedulerServer
+from app.types import RequestContext
+from app.widgets.builders import CONTACT_PAGE_SIZE, build_contact_picker, build_invite_editor
+
+ALICE = RequestContext(user_id="alice")
+
+
+@pytest.fixture
+async def server(backend, monkeypatch):
+    monkeypatch.setattr(database, "_backend", backend)
+    await backend.insert_users(
+        [("alice", "Alice", "alice@example.com"), ("dana", "Dana", "dana@example.com")]
+    )
+    server = MeetingSchedulerServer()
+    await server.store.save_thread(_thread(), ALICE)
+    return server
+
+
+def _thread() -> ThreadMetadata:
+    return ThreadMetadata(id="thr_1", created_at=datetime(2026, 1, 1))
+
+
+async def _widget(server: MeetingSchedulerServer, item_id: str, widget) -> WidgetItem:
+    item = WidgetItem(id=item_id, thread_id="thr_1", created_at=datetime(2026, 1, 1), widget=widget)
+    await server.store.add_thread_item("thr_1", item, ALICE)
+    return item
+
+
+async def _act(server: MeetingSchedulerServer, sender: WidgetItem | None, type: str, payload: dict):
+    async with server.store.unit_of_work(ALICE):
+        return [
+            event
+            async for event in server.action(
+                _thread(), Action(type=type, payload=payload), sender, ALICE
+            )
+        ]
+
+
+def _messages(events) -> list[str]:
+    return [
+        event.item.content[0].text
+        for event in events
+        if isinstance(event, ThreadItemDoneEvent) and isinstance(event.item, AssistantMessageItem)
+    ]
+
+
+# dana lives on another shard than alice in the sharded backend
+@pytest.mark.parametrize("backend", ["sharded"], indirect=True)
+async def test_invite_send_books_across_shards(server, backend):
+    editor = build_invite_editor(
+        subject="Roadmap",
+        agenda="",
+        location="Zoom",
+        attendees="Dana <dana@example.com>",
+        time_str="Mon 09:00",
+        start_time="2026-06-01T09:00:00+00:00",
+        end_time="2026-06-01T10:00:00+00:00",
+    )
+    sender = await _widget(server, "wdg_1", editor)
+    action = editor.model_dump(exclude_none=True)["children"][0]["onSubmitAction"]
+    # The form's fields come along with the action's own payload
+    payload = {**action["payload"], "subject": "Roadmap", "agenda": ""}
+
+    events = await _act(server, sender, "invite.send", payload)
+    assert _messages(events) == ["Invitation sent successfully!"]
+    assert [e.subject for e in await backend.get_events_by_organizer("alice")] == ["Roadmap"]
+    assert await backend.get_busy_intervals(["dana"], payload["start_time"], payload["end_time"])
+
+
+@pytest.mark.parametrize("backend", ["sqlite"], indirect=True)
+@pytest.mark.parametrize("offset", ["abc", None, -5, 3.7])
+async def test_contacts_page_tolerates_bad_offsets(server, backend, offset):
+    await backend.insert_contacts(
+        [(f"c{n:02}", "alice", f"Contact {n}", f"c{n}@example.com", "Engineer", None) for n in range(12)]
+    )
+    contacts = await backend.search_contacts("alice", "", CONTACT_PAGE_SIZE, CONTACT_PAGE_SIZE)
+    sender = await _widget(server, "wdg_1", build_contact_picker(contacts, offset=CONTACT_PAGE_SIZE))
+
+    events = await _act(server, sender, "contacts.page", {"query": "", "offset": offset})
+    # Back on a first page (3.7 rounds down to 3)
+    assert events
+    (item,) = [i for i in await backend.load_thread_items("thr_1", "alice", 10) if i["id"] == "wdg_1"]
+    caption = str(item["widget"])
+    assert ("Showing 4-" if offset == 3.7 else "Showing 1-") in caption
+
+
+@pytest.mark.parametrize("backend", ["sqlite"], indirect=True)
+async def test_picker_selection_survives_paging_to_confirm(server, backend, monkeypatch):
+    async def no_reply(thread, input_user_message, context):
+        return
+        yield
+
+    monkeypatch.setattr(server, "respond", no_reply)
+    await backend.insert_contacts(
+        [(f"c{n:02}", "alice", f"Contact {n}", f"c{n}@example.com", "Engineer", None) for n in range(12)]
+    )
+    contacts = await backend.search_contacts("alice", "", CONTACT_PAGE_SIZE, 0)
+    picker = build_contact_picker(contacts, has_more=True)
+    sender = await _widget(server, "wdg_1", picker)
+
+    # "Show more" with c03 ticked: the form's values come with the button's action
+    pager = picker.model_dump(exclude_none=True)["children"][0]["children"][-1]
+    show_more = pager["children"][-1]["onClickAction"]
+    events = await _act(
+        server, sender, show_more["type"], {**show_more["payload"], "selected": {"c03": True}}
+    )
+    updates = [e.update for e in events if isinstance(e, ThreadItemUpdatedEvent)]
+    assert updates and not any(isinstance(u, WidgetRootUpdated) for u in updates)
+    assert sorted(u.component_id for u in updates) == ["contact-list", "contact-pager"]
+
+    # Confirm from the card's footer, on the stored (patched) picker
+    sender = await server.store.load_item("thr_1", "wdg_1", ALICE)
+    confirm = sender.widget.model_dump(exclude_none=True)["confirm"]["action"]
+    await _act(server, sender, confirm["type"], {**confirm["payload"], "selected": {"c11": True}})
+
+    hidden = [
+        item for item in (await server.store.load_thread_items("thr_1", None, 10, "asc", ALICE)).data
+        if isinstance(item, HiddenContextItem)
+    ]
+    assert "(IDs: ['c03', 'c11'])" in hidden[-1].content
+
@@ -0,0 +1,47 @@
+"""
+Widget updates: paging the contact picker patches components, not the root.
+"""
+
+from app.server import _selected_contact_ids
+from app.types import ContactRecord
+from app.widgets.builders import CONTACT_PAGE_SIZE, build_contact_picker, picker_carried
+from app.widgets.patch import diff_widgets
+
+
+def _contacts(start: int, count: int) -> list[ContactRecord]:
+    return [
+        ContactRecord(f"c{n}", "alice", f"Contact {n}", f"c{n}@example.com", "Engineer", None)
+        for n in range(start, start + count)
+    ]
+
+
+def _page_action(widget, label: str) -> dict:
+    row = widget.model_dump(exclude_none=True)["children"][0]["children"][-1]
+    (button,) = [child for child in row["children"] if child.get("label") == label]
+    return button["onClickAction"]["payload"]
+
+
+def test_paging_with_a_selection_patches_list_and_pager():
+    first = build_contact_picker(_contacts(0, CONTACT_PAGE_SIZE), has_more=True)
+    # Tick c3, then "Show more": the form values come with the action
+    payload = {**_page_action(first, "Show more"), "selected": {"c3": True}}
+    second = build_contact_picker(
+        _contacts(CONTACT_PAGE_SIZE, 3), offset=payload["offset"], carried=_selected_contact_ids(payload)
+    )
+
+    patches = diff_widgets(first, second)
+    assert sorted(p.component_id for p in patches) == ["contact-list", "contact-pager"]
+    # Confirm stays on the card and carries nothing; the pager holds the selection
+    assert second.model_dump(exclude_none=True)["confirm"]["action"]["payload"] == {}
+    assert picker_carried(second) == ["c3"]
+
+    # Paging back shows c3 ticked, and its checkbox tracks it from then on
+    payload = {**_page_action(second, "Previous"), "selected": {"c11": True}}
+    back = build_contact_picker(
+        _contacts(0, CONTACT_PAGE_SIZE), has_more=True, carried=_selected_contact_ids(payload)
+    )
+    assert sorted(p.component_id for p in diff_widgets(second, back)) == [
+        "contact-list", "contact-pager"
+    ]
+    assert picker_carried(back) == ["c11"]
+    assert picker_carried(build_contact_picker(_contacts(0, 3))) == []